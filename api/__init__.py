@@ -1,5 +1,39 @@
 """API-Schicht für Kernfunktionen."""
 
-from .converter import build_ffmpeg_cmd, run_ffmpeg, start_ffmpeg
+from .converter import (
+    build_ffmpeg_cmd,
+    build_loop_mux_cmd,
+    build_segment_cmd,
+    build_slideshow_cmd,
+    ensure_segment,
+    prepare_encode_cmd,
+    remove_concat_list,
+    run_ffmpeg,
+    start_ffmpeg,
+)
+from .accounting import ProcessStats
+from .aio import run_batch_async, run_ffmpeg_async
+from .cache import EncodeCache
+from .governor import ResourceGovernor
+from .probe import can_copy_audio, probe_audio
+from .progress import FfmpegProgress
 
-__all__ = ["build_ffmpeg_cmd", "run_ffmpeg", "start_ffmpeg"]
+__all__ = [
+    "EncodeCache",
+    "FfmpegProgress",
+    "ProcessStats",
+    "ResourceGovernor",
+    "build_ffmpeg_cmd",
+    "build_loop_mux_cmd",
+    "build_segment_cmd",
+    "build_slideshow_cmd",
+    "can_copy_audio",
+    "ensure_segment",
+    "prepare_encode_cmd",
+    "probe_audio",
+    "remove_concat_list",
+    "run_batch_async",
+    "run_ffmpeg",
+    "run_ffmpeg_async",
+    "start_ffmpeg",
+]
@@ -0,0 +1,125 @@
+"""Ressourcenverbrauch beendeter ffmpeg-Prozesse messen."""
+
+from __future__ import annotations
+
+import logging
+import os
+import subprocess
+import time
+from dataclasses import asdict, dataclass, fields
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ProcessStats:
+    """Verbrauch eines Prozesses: Zeiten in Sekunden, Speicher in KiB.
+
+    ``read_bytes``/``write_bytes`` sind die gelesenen bzw. geschriebenen
+    Bytes aller Lese-/Schreibaufrufe (``rchar``/``wchar``), unabhängig
+    davon, ob sie aus dem Seitencache kamen.
+    """
+
+    wall: float = 0.0
+    cpu_user: float = 0.0
+    cpu_system: float = 0.0
+    max_rss_kb: int = 0
+    read_bytes: int = 0
+    write_bytes: int = 0
+
+    @property
+    def cpu(self) -> float:
+        """CPU-Zeit gesamt (Benutzer + System)."""
+        return self.cpu_user + self.cpu_system
+
+    def as_dict(self) -> Dict[str, float]:
+        """Werte als Dictionary (z.B. für die Job-Tabelle)."""
+        return asdict(self)
+
+
+STAT_FIELDS = tuple(f.name for f in fields(ProcessStats))
+
+
+def _read_io(pid: int) -> Dict[str, int]:
+    try:
+        with open(f"/proc/{pid}/io", encoding="ascii") as fh:
+            pairs = (line.split(":", 1) for line in fh)
+            return {k.strip(): int(v) for k, v in pairs}
+    except (OSError, ValueError):
+        return {}
+
+
+def wait_with_stats(
+    proc: subprocess.Popen, stats: Optional[ProcessStats] = None
+) -> ProcessStats:
+    """Auf das Prozessende warten und den Verbrauch erfassen.
+
+    Zuerst wartet ``waitid(..., WNOWAIT)`` auf das Ende, ohne den Prozess
+    abzuräumen, damit ``/proc/<pid>/io`` noch lesbar ist; danach liefert
+    ``wait4`` CPU-Zeiten und maximalen Speicher. Der Rückgabecode landet wie
+    bei ``proc.wait()`` in ``proc.returncode``. Wo das nicht geht (andere
+    Systeme, Prozess schon abgeräumt), wird nur die Wandzeit gemessen.
+    """
+    stats = stats if stats is not None else ProcessStats()
+    started = getattr(proc, "started_at", None)
+    if proc.returncode is None and hasattr(os, "wait4") and hasattr(os, "waitid"):
+        try:
+            os.waitid(os.P_PID, proc.pid, os.WEXITED | os.WNOWAIT)
+            io = _read_io(proc.pid)
+            _, status, ru = os.wait4(proc.pid, 0)
+        except OSError as e:
+            logger.debug("Verbrauch nicht messbar: %s", e)
+        else:
+            proc.returncode = os.waitstatus_to_exitcode(status)
+            stats.cpu_user = ru.ru_utime
+            stats.cpu_system = ru.ru_stime
+            stats.max_rss_kb = ru.ru_maxrss
+            stats.read_bytes = io.get("rchar", 0)
+            stats.write_bytes = io.get("wchar", 0)
+    proc.wait()
+    if started is not None:
+        stats.wall = time.perf_counter() - started
+    logger.info(
+        "ffmpeg beendet: %.1fs Wandzeit, CPU %.1fs/%.1fs, max. %d KiB,"
+        " E/A %d/%d Bytes",
+        stats.wall,
+        stats.cpu_user,
+        stats.cpu_system,
+        stats.max_rss_kb,
+        stats.read_bytes,
+        stats.write_bytes,
+    )
+    return stats
+
+
+def sum_stats(items: Iterable[ProcessStats]) -> ProcessStats:
+    """Verbrauch mehrerer Jobs zusammenfassen (Speicher als Maximum)."""
+    total = ProcessStats()
+    for s in items:
+        total.wall += s.wall
+        total.cpu_user += s.cpu_user
+        total.cpu_system += s.cpu_system
+        total.max_rss_kb = max(total.max_rss_kb, s.max_rss_kb)
+        total.read_bytes += s.read_bytes
+        total.write_bytes += s.write_bytes
+    return total
+
+
+def format_stats(stats: ProcessStats) -> str:
+    """Kurzform für Log und Übersicht."""
+    mb = 1024 * 1024
+    return (
+        f"CPU {stats.cpu:.1f}s (Wand {stats.wall:.1f}s), "
+        f"max. {stats.max_rss_kb / 1024:.0f} MB, "
+        f"E/A {stats.read_bytes / mb:.1f}/{stats.write_bytes / mb:.1f} MB"
+    )
+
+
+__all__ = [
+    "ProcessStats",
+    "STAT_FIELDS",
+    "format_stats",
+    "sum_stats",
+    "wait_with_stats",
+]
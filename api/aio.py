@@ -0,0 +1,111 @@
+"""asyncio-Schnittstelle für ffmpeg (ohne Thread pro Job)."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import subprocess
+from dataclasses import dataclass
+from typing import AsyncIterator, List, Optional, Sequence
+
+from .progress import FfmpegProgress, with_progress
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class JobEvent:
+    """Fortschritt oder Abschluss eines Jobs aus :func:`run_batch_async`."""
+
+    index: int
+    percent: float
+    speed: float
+    done: bool = False
+    error: str = ""
+
+
+async def iter_progress(
+    cmd: List[str], progress: Optional[FfmpegProgress] = None
+) -> AsyncIterator[FfmpegProgress]:
+    """ffmpeg starten und den Parser nach jedem Fortschrittsblock liefern.
+
+    Endet ffmpeg mit Fehler, hebt der Iterator am Ende ``RuntimeError`` mit
+    den letzten Meldungen aus. Wird der Iterator geschlossen oder die
+    aufrufende Task abgebrochen, wird der Prozess beendet.
+    """
+    progress = progress if progress is not None else FfmpegProgress()
+    cmd = with_progress(cmd)
+    logger.info("Starte ffmpeg (async): %s", " ".join(cmd))
+    proc = await asyncio.create_subprocess_exec(
+        *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT
+    )
+    try:
+        async for raw in proc.stdout:
+            if progress.feed(raw.decode(errors="replace")):
+                yield progress
+        returncode = await proc.wait()
+    except BaseException:
+        # Abbruch (CancelledError) oder geschlossener Iterator (GeneratorExit)
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+            logger.info("ffmpeg abgebrochen: %s", cmd[-1])
+        raise
+    if returncode != 0:
+        msg = "\n".join(progress.messages) or f"ffmpeg Fehlercode {returncode}"
+        logger.error("ffmpeg fehlgeschlagen: %s", msg)
+        raise RuntimeError(msg)
+
+
+async def run_ffmpeg_async(
+    cmd: List[str], progress: Optional[FfmpegProgress] = None
+) -> subprocess.CompletedProcess:
+    """Gegenstück zu :func:`api.converter.run_ffmpeg` für asyncio."""
+    progress = progress if progress is not None else FfmpegProgress()
+    async for _ in iter_progress(cmd, progress):
+        pass
+    return subprocess.CompletedProcess(cmd, 0, "", "\n".join(progress.messages))
+
+
+async def run_batch_async(
+    cmds: Sequence[List[str]],
+    concurrency: int = 2,
+    durations: Optional[Sequence[float]] = None,
+) -> AsyncIterator[JobEvent]:
+    """Mehrere Aufrufe mit höchstens ``concurrency`` Prozessen ausführen.
+
+    Liefert :class:`JobEvent` für jeden Fortschrittsblock und genau ein
+    Ereignis mit ``done=True`` je Job (``error`` gesetzt bei Fehlern). Wird
+    der Iterator vorzeitig geschlossen (``contextlib.aclosing``) oder die
+    Task abgebrochen, werden alle laufenden Prozesse beendet.
+    """
+    events: "asyncio.Queue[JobEvent]" = asyncio.Queue()
+    slots = asyncio.Semaphore(max(1, concurrency))
+
+    async def one(i: int, cmd: List[str]) -> None:
+        async with slots:
+            prog = FfmpegProgress(durations[i] if durations else 0.0)
+            try:
+                async for p in iter_progress(cmd, prog):
+                    await events.put(JobEvent(i, p.percent, p.speed))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                await events.put(JobEvent(i, prog.percent, prog.speed, True, str(e)))
+                return
+            await events.put(JobEvent(i, 100.0, prog.speed, True))
+
+    tasks = [asyncio.create_task(one(i, cmd)) for i, cmd in enumerate(cmds)]
+    try:
+        remaining = len(tasks)
+        while remaining:
+            event = await events.get()
+            remaining -= event.done
+            yield event
+    finally:
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+__all__ = ["JobEvent", "iter_progress", "run_batch_async", "run_ffmpeg_async"]
@@ -0,0 +1,338 @@
+"""Messung der Kodiergeschwindigkeit mit künstlichen Testdateien."""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import logging
+import platform
+import resource
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from . import converter
+from .accounting import wait_with_stats
+from .thumbs import fit_size, make_thumbnail
+
+logger = logging.getLogger(__name__)
+
+BENCH_PRESETS = ("ultrafast", "veryfast", "medium")
+BENCH_SIZES = ((1280, 720), (1920, 1080))
+BENCH_MODES = ("normal", "still", "loop")
+REPORT_FIELDS = (
+    "mode",
+    "preset",
+    "width",
+    "height",
+    "media_seconds",
+    "wall_seconds",
+    "cpu_seconds",
+    "realtime_factor",
+    "output_bytes",
+)
+
+# Dekodierwege für Vorschaubilder: voll dekodieren, der frühere Weg
+# (``Image.thumbnail`` mit implizitem Draft) und api.thumbs.make_thumbnail
+THUMB_DECODERS = ("voll", "bisher", "schnell")
+THUMB_PHOTO_SIZE = (6000, 4000)
+THUMB_FIELDS = (
+    "images",
+    "decoder",
+    "files",
+    "wall_seconds",
+    "cpu_seconds",
+    "ms_per_file",
+    "max_rss_kb",
+    "extra_rss_kb",
+)
+
+
+def make_media(
+    work_dir: Path, seconds: int, size: Tuple[int, int]
+) -> Tuple[Path, Path]:
+    """Testbild und Sinuston mit den eingebauten Quellen von ffmpeg erzeugen."""
+    image = work_dir / f"bench_{size[0]}x{size[1]}.png"
+    audio = work_dir / f"bench_{seconds}s.wav"
+    converter.run_ffmpeg(
+        [
+            "ffmpeg",
+            "-y",
+            "-f",
+            "lavfi",
+            "-i",
+            f"testsrc2=size={size[0]}x{size[1]}",
+            "-frames:v",
+            "1",
+            str(image),
+        ]
+    )
+    converter.run_ffmpeg(
+        [
+            "ffmpeg",
+            "-y",
+            "-f",
+            "lavfi",
+            "-i",
+            f"sine=frequency=440:sample_rate=44100:duration={seconds}",
+            str(audio),
+        ]
+    )
+    return image, audio
+
+
+def _child_cpu() -> float:
+    ru = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return ru.ru_utime + ru.ru_stime
+
+
+def bench_case(
+    image: Path,
+    audio: Path,
+    output: Path,
+    seconds: int,
+    width: int,
+    height: int,
+    preset: str,
+    mode: str,
+    crf: int = 23,
+    abitrate: str = "192k",
+) -> Dict[str, Any]:
+    """Einen Durchlauf messen (Wandzeit, CPU-Zeit der Kindprozesse, Größe)."""
+    cpu0, t0 = _child_cpu(), time.perf_counter()
+    cmd = converter.prepare_encode_cmd(
+        str(image),
+        str(audio),
+        str(output),
+        width,
+        height,
+        abitrate,
+        crf,
+        preset,
+        still=mode == "still",
+        loop=mode == "loop",
+    )
+    converter.run_ffmpeg(cmd)
+    wall = time.perf_counter() - t0
+    cpu = _child_cpu() - cpu0
+    if mode == "loop":
+        # Segment nicht im Cache liegen lassen, jeder Lauf zahlt es selbst
+        converter.segment_path(str(image), width, height, crf, preset, False).unlink(
+            missing_ok=True
+        )
+    return {
+        "mode": mode,
+        "preset": preset,
+        "width": width,
+        "height": height,
+        "media_seconds": seconds,
+        "wall_seconds": round(wall, 3),
+        "cpu_seconds": round(cpu, 3),
+        "realtime_factor": round(seconds / wall, 2) if wall > 0 else 0.0,
+        "output_bytes": output.stat().st_size if output.exists() else 0,
+    }
+
+
+def run_benchmark(
+    seconds: int = 30,
+    presets: Sequence[str] = BENCH_PRESETS,
+    sizes: Iterable[Tuple[int, int]] = BENCH_SIZES,
+    modes: Sequence[str] = BENCH_MODES,
+) -> List[Dict[str, Any]]:
+    """Alle Kombinationen aus Modus, Preset und Auflösung nacheinander messen."""
+    rows = []
+    with tempfile.TemporaryDirectory(prefix="videobatch_bench_") as td:
+        work = Path(td)
+        for width, height in sizes:
+            image, audio = make_media(work, seconds, (width, height))
+            for mode in modes:
+                for preset in presets:
+                    out = work / f"out_{mode}_{preset}_{width}x{height}.mp4"
+                    row = bench_case(
+                        image, audio, out, seconds, width, height, preset, mode
+                    )
+                    logger.info("Benchmark: %s", row)
+                    rows.append(row)
+                    out.unlink(missing_ok=True)
+    return rows
+
+
+def make_photo(
+    path: Path,
+    size: Tuple[int, int] = THUMB_PHOTO_SIZE,
+    preview: Optional[Tuple[int, int]] = None,
+) -> Path:
+    """Verrauschtes Test-JPEG erzeugen, optional mit EXIF-Vorschau ``preview``.
+
+    Das Rauschen lässt sich kaum komprimieren, die Datei ist also ähnlich
+    teuer zu dekodieren wie ein echtes Foto.
+    """
+    from PIL import Image
+
+    noise = Image.effect_noise(size, 64)
+    ramp = Image.linear_gradient("L").resize(size)
+    img = Image.merge(
+        "RGB", (noise, ramp, ramp.transpose(Image.Transpose.FLIP_LEFT_RIGHT))
+    )
+    exif = b""
+    if preview:
+        buf = io.BytesIO()
+        img.resize(preview).save(buf, "JPEG", quality=80)
+        data = buf.getvalue()
+        # TIFF-Kopf, leeres IFD0, IFD1 mit Offset und Länge der Vorschau
+        tiff = b"II*\x00" + struct.pack("<IHI", 8, 0, 14)
+        tiff += struct.pack("<HHHIIHHII", 2, 0x0201, 4, 1, 44, 0x0202, 4, 1, len(data))
+        exif = b"Exif\x00\x00" + tiff + struct.pack("<I", 0) + data
+    img.save(path, "JPEG", quality=90, exif=exif)
+    return path
+
+
+def _thumb_decode(decoder: str, path: str, size: Tuple[int, int]) -> None:
+    from PIL import Image
+
+    if decoder == "schnell":
+        make_thumbnail(path, size)
+        return
+    with Image.open(path) as img:
+        if decoder == "voll":
+            img.load()
+            img.thumbnail(size, reducing_gap=None)
+        else:
+            img.thumbnail(size)
+        img.convert("RGBA")
+
+
+def _peak_rss_kb() -> int:
+    """Spitzenspeicher dieses Prozesses seit ``exec`` (``VmHWM``).
+
+    ``ru_maxrss`` taugt hier nicht: Linux übernimmt darin den Wert des
+    Elternprozesses zum Zeitpunkt von ``fork``.
+    """
+    try:
+        with open("/proc/self/status", encoding="ascii") as fh:
+            for line in fh:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def thumb_worker(argv: Sequence[str]) -> None:
+    """Einstieg des Messprozesses: ``decoder breite höhe datei...``.
+
+    Gibt am Ende den eigenen Spitzenspeicher in KiB aus.
+    """
+    import PIL.Image  # noqa: F401  gehört zur Grundlast, auch ohne Dateien
+
+    decoder, w, h, *paths = argv
+    for p in paths:
+        _thumb_decode(decoder, p, (int(w), int(h)))
+    print(_peak_rss_kb())
+
+
+def _measure_thumbs(decoder: str, paths: Sequence[Path], size: Tuple[int, int]):
+    root = Path(__file__).resolve().parents[1]
+    code = (
+        f"import sys; sys.path.insert(0, {str(root)!r}); "
+        "from api.bench import thumb_worker; thumb_worker(sys.argv[1:])"
+    )
+    cmd = [sys.executable, "-c", code, decoder, str(size[0]), str(size[1])]
+    proc = subprocess.Popen(cmd + [str(p) for p in paths], stdout=subprocess.PIPE)
+    proc.started_at = time.perf_counter()
+    out = proc.stdout.read()
+    stats = wait_with_stats(proc)
+    if proc.returncode:
+        raise RuntimeError(f"Messprozess für {decoder} mit Code {proc.returncode}")
+    stats.max_rss_kb = int(out.split()[-1])
+    return stats
+
+
+def run_thumb_benchmark(
+    images: Optional[Sequence[Path]] = None,
+    size: Tuple[int, int] = (160, 90),
+    repeat: int = 8,
+    decoders: Sequence[str] = THUMB_DECODERS,
+) -> List[Dict[str, Any]]:
+    """Dekodierwege für Vorschaubilder vergleichen (Zeit, CPU, Spitzenspeicher).
+
+    Jeder Weg läuft in einem eigenen Prozess, damit ``max_rss_kb`` nur
+    seinen Spitzenspeicher zeigt. ``extra_rss_kb`` und ``ms_per_file``
+    ziehen Speicher und CPU-Zeit eines Prozesses ab, der nur Pillow lädt.
+    Ohne ``images`` werden Test-JPEGs mit und ohne EXIF-Vorschau erzeugt.
+    """
+    with tempfile.TemporaryDirectory(prefix="videobatch_thumbs_") as td:
+        if images:
+            sets = {"eigene": list(images)}
+        else:
+            work = Path(td)
+            # Kameras legen meist 160 Pixel breite Vorschauen ab
+            preview = fit_size(THUMB_PHOTO_SIZE, (160, 120))
+            sets = {
+                "mit Vorschau": [make_photo(work / "exif.jpg", preview=preview)],
+                "ohne Vorschau": [make_photo(work / "plain.jpg")],
+            }
+        base = _measure_thumbs(decoders[0], [], size)
+        rows = []
+        for name, paths in sets.items():
+            paths = list(paths) * repeat
+            for decoder in decoders:
+                st = _measure_thumbs(decoder, paths, size)
+                row = {
+                    "images": name,
+                    "decoder": decoder,
+                    "files": len(paths),
+                    "wall_seconds": round(st.wall, 3),
+                    "cpu_seconds": round(st.cpu, 3),
+                    "ms_per_file": round(
+                        1000 * max(0.0, st.cpu - base.cpu) / max(1, len(paths)), 1
+                    ),
+                    "max_rss_kb": st.max_rss_kb,
+                    "extra_rss_kb": max(0, st.max_rss_kb - base.max_rss_kb),
+                }
+                logger.info("Benchmark: %s", row)
+                rows.append(row)
+    return rows
+
+
+def write_report(
+    rows: List[Dict[str, Any]], path: Path, fields: Sequence[str] = REPORT_FIELDS
+) -> None:
+    """Ergebnisse als JSON (``.json``) oder CSV (sonst) speichern."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix.lower() == ".json":
+        meta = {
+            "host": platform.node(),
+            "machine": platform.machine(),
+            "python": platform.python_version(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        path.write_text(
+            json.dumps({"meta": meta, "results": rows}, indent=2), encoding="utf-8"
+        )
+        return
+    with path.open("w", newline="", encoding="utf-8") as fh:
+        writer = csv.DictWriter(fh, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+__all__ = [
+    "BENCH_MODES",
+    "BENCH_PRESETS",
+    "BENCH_SIZES",
+    "THUMB_DECODERS",
+    "THUMB_FIELDS",
+    "bench_case",
+    "make_media",
+    "make_photo",
+    "run_benchmark",
+    "run_thumb_benchmark",
+    "thumb_worker",
+    "write_report",
+]
@@ -0,0 +1,167 @@
+"""Zwischenspeicher für fertige Videos (inhaltsadressiert)."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from config.paths import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+# Einstellungen, die das Ergebnis beeinflussen und daher in den Schlüssel eingehen
+CACHE_KEYS = (
+    "width",
+    "height",
+    "crf",
+    "preset",
+    "abitrate",
+    "still",
+    "loop",
+    "audio_copy",
+)
+ENCODE_CACHE_DIR = CACHE_DIR / "encodes"
+DEFAULT_MAX_BYTES = 10 * 1024**3
+_CHUNK = 1024 * 1024
+# ioctl für Reflinks (Btrfs, XFS, bcachefs) unter Linux
+_FICLONE = 0x40049409
+
+
+def file_digest(path: Path | str) -> str:
+    """SHA-256-Prüfsumme des Dateiinhalts berechnen."""
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _clone_or_copy(src: Path, dst: Path) -> None:
+    """Eigenständige Kopie anlegen, per Reflink wo das Dateisystem es kann.
+
+    Ein Reflink teilt nur die Datenblöcke bis zur ersten Änderung; anders
+    als ein harter Link verändert das Bearbeiten einer Datei die andere
+    nicht.
+    """
+    try:
+        import fcntl
+
+        with open(src, "rb") as fin, open(dst, "wb") as fout:
+            fcntl.ioctl(fout.fileno(), _FICLONE, fin.fileno())
+        shutil.copystat(src, dst)
+        return
+    except (ImportError, OSError):
+        pass
+    shutil.copy2(src, dst)
+
+
+class EncodeCache:
+    """Fertige MP4-Dateien nach Bild, Audio und Einstellungen ablegen.
+
+    Einträge und Treffer sind eigenständige Kopien (Reflink, sonst volle
+    Kopie), damit eine nachträglich bearbeitete Ausgabe weder den Cache
+    noch andere Ausgaben verändert.
+    Übersteigt der Cache ``max_bytes``, werden die am längsten nicht
+    genutzten Einträge entfernt (LRU, über die Änderungszeit der Datei).
+    """
+
+    def __init__(
+        self, root: Path = ENCODE_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES
+    ):
+        """Cache-Ordner und Größengrenze festlegen."""
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def key(
+        self, image_path: Path | str, audio_path: Path | str, settings: Dict[str, Any]
+    ) -> str:
+        """Schlüssel aus Bildinhalt, Audioinhalt und Einstellungen bilden."""
+        relevant = {k: settings.get(k) for k in CACHE_KEYS}
+        h = hashlib.sha256()
+        h.update(file_digest(image_path).encode())
+        h.update(file_digest(audio_path).encode())
+        h.update(json.dumps(relevant, sort_keys=True).encode())
+        return h.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.mp4"
+
+    def fetch(self, key: str, dest: Path | str) -> bool:
+        """Treffer nach ``dest`` bringen; ``False`` wenn nichts vorhanden ist."""
+        cached = self._path(key)
+        try:
+            os.utime(cached)
+        except FileNotFoundError:
+            return False
+        dest = Path(dest)
+        dest.unlink(missing_ok=True)
+        _clone_or_copy(cached, dest)
+        logger.info("Cache-Treffer: %s -> %s", cached.name, dest)
+        return True
+
+    def store(self, key: str, src: Path | str) -> None:
+        """Fertiges Video aufnehmen und danach den Cache begrenzen."""
+        src = Path(src)
+        if not src.exists():
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.root / f"{key}.{threading.get_ident()}.tmp"
+        try:
+            _clone_or_copy(src, tmp)
+            os.replace(tmp, self._path(key))
+        except OSError as e:
+            logger.warning("Cache konnte nicht geschrieben werden: %s", e)
+            tmp.unlink(missing_ok=True)
+            return
+        self.evict()
+
+    def evict(self) -> None:
+        """Älteste Einträge löschen, bis die Größengrenze eingehalten wird."""
+        with self._lock:
+            entries = []
+            for f in self.root.glob("*.mp4"):
+                try:
+                    st = f.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime_ns, st.st_size, f))
+            total = sum(size for _, size, _ in entries)
+            for _, size, f in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                f.unlink(missing_ok=True)
+                total -= size
+                logger.info("Cache-Eintrag entfernt: %s", f.name)
+
+
+def cached_encode_key(
+    cache: Optional[EncodeCache],
+    image_path: Path | str,
+    audio_path: Path | str,
+    settings: Dict[str, Any],
+) -> Optional[str]:
+    """Schlüssel berechnen oder ``None`` liefern, wenn kein Cache aktiv ist."""
+    if cache is None:
+        return None
+    try:
+        return cache.key(image_path, audio_path, settings)
+    except OSError as e:
+        logger.debug("Cache-Schlüssel nicht berechenbar: %s", e)
+        return None
+
+
+__all__ = [
+    "CACHE_KEYS",
+    "DEFAULT_MAX_BYTES",
+    "ENCODE_CACHE_DIR",
+    "EncodeCache",
+    "cached_encode_key",
+    "file_digest",
+]
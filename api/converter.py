@@ -2,12 +2,82 @@
 
 from __future__ import annotations
 
+import hashlib
+import os
 import subprocess
 import logging
-from typing import List
+import time
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+from config.paths import CACHE_DIR
+from .accounting import ProcessStats, wait_with_stats
+from .cache import EncodeCache
+from .governor import ResourceGovernor
+from .probe import can_copy_audio, probe_duration
+from .progress import FfmpegProgress, with_progress
 
 logger = logging.getLogger(__name__)
 
+# Standbild-Modus: ein Bild pro Sekunde und ein Keyframe alle zehn Sekunden
+STILL_FPS = 1
+STILL_GOP = 10
+
+# Schleifen-Modus: Länge des einmalig kodierten Videosegments in Sekunden
+LOOP_SEGMENT_SECONDS = 10
+SEGMENT_DIR = CACHE_DIR / "segments"
+# Obergrenze für gespeicherte Segmente; darüber fliegen die ältesten (LRU)
+SEGMENT_MAX_BYTES = 1024**3
+
+# Diashow: Bildrate der Ausgabe, Standzeit je Bild ohne bekannte Audiolänge
+SLIDE_FPS = 25
+SLIDE_SECONDS = 5.0
+SLIDES_DIR = CACHE_DIR / "slides"
+
+# "-shortest" allein schneidet bei 1 Bild/s (Standbild-Modus) erst Sekunden
+# nach dem Audioende; die Flags beenden die Ausgabe mit dem kürzesten Strom
+_SHORTEST = ["-shortest", "-fflags", "+shortest", "-max_interleave_delta", "0"]
+
+
+def _scale_filter(width: int, height: int) -> str:
+    """Skalieren mit Seitenverhältnis und schwarzen Rändern (Padding)."""
+    return (
+        f"scale={width}:{height}:force_original_aspect_ratio=decrease,"
+        f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2"
+    )
+
+
+def _audio_args(abitrate: str, copy_audio: bool) -> List[str]:
+    """Audio übernehmen (``copy``) oder nach AAC umwandeln."""
+    if copy_audio:
+        return ["-c:a", "copy"]
+    return ["-c:a", "aac", "-b:a", abitrate]
+
+
+def _ladder_args(
+    renditions: Sequence[Tuple[int, int, str]], encode: List[str]
+) -> List[str]:
+    """Mehrere Ausgaben aus einem Dekodierlauf (``split``-Filtergraph).
+
+    Das Bild wird einmal auf die erste Auflösung gebracht und dann
+    aufgeteilt; weitere Auflösungen werden daraus verkleinert. ``encode``
+    sind die Kodier-Optionen, die jede Ausgabe erhält. Größere Auflösungen
+    als die erste würden nur hochskaliert und werden abgelehnt.
+    """
+    (w0, h0, _), n = renditions[0], len(renditions)
+    for w, h, _ in renditions[1:]:
+        if w > w0 or h > h0:
+            raise ValueError(f"Auflösung {w}x{h} ist größer als {w0}x{h0}")
+    pads = "".join(f"[s{k}]" for k in range(n))
+    graph = [f"[0:v]{_scale_filter(w0, h0)},split={n}{pads}"]
+    for k, (w, h, _) in enumerate(renditions[1:], 1):
+        graph.append(f"[s{k}]{_scale_filter(w, h)}[v{k}]")
+    args = ["-filter_complex", ";".join(graph)]
+    for k, (_, _, out) in enumerate(renditions):
+        label = "[s0]" if k == 0 else f"[v{k}]"
+        args += ["-map", label, "-map", "1:a", *encode, out]
+    return args
+
 
 def build_ffmpeg_cmd(
     image_path: str,
@@ -18,6 +88,10 @@ def build_ffmpeg_cmd(
     abitrate: str,
     crf: int,
     preset: str,
+    still: bool = False,
+    copy_audio: bool = False,
+    limit: Optional[float] = None,
+    ladder: Sequence[Tuple[int, int, str]] = (),
 ) -> List[str]:
     """Erzeuge den ffmpeg-Aufruf.
 
@@ -39,30 +113,312 @@ def build_ffmpeg_cmd(
         Qualitätsfaktor ("Constant Rate Factor").
     preset: str
         ffmpeg-Voreinstellung für Geschwindigkeit/Qualität.
+    still: bool
+        Standbild-Modus: sehr niedrige Bildrate und lange GOPs
+        ("Group of Pictures"), damit nur wenige Bilder kodiert werden.
+    copy_audio: bool
+        Audiospur unverändert übernehmen statt nach AAC umzuwandeln.
+    limit: float, optional
+        Nur die ersten ``limit`` Sekunden kodieren (Probelauf).
+    ladder: sequence of (int, int, str)
+        Weitere Auflösungen ``(Breite, Höhe, Zieldatei)``, die im selben
+        ffmpeg-Lauf neben ``output`` entstehen.
+    """
+    duration = ["-t", f"{limit:g}"] if limit else []
+    video_in = ["-framerate", str(STILL_FPS)] if still else []
+    video_out = ["-r", str(STILL_FPS), "-g", str(STILL_GOP)] if still else []
+    inputs = ["ffmpeg", "-y", "-loop", "1", *video_in, "-i", image_path]
+    inputs += ["-i", audio_path]
+    if ladder:
+        encode = [
+            "-c:v",
+            "libx264",
+            "-tune",
+            "stillimage",
+            *video_out,
+            *_audio_args(abitrate, copy_audio),
+            *_SHORTEST,
+            "-preset",
+            preset,
+            "-crf",
+            str(crf),
+            *duration,
+        ]
+        return [*inputs, *_ladder_args([(width, height, output), *ladder], encode)]
+    return [
+        *inputs,
+        "-c:v",
+        "libx264",
+        "-tune",
+        "stillimage",
+        *video_out,
+        "-vf",
+        _scale_filter(width, height),
+        *_audio_args(abitrate, copy_audio),
+        *_SHORTEST,
+        "-preset",
+        preset,
+        "-crf",
+        str(crf),
+        *duration,
+        output,
+    ]
+
+
+def build_segment_cmd(
+    image_path: str,
+    segment: str,
+    width: int,
+    height: int,
+    crf: int,
+    preset: str,
+    still: bool = False,
+    seconds: int = LOOP_SEGMENT_SECONDS,
+) -> List[str]:
+    """Erzeuge den Aufruf für ein kurzes, stummes Videosegment aus dem Bild.
+
+    Das Segment enthält keine B-Frames, damit es sich später verlustfrei
+    aneinanderhängen ("stream copy") lässt.
     """
+    video_in = ["-framerate", str(STILL_FPS)] if still else []
+    video_out = ["-r", str(STILL_FPS), "-g", str(STILL_GOP)] if still else []
     return [
         "ffmpeg",
         "-y",
         "-loop",
         "1",
+        *video_in,
         "-i",
         image_path,
+        "-t",
+        str(seconds),
+        "-c:v",
+        "libx264",
+        "-tune",
+        "stillimage",
+        "-bf",
+        "0",
+        *video_out,
+        "-vf",
+        _scale_filter(width, height),
+        "-preset",
+        preset,
+        "-crf",
+        str(crf),
+        "-an",
+        segment,
+    ]
+
+
+def build_loop_mux_cmd(
+    segment: str,
+    audio_path: str,
+    output: str,
+    abitrate: str,
+    copy_audio: bool = False,
+) -> List[str]:
+    """Segment bis zur Audiolänge wiederholen, ohne das Video neu zu kodieren."""
+    return [
+        "ffmpeg",
+        "-y",
+        "-stream_loop",
+        "-1",
+        "-i",
+        segment,
         "-i",
         audio_path,
+        "-map",
+        "0:v",
+        "-map",
+        "1:a",
+        "-c:v",
+        "copy",
+        *_audio_args(abitrate, copy_audio),
+        # ohne die Flags endet "-shortest" bei Stream-Copy erst am Segmentende
+        "-shortest",
+        "-fflags",
+        "+shortest",
+        "-max_interleave_delta",
+        "0",
+        output,
+    ]
+
+
+def segment_path(
+    image_path: str, width: int, height: int, crf: int, preset: str, still: bool
+) -> Path:
+    """Pfad des Segments; ändert sich mit Bildinhalt (Größe, Zeit) und Qualität."""
+    st = os.stat(image_path)
+    key = "|".join(
+        str(v)
+        for v in (
+            Path(image_path).resolve(),
+            st.st_size,
+            st.st_mtime_ns,
+            width,
+            height,
+            crf,
+            preset,
+            still,
+            LOOP_SEGMENT_SECONDS,
+        )
+    )
+    return SEGMENT_DIR / f"{hashlib.sha1(key.encode()).hexdigest()}.mp4"
+
+
+def ensure_segment(
+    image_path: str,
+    width: int,
+    height: int,
+    crf: int,
+    preset: str,
+    still: bool = False,
+) -> Path:
+    """Segment einmalig erzeugen und danach wiederverwenden.
+
+    Die Segmente liegen wie der Ergebnis-Cache unter einer Größengrenze
+    (:data:`SEGMENT_MAX_BYTES`); die am längsten unbenutzten werden gelöscht.
+    """
+    seg = segment_path(image_path, width, height, crf, preset, still)
+    try:
+        os.utime(seg)  # als benutzt markieren, damit es zuletzt verdrängt wird
+    except FileNotFoundError:
+        pass
+    else:
+        logger.info("Segment wird wiederverwendet: %s", seg)
+        return seg
+    # Halbfertige Segmente im Unterordner sieht das Aufräumen nicht
+    tmp = seg.parent / "tmp" / f"{seg.stem}.{os.getpid()}.{id(seg)}.mp4"
+    tmp.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        run_ffmpeg(
+            build_segment_cmd(image_path, str(tmp), width, height, crf, preset, still)
+        )
+        os.replace(tmp, seg)
+    finally:
+        tmp.unlink(missing_ok=True)
+    EncodeCache(seg.parent, SEGMENT_MAX_BYTES).evict()
+    return seg
+
+
+def slide_durations(
+    count: int, total: float, durations: Optional[Sequence[float]] = None
+) -> List[float]:
+    """Standzeit je Bild: vorgegeben oder gleichmäßig über ``total`` verteilt."""
+    if durations:
+        if len(durations) != count:
+            raise ValueError(
+                f"{len(durations)} Standzeiten für {count} Bilder angegeben"
+            )
+        return [float(d) for d in durations]
+    each = total / count if total > 0 else SLIDE_SECONDS
+    return [each] * count
+
+
+def _concat_quote(path: str) -> str:
+    return "'" + path.replace("'", "'\\''") + "'"
+
+
+def write_concat_list(
+    images: Sequence[str], durations: Sequence[float], list_path: Path
+) -> Path:
+    """Bildliste für den concat-Demuxer schreiben.
+
+    Das letzte Bild steht zweimal in der Liste, weil der Demuxer die
+    Standzeit des letzten Eintrags sonst ignoriert.
+    """
+    lines = ["ffconcat version 1.0"]
+    for img, dur in zip(images, durations):
+        lines += [
+            f"file {_concat_quote(str(Path(img).resolve()))}",
+            f"duration {dur:g}",
+        ]
+    lines.append(f"file {_concat_quote(str(Path(images[-1]).resolve()))}")
+    list_path.parent.mkdir(parents=True, exist_ok=True)
+    list_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return list_path
+
+
+def remove_concat_list(cmd: Sequence[str]) -> None:
+    """Von :func:`prepare_encode_cmd` geschriebene concat-Liste löschen.
+
+    Nach dem ffmpeg-Lauf aufrufen; Aufrufe ohne Diashow bleiben unberührt,
+    ebenso Listen außerhalb von ``SLIDES_DIR``.
+    """
+    cmd = list(cmd)
+    if "concat" not in cmd:
+        return
+    start = cmd.index("concat")
+    if "-i" not in cmd[start:]:
+        return
+    list_file = Path(cmd[cmd.index("-i", start) + 1])
+    if list_file.parent == SLIDES_DIR:
+        list_file.unlink(missing_ok=True)
+
+
+def build_slideshow_cmd(
+    list_file: str,
+    audio_path: str,
+    output: str,
+    width: int,
+    height: int,
+    abitrate: str,
+    crf: int,
+    preset: str,
+    still: bool = False,
+    copy_audio: bool = False,
+    ladder: Sequence[Tuple[int, int, str]] = (),
+) -> List[str]:
+    """Mehrere Bilder (concat-Liste) mit einer Audiodatei in einem Lauf kodieren.
+
+    ``ladder`` wie bei :func:`build_ffmpeg_cmd`.
+    """
+    fps = STILL_FPS if still else SLIDE_FPS
+    gop = ["-g", str(STILL_GOP)] if still else []
+    inputs = ["ffmpeg", "-y", "-f", "concat", "-safe", "0", "-i", list_file]
+    inputs += ["-i", audio_path]
+    if ladder:
+        encode = [
+            "-c:v",
+            "libx264",
+            "-tune",
+            "stillimage",
+            "-r",
+            str(fps),
+            *gop,
+            *_audio_args(abitrate, copy_audio),
+            "-shortest",
+            "-fflags",
+            "+shortest",
+            "-max_interleave_delta",
+            "0",
+            "-preset",
+            preset,
+            "-crf",
+            str(crf),
+        ]
+        return [*inputs, *_ladder_args([(width, height, output), *ladder], encode)]
+    return [
+        *inputs,
+        "-map",
+        "0:v",
+        "-map",
+        "1:a",
         "-c:v",
         "libx264",
         "-tune",
         "stillimage",
+        "-r",
+        str(fps),
+        *gop,
         "-vf",
-        (
-            f"scale={width}:{height}:force_original_aspect_ratio=decrease,"
-            f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2"
-        ),
-        "-c:a",
-        "aac",
-        "-b:a",
-        abitrate,
+        _scale_filter(width, height),
+        *_audio_args(abitrate, copy_audio),
         "-shortest",
+        "-fflags",
+        "+shortest",
+        "-max_interleave_delta",
+        "0",
         "-preset",
         preset,
         "-crf",
@@ -71,24 +427,151 @@ def build_ffmpeg_cmd(
     ]
 
 
-def start_ffmpeg(cmd: List[str]) -> subprocess.Popen:
-    """Start ffmpeg asynchronously in the background."""
+def prepare_encode_cmd(
+    image_path: str,
+    audio_path: str,
+    output: str,
+    width: int,
+    height: int,
+    abitrate: str,
+    crf: int,
+    preset: str,
+    still: bool = False,
+    loop: bool = False,
+    audio_passthrough: bool = False,
+    slides: Optional[Sequence[str]] = None,
+    durations: Optional[Sequence[float]] = None,
+    ladder: Sequence[Tuple[int, int, str]] = (),
+) -> List[str]:
+    """ffmpeg-Aufruf passend zum Modus liefern.
+
+    Im Schleifen-Modus (``loop``) wird zuerst das Videosegment erzeugt
+    (oder wiederverwendet); der zurückgegebene Aufruf kopiert es dann nur
+    noch bis zur Audiolänge. Sonst entspricht das Ergebnis
+    :func:`build_ffmpeg_cmd`.
+
+    Mit ``audio_passthrough`` wird die Audiospur geprüft und kopiert, wenn
+    sie bereits AAC mit höchstens ``abitrate`` ist; die Entscheidung landet
+    im Log und als ``-c:a copy`` im Aufruf.
+
+    Mit ``slides`` (weitere Bilder nach ``image_path``) entsteht eine
+    Diashow in einem einzigen ffmpeg-Lauf; ``durations`` gibt die Standzeit
+    je Bild vor, sonst wird die Audiolänge gleichmäßig verteilt. Der
+    Schleifen-Modus gilt dabei nicht.
+
+    ``ladder`` erzeugt weitere Auflösungen im selben Lauf (siehe
+    :func:`build_ffmpeg_cmd`); auch dann entfällt der Schleifen-Modus, weil
+    das kopierte Segment nur eine Auflösung hat.
+    """
+    copy_audio = False
+    if audio_passthrough:
+        copy_audio, reason = can_copy_audio(audio_path, abitrate)
+        logger.info(
+            "Audio %s (%s): %s",
+            "wird kopiert" if copy_audio else "wird neu kodiert",
+            reason,
+            audio_path,
+        )
+    if slides:
+        images = [image_path, *slides]
+        times = slide_durations(len(images), probe_duration(audio_path), durations)
+        name = hashlib.sha1(str(Path(output).resolve()).encode()).hexdigest()[:16]
+        list_file = write_concat_list(images, times, SLIDES_DIR / f"{name}.ffconcat")
+        return build_slideshow_cmd(
+            str(list_file),
+            audio_path,
+            output,
+            width,
+            height,
+            abitrate,
+            crf,
+            preset,
+            still=still,
+            copy_audio=copy_audio,
+            ladder=ladder,
+        )
+    if loop and ladder:
+        logger.info("Mehrere Auflösungen: Schleifen-Modus entfällt für %s", output)
+    elif loop:
+        seg = ensure_segment(image_path, width, height, crf, preset, still)
+        return build_loop_mux_cmd(str(seg), audio_path, output, abitrate, copy_audio)
+    return build_ffmpeg_cmd(
+        image_path,
+        audio_path,
+        output,
+        width,
+        height,
+        abitrate,
+        crf,
+        preset,
+        still=still,
+        copy_audio=copy_audio,
+        ladder=ladder,
+    )
+
+
+def start_ffmpeg(
+    cmd: List[str],
+    progress: bool = False,
+    governor: Optional[ResourceGovernor] = None,
+) -> subprocess.Popen:
+    """Start ffmpeg asynchronously in the background.
+
+    With ``progress=True`` the ``-progress`` channel is enabled and stderr is
+    merged into stdout, so callers read a single stream and feed every line
+    to a :class:`~api.progress.FfmpegProgress` parser. A ``governor`` sets
+    the encoder thread count and, if enabled, the CPU affinity. The start
+    time is kept as ``proc.started_at`` for
+    :func:`~api.accounting.wait_with_stats`.
+    """
+    if governor is not None:
+        cmd = governor.apply(cmd)
+    if progress:
+        cmd = with_progress(cmd)
     logger.info("Starte ffmpeg: %s", " ".join(cmd))
-    return subprocess.Popen(
-        cmd, stderr=subprocess.PIPE, stdout=subprocess.PIPE, text=True
+    proc = subprocess.Popen(
+        cmd,
+        stderr=subprocess.STDOUT if progress else subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        text=True,
     )
+    proc.started_at = time.perf_counter()
+    if governor is not None:
+        governor.pin(proc.pid)
+    return proc
 
 
-def run_ffmpeg(cmd: List[str]) -> subprocess.CompletedProcess:
+def run_ffmpeg(
+    cmd: List[str],
+    progress: Optional[FfmpegProgress] = None,
+    governor: Optional[ResourceGovernor] = None,
+    stats: Optional[ProcessStats] = None,
+) -> subprocess.CompletedProcess:
     """Führe ffmpeg aus und werte den Rückgabecode aus.
 
     Gibt ein ``CompletedProcess``-Objekt zurück oder hebt bei Fehlern eine
-    ``RuntimeError`` mit der letzten Fehlermeldung (``stderr``) aus.
+    ``RuntimeError`` mit der letzten Fehlermeldung (``stderr``) aus. Wird ein
+    ``progress``-Parser übergeben, liest er den Fortschritt während der
+    Ausführung mit (z.B. für Geschwindigkeit und Bildrate). ``governor``
+    wie bei :func:`start_ffmpeg`; ein übergebenes ``stats``-Objekt wird mit
+    dem Ressourcenverbrauch des Prozesses gefüllt.
     """
     logger.info("ffmpeg-Aufruf: %s", " ".join(cmd))
-    res = subprocess.run(cmd, stderr=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+    if progress is None and governor is None and stats is None:
+        res = subprocess.run(
+            cmd, stderr=subprocess.PIPE, stdout=subprocess.PIPE, text=True
+        )
+        err = res.stderr.strip()
+    else:
+        progress = progress if progress is not None else FfmpegProgress()
+        proc = start_ffmpeg(cmd, progress=True, governor=governor)
+        for line in proc.stdout:
+            progress.feed(line)
+        wait_with_stats(proc, stats)
+        err = "\n".join(progress.messages)
+        res = subprocess.CompletedProcess(proc.args, proc.returncode, "", err)
     if res.returncode != 0:
-        msg = res.stderr.strip() or f"ffmpeg Fehlercode {res.returncode}"
+        msg = err or f"ffmpeg Fehlercode {res.returncode}"
         logger.error("ffmpeg fehlgeschlagen: %s", msg)
         raise RuntimeError(msg)
     logger.info("ffmpeg erfolgreich abgeschlossen")
@@ -0,0 +1,98 @@
+"""CPU-Kerne auf gleichzeitig laufende ffmpeg-Prozesse verteilen."""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def available_cpus() -> List[int]:
+    """Kerne, auf denen dieser Prozess laufen darf."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+class ResourceGovernor:
+    """Threads und optional feste Kerne je ffmpeg-Prozess vergeben.
+
+    Bei ``jobs`` gleichzeitigen Prozessen erhält jeder ``Kerne // jobs``
+    Encoder-Threads statt der ffmpeg-Voreinstellung (etwa 1,5 Threads pro
+    Kern), damit sich die Prozesse nicht gegenseitig verdrängen. Mit
+    ``affinity`` wird jeder Prozess zusätzlich an seinen Anteil der Kerne
+    gebunden. Der Anteil hängt am aufrufenden Worker-Thread, weil jeder
+    Worker immer nur einen Prozess gleichzeitig startet.
+    """
+
+    def __init__(
+        self,
+        jobs: int = 1,
+        cpus: Optional[Sequence[int]] = None,
+        affinity: bool = False,
+    ):
+        """Aufteilung für ``jobs`` Prozesse auf ``cpus`` berechnen."""
+        self.cpus = list(cpus) if cpus else available_cpus()
+        self.jobs = max(1, jobs)
+        self.threads = max(1, len(self.cpus) // self.jobs)
+        self.affinity = affinity and hasattr(os, "sched_setaffinity")
+        self._slots = itertools.count()
+        self._local = threading.local()
+        logger.info(
+            "Ressourcen: %d Kerne, %d Jobs -> %s Threads je Prozess%s",
+            len(self.cpus),
+            self.jobs,
+            self.threads if self.jobs > 1 else "ffmpeg-Standard",
+            ", feste Kerne" if self.affinity else "",
+        )
+
+    def _slot(self) -> int:
+        slot = getattr(self._local, "slot", None)
+        if slot is None:
+            slot = self._local.slot = next(self._slots) % self.jobs
+        return slot
+
+    def plan(self) -> Tuple[int, List[int]]:
+        """Threads und Kerne für einen Prozess des aktuellen Threads."""
+        slot = self._slot()
+        if self.jobs > len(self.cpus):
+            return 1, [self.cpus[slot % len(self.cpus)]]
+        start = slot * self.threads
+        return self.threads, self.cpus[start : start + self.threads]
+
+    def apply(self, cmd: List[str]) -> List[str]:
+        """``-threads`` hinter jedem Video-Encoder einsetzen.
+
+        Läuft nur ein Job oder gibt der Aufruf ``-threads`` schon vor,
+        bleibt er unverändert.
+        """
+        if self.jobs == 1 or "-threads" in cmd:
+            return list(cmd)
+        threads, _ = self.plan()
+        out: List[str] = []
+        for n, arg in enumerate(cmd):
+            out.append(arg)
+            if n and cmd[n - 1] == "-c:v":
+                out += ["-threads", str(threads)]
+        return out
+
+    def pin(self, pid: int) -> None:
+        """Prozess (alle seine Threads) an die Kerne des Anteils binden."""
+        if not self.affinity:
+            return
+        _, cpus = self.plan()
+        tasks = [int(t.name) for t in Path(f"/proc/{pid}/task").glob("*")] or [pid]
+        for tid in tasks:
+            try:
+                os.sched_setaffinity(tid, cpus)
+            except OSError as e:
+                logger.debug("Affinität für %s nicht gesetzt: %s", tid, e)
+        logger.info("ffmpeg %s an Kerne %s gebunden", pid, cpus)
+
+
+__all__ = ["ResourceGovernor", "available_cpus"]
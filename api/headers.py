@@ -0,0 +1,186 @@
+"""Dauer häufiger Audioformate direkt aus dem Dateikopf lesen (ohne ffprobe)."""
+
+from __future__ import annotations
+
+import logging
+import struct
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Wie weit hinter einem ID3-Tag nach dem ersten MP3-Frame gesucht wird
+MP3_SYNC_WINDOW = 64 * 1024
+
+_MP3_BITRATES = {
+    1: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_MP3_RATES = {
+    1: (44100, 48000, 32000),
+    2: (22050, 24000, 16000),
+    2.5: (11025, 12000, 8000),
+}
+_PCM_CODECS = {
+    (1, 8): "pcm_u8",
+    (1, 16): "pcm_s16le",
+    (1, 24): "pcm_s24le",
+    (1, 32): "pcm_s32le",
+    (3, 32): "pcm_f32le",
+    (3, 64): "pcm_f64le",
+}
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+def _info(duration: float, codec: str, sample_rate: int) -> Dict[str, Any]:
+    return {"duration": duration, "audio_codec": codec, "sample_rate": sample_rate}
+
+
+def _skip_id3(fh: BinaryIO) -> int:
+    """Hinter einen ID3v2-Tag springen; liefert die neue Position."""
+    head = fh.read(10)
+    if len(head) == 10 and head[:3] == b"ID3":
+        size = 0
+        for b in head[6:10]:
+            size = (size << 7) | (b & 0x7F)
+        start = 10 + size + (10 if head[5] & 0x10 else 0)
+    else:
+        start = 0
+    fh.seek(start)
+    return start
+
+
+def read_wav(fh: BinaryIO, file_size: int) -> Optional[Dict[str, Any]]:
+    """Dauer einer PCM-WAV-Datei aus den Chunks ``fmt `` und ``data``."""
+    head = fh.read(12)
+    if len(head) < 12 or head[:4] != b"RIFF" or head[8:12] != b"WAVE":
+        return None
+    fmt = None
+    while True:
+        chunk = fh.read(8)
+        if len(chunk) < 8:
+            return None
+        cid, size = chunk[:4], struct.unpack("<I", chunk[4:])[0]
+        if cid == b"fmt ":
+            fmt = fh.read(size)
+            if size % 2:
+                fh.seek(1, 1)
+        elif cid == b"data":
+            break
+        else:
+            fh.seek(size + size % 2, 1)
+    if fmt is None or len(fmt) < 16:
+        return None
+    tag, _, rate, byte_rate, _, bits = struct.unpack("<HHIIHH", fmt[:16])
+    if tag == _WAVE_FORMAT_EXTENSIBLE and len(fmt) >= 26:
+        tag = struct.unpack("<H", fmt[24:26])[0]
+    codec = _PCM_CODECS.get((tag, bits))
+    # Bei gestreamten Dateien steht oft 0 oder 0xFFFFFFFF statt der Länge
+    if codec is None or not byte_rate or not 0 < size <= file_size - fh.tell():
+        return None
+    return _info(size / byte_rate, codec, rate)
+
+
+def read_flac(fh: BinaryIO) -> Optional[Dict[str, Any]]:
+    """Dauer einer FLAC-Datei aus dem STREAMINFO-Block."""
+    _skip_id3(fh)
+    head = fh.read(4 + 4 + 34)
+    if len(head) < 42 or head[:4] != b"fLaC" or head[4] & 0x7F != 0:
+        return None
+    bits = int.from_bytes(head[18:26], "big")
+    rate = bits >> 44
+    total = bits & ((1 << 36) - 1)
+    # Gesamtzahl 0 bedeutet "unbekannt"
+    if not rate or not total:
+        return None
+    return _info(total / rate, "flac", rate)
+
+
+def _mp3_frame(header: bytes) -> Optional[Dict[str, Any]]:
+    """Kopf eines MPEG-1/2/2.5-Layer-III-Frames auswerten."""
+    if len(header) < 4 or header[0] != 0xFF or header[1] & 0xE0 != 0xE0:
+        return None
+    version = {0: 2.5, 2: 2, 3: 1}.get((header[1] >> 3) & 3)
+    layer = (header[1] >> 1) & 3
+    br_idx = header[2] >> 4
+    sr_idx = (header[2] >> 2) & 3
+    if version is None or layer != 1 or br_idx in (0, 15) or sr_idx == 3:
+        return None
+    bitrate = _MP3_BITRATES[1 if version == 1 else 2][br_idx] * 1000
+    rate = _MP3_RATES[version][sr_idx]
+    spf = 1152 if version == 1 else 576
+    padding = (header[2] >> 1) & 1
+    return {
+        "version": version,
+        "rate": rate,
+        "spf": spf,
+        "mono": header[3] >> 6 == 3,
+        "length": spf // 8 * bitrate // rate + padding,
+    }
+
+
+def read_mp3(fh: BinaryIO) -> Optional[Dict[str, Any]]:
+    """Dauer einer MP3-Datei aus dem Xing/Info- oder VBRI-Kopf.
+
+    Ohne einen dieser Köpfe (ältere CBR-Dateien, VBR ohne Index) lässt
+    sich die Länge nur durch Zählen aller Frames sicher bestimmen; dann
+    wird ``None`` geliefert.
+    """
+    start = _skip_id3(fh)
+    window = fh.read(MP3_SYNC_WINDOW)
+    pos = window.find(b"\xff")
+    while 0 <= pos < len(window) - 4:
+        frame = _mp3_frame(window[pos : pos + 4])
+        # Zweiten Frame prüfen, damit Zufallstreffer nicht zählen
+        if frame and _mp3_frame(window[pos + frame["length"] :][:4]):
+            break
+        pos = window.find(b"\xff", pos + 1)
+    else:
+        return None
+    fh.seek(start + pos)
+    data = fh.read(frame["length"])
+    if frame["version"] == 1:
+        xing = 4 + (17 if frame["mono"] else 32)
+    else:
+        xing = 4 + (9 if frame["mono"] else 17)
+    frames = 0
+    if data[xing : xing + 4] in (b"Xing", b"Info"):
+        flags = struct.unpack(">I", data[xing + 4 : xing + 8])[0]
+        if flags & 1:
+            frames = struct.unpack(">I", data[xing + 8 : xing + 12])[0]
+    elif data[36:40] == b"VBRI":
+        frames = struct.unpack(">I", data[50:54])[0]
+    if not frames:
+        return None
+    return _info(frames * frame["spf"] / frame["rate"], "mp3", frame["rate"])
+
+
+def read_header(path: Path | str) -> Optional[Dict[str, Any]]:
+    """Dauer, Codec und Abtastrate aus dem Dateikopf (WAV, FLAC, MP3).
+
+    Das Format wird am Inhalt erkannt, nicht an der Endung. Liefert
+    ``None`` für andere Formate oder wenn der Kopf keine verlässliche
+    Länge enthält; dann muss ffprobe ran.
+    """
+    try:
+        with open(path, "rb") as fh:
+            size = Path(path).stat().st_size
+            magic = fh.read(4)
+            fh.seek(0)
+            if magic == b"RIFF":
+                return read_wav(fh, size)
+            if magic == b"fLaC":
+                return read_flac(fh)
+            if magic[:3] != b"ID3" and magic[:1] != b"\xff":
+                return None
+            info = read_mp3(fh)
+            if info is None:
+                fh.seek(0)
+                info = read_flac(fh)  # FLAC mit vorangestelltem ID3-Tag
+            return info
+    except (OSError, struct.error) as e:
+        logger.debug("Dateikopf nicht lesbar: %s", e)
+        return None
+
+
+__all__ = ["read_flac", "read_header", "read_mp3", "read_wav"]
@@ -0,0 +1,132 @@
+"""Dauerhafter Zwischenspeicher für Medien-Eigenschaften."""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from config.paths import MEDIA_DB
+
+from .probe import probe_media
+
+logger = logging.getLogger(__name__)
+
+# Gespeicherte Felder (siehe api.probe.probe_media) und ihre SQL-Typen
+MEDIA_COLUMNS = {
+    "duration": "REAL",
+    "audio_codec": "TEXT",
+    "sample_rate": "INTEGER",
+    "video_codec": "TEXT",
+    "width": "INTEGER",
+    "height": "INTEGER",
+}
+
+
+class MediaInfoCache:
+    """Ergebnisse von :func:`api.probe.probe_media` je Datei in SQLite ablegen.
+
+    Ein Eintrag gilt nur, solange Größe und Änderungszeit (ns) der Datei
+    gleich sind; danach wird neu geprüft und der Eintrag ersetzt. Nicht
+    lesbare Dateien werden nicht gespeichert. Fehler der Datenbank
+    (gesperrt, beschädigt, schreibgeschützt) zählen als Cache-Fehltreffer;
+    dann wird direkt geprüft.
+    """
+
+    def __init__(
+        self,
+        db_path: Path = MEDIA_DB,
+        probe: Callable[[str], Dict[str, Any]] = probe_media,
+    ):
+        """Datenbank öffnen (wird bei Bedarf angelegt)."""
+        self.db_path = Path(db_path)
+        self.probe = probe
+        self._lock = threading.Lock()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        cols = ", ".join(f"{k} {t}" for k, t in MEDIA_COLUMNS.items())
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS media (path TEXT PRIMARY KEY,"
+                f" size INTEGER, mtime_ns INTEGER, {cols}, checked REAL)"
+            )
+
+    @staticmethod
+    def _stat(path: Path | str) -> Optional[Tuple[int, int]]:
+        try:
+            st = Path(path).stat()
+        except OSError:
+            return None
+        return st.st_size, st.st_mtime_ns
+
+    def get(self, path: Path | str) -> Optional[Dict[str, Any]]:
+        """Gespeicherte Eigenschaften liefern, falls die Datei unverändert ist."""
+        sig = self._stat(path)
+        if sig is None:
+            return None
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    f"SELECT {', '.join(MEDIA_COLUMNS)} FROM media"
+                    " WHERE path = ? AND size = ? AND mtime_ns = ?",
+                    [str(path), *sig],
+                ).fetchone()
+        except sqlite3.Error as exc:
+            logger.warning("Medien-Cache nicht lesbar: %s", exc)
+            return None
+        return dict(zip(MEDIA_COLUMNS, row)) if row else None
+
+    def put(
+        self,
+        path: Path | str,
+        info: Dict[str, Any],
+        sig: Optional[Tuple[int, int]] = None,
+    ) -> None:
+        """Eigenschaften speichern.
+
+        ``sig`` ist (Größe, Änderungszeit) der geprüften Fassung; ohne
+        Angabe gilt der aktuelle Stand der Datei.
+        """
+        sig = sig or self._stat(path)
+        if sig is None:
+            return
+        values = [info.get(k) for k in MEDIA_COLUMNS]
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    f"INSERT OR REPLACE INTO media VALUES"
+                    f" (?, ?, ?, {', '.join('?' * len(MEDIA_COLUMNS))}, ?)",
+                    [str(path), *sig, *values, time.time()],
+                )
+        except sqlite3.Error as exc:
+            logger.warning("Medien-Cache nicht geschrieben: %s", exc)
+
+    def info(self, path: Path | str) -> Dict[str, Any]:
+        """Eigenschaften aus dem Cache oder per Prüfung (dann gespeichert)."""
+        cached = self.get(path)
+        if cached is not None:
+            return cached
+        # Stand vor der Prüfung merken, damit eine währenddessen geänderte
+        # Datei beim nächsten Mal neu geprüft wird
+        sig = self._stat(path)
+        if sig is None:
+            return {}
+        info = self.probe(str(path))
+        if info:
+            self.put(path, info, sig)
+        return info
+
+    def duration(self, path: Path | str) -> float:
+        """Dauer in Sekunden (0 bei Fehlern), wie :func:`api.probe.probe_duration`."""
+        return float(self.info(path).get("duration") or 0.0)
+
+    def close(self) -> None:
+        """Verbindung schließen."""
+        with self._lock:
+            self._conn.close()
+
+
+__all__ = ["MEDIA_COLUMNS", "MediaInfoCache"]
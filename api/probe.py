@@ -0,0 +1,133 @@
+"""Medien-Eigenschaften mit ffprobe ermitteln."""
+
+from __future__ import annotations
+
+import logging
+import re
+from typing import Any, Dict, Tuple
+
+from .headers import read_header
+
+logger = logging.getLogger(__name__)
+
+# Audio-Codecs, die unverändert in MP4 übernommen werden dürfen
+COPYABLE_AUDIO_CODECS = ("aac",)
+
+
+def parse_bitrate(text: str) -> int:
+    """Bitrate wie ``"192k"`` oder ``"1m"`` in Bit pro Sekunde umrechnen."""
+    m = re.fullmatch(r"(\d+)([km]?)", str(text).strip().lower())
+    if not m:
+        raise ValueError(f"Ungültige Bitrate: {text}")
+    value, unit = m.groups()
+    return int(value) * {"": 1, "k": 1000, "m": 1000_000}[unit]
+
+
+def probe_duration(path: str) -> float:
+    """Return audio duration in seconds (falls back to 0).
+
+    WAV, FLAC and MP3 files with a Xing/Info/VBRI header are read directly
+    from their headers; everything else is probed with ffmpeg.
+    """
+    info = read_header(path)
+    if info:
+        return info["duration"]
+    try:
+        import ffmpeg
+
+        pr = ffmpeg.probe(path)
+        fmt = pr.get("format", {})
+        if "duration" in fmt:
+            return float(fmt["duration"])
+        for st in pr.get("streams", []):
+            if st.get("codec_type") == "audio":
+                return float(st.get("duration", 0) or 0)
+    except Exception as e:
+        logger.debug("Dauer konnte nicht ermittelt werden: %s", e)
+    return 0.0
+
+
+def probe_media(path: str) -> Dict[str, Any]:
+    """Dauer, Codecs, Abtastrate und Bildgröße mit einem ffprobe-Aufruf.
+
+    WAV, FLAC und MP3 mit Xing/Info/VBRI-Kopf werden ohne ffprobe direkt
+    aus dem Dateikopf gelesen. Liefert ein leeres Dictionary, wenn die
+    Datei nicht lesbar ist.
+    """
+    header = read_header(path)
+    if header:
+        return {"video_codec": "", "width": 0, "height": 0, **header}
+    try:
+        import ffmpeg
+
+        pr = ffmpeg.probe(path)
+    except Exception as e:
+        logger.debug("Datei konnte nicht geprüft werden: %s", e)
+        return {}
+    info: Dict[str, Any] = {
+        "duration": float(pr.get("format", {}).get("duration", 0) or 0),
+        "audio_codec": "",
+        "sample_rate": 0,
+        "video_codec": "",
+        "width": 0,
+        "height": 0,
+    }
+    for st in pr.get("streams", []):
+        kind = st.get("codec_type")
+        if kind == "audio" and not info["audio_codec"]:
+            info["audio_codec"] = st.get("codec_name", "")
+            info["sample_rate"] = int(st.get("sample_rate", 0) or 0)
+            if not info["duration"]:
+                info["duration"] = float(st.get("duration", 0) or 0)
+        elif kind == "video" and not info["video_codec"]:
+            info["video_codec"] = st.get("codec_name", "")
+            info["width"] = int(st.get("width", 0) or 0)
+            info["height"] = int(st.get("height", 0) or 0)
+    return info
+
+
+def probe_audio(path: str) -> Dict[str, Any]:
+    """Codec und Bitrate der ersten Audiospur liefern (leer bei Fehlern)."""
+    try:
+        import ffmpeg
+
+        pr = ffmpeg.probe(path)
+    except Exception as e:
+        logger.debug("Audio konnte nicht geprüft werden: %s", e)
+        return {}
+    for st in pr.get("streams", []):
+        if st.get("codec_type") == "audio":
+            bit_rate = st.get("bit_rate") or pr.get("format", {}).get("bit_rate")
+            return {
+                "codec": st.get("codec_name", ""),
+                "bit_rate": int(bit_rate) if bit_rate else 0,
+            }
+    return {}
+
+
+def can_copy_audio(path: str, abitrate: str) -> Tuple[bool, str]:
+    """Prüfen, ob die Audiospur ohne Neukodierung übernommen werden kann.
+
+    Gibt ``(True, Grund)`` zurück, wenn die Spur bereits AAC ist und ihre
+    Bitrate die Zielbitrate nicht übersteigt, sonst ``(False, Grund)``.
+    """
+    info = probe_audio(path)
+    codec = info.get("codec", "")
+    if codec not in COPYABLE_AUDIO_CODECS:
+        return False, f"Codec {codec or 'unbekannt'}"
+    rate = info.get("bit_rate", 0)
+    if not rate:
+        return False, f"{codec}, Bitrate unbekannt"
+    target = parse_bitrate(abitrate)
+    if rate > target:
+        return False, f"{codec} {rate // 1000}k > {target // 1000}k"
+    return True, f"{codec} {rate // 1000}k <= {target // 1000}k"
+
+
+__all__ = [
+    "parse_bitrate",
+    "probe_duration",
+    "probe_media",
+    "probe_audio",
+    "can_copy_audio",
+]
@@ -0,0 +1,102 @@
+"""Fortschritt von ffmpeg über den ``-progress``-Kanal auswerten."""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Deque, Dict, List
+
+# Maschinenlesbarer Fortschritt auf stdout, keine Banner-/Statuszeilen
+PROGRESS_ARGS = ["-hide_banner", "-nostats", "-progress", "pipe:1"]
+
+
+def with_progress(cmd: List[str]) -> List[str]:
+    """Fortschritts-Optionen direkt nach dem Programmnamen einfügen."""
+    if "-progress" in cmd:
+        return list(cmd)
+    return [cmd[0], *PROGRESS_ARGS, *cmd[1:]]
+
+
+def _float(text: str, suffix: str = "") -> float:
+    """Zahl lesen, Einheit abschneiden; ``N/A`` ergibt 0."""
+    text = text.strip()
+    if suffix and text.endswith(suffix):
+        text = text[: -len(suffix)]
+    try:
+        return float(text)
+    except ValueError:
+        return 0.0
+
+
+def _clock(text: str) -> float:
+    """``HH:MM:SS.micro`` in Sekunden umrechnen."""
+    try:
+        h, m, s = text.strip().split(":")
+        return int(h) * 3600 + int(m) * 60 + float(s)
+    except ValueError:
+        return 0.0
+
+
+class FfmpegProgress:
+    """Parser für die ``key=value``-Blöcke von ``ffmpeg -progress``.
+
+    Jeder Block endet mit ``progress=continue`` bzw. ``progress=end``;
+    erst dann werden die Werte übernommen. Zeilen ohne ``=`` (normale
+    Meldungen von ffmpeg) landen in :attr:`messages`.
+    """
+
+    def __init__(self, duration: float = 0.0):
+        """Parser für eine erwartete Dauer in Sekunden anlegen."""
+        self.duration = duration
+        self.out_time = 0.0
+        self.speed = 0.0
+        self.fps = 0.0
+        self.bitrate = 0.0
+        self.done = False
+        self.messages: Deque[str] = deque(maxlen=5)
+        self._block: Dict[str, str] = {}
+
+    @property
+    def percent(self) -> float:
+        """Fortschritt in Prozent (0–100) bezogen auf :attr:`duration`."""
+        if self.done:
+            return 100.0
+        if self.duration <= 0:
+            return 0.0
+        return min(100.0, self.out_time / self.duration * 100.0)
+
+    @property
+    def last_message(self) -> str:
+        """Letzte Meldung von ffmpeg (z.B. die Fehlermeldung)."""
+        return self.messages[-1] if self.messages else ""
+
+    def feed(self, line: str) -> bool:
+        """Eine Zeile verarbeiten; ``True`` sobald ein Block vollständig ist."""
+        line = line.strip()
+        if not line:
+            return False
+        key, sep, value = line.partition("=")
+        if not sep or " " in key:
+            self.messages.append(line)
+            return False
+        if key != "progress":
+            self._block[key] = value
+            return False
+        self._apply(self._block)
+        self._block = {}
+        self.done = value == "end"
+        return True
+
+    def _apply(self, block: Dict[str, str]) -> None:
+        if block.get("out_time_us", "N/A") != "N/A":
+            self.out_time = max(0.0, _float(block["out_time_us"]) / 1_000_000)
+        elif "out_time" in block:
+            self.out_time = _clock(block["out_time"])
+        if "speed" in block:
+            self.speed = _float(block["speed"], "x")
+        if "fps" in block:
+            self.fps = _float(block["fps"])
+        if "bitrate" in block:
+            self.bitrate = _float(block["bitrate"], "kbits/s")
+
+
+__all__ = ["FfmpegProgress", "PROGRESS_ARGS", "with_progress"]
@@ -0,0 +1,47 @@
+"""Reihenfolge der Encode-Jobs nach erwartetem Aufwand."""
+
+from __future__ import annotations
+
+import heapq
+from typing import Dict, List, Sequence
+
+# Reihenfolge-Strategien: Tabelle, längste zuerst, kürzeste zuerst
+POLICIES: Dict[str, str] = {
+    "table": "Tabelle",
+    "longest": "Längste zuerst",
+    "shortest": "Kürzeste zuerst",
+}
+
+
+def order_jobs(durations: Sequence[float], policy: str = "table") -> List[int]:
+    """Zeilenindizes in der Reihenfolge der gewählten Strategie liefern.
+
+    Die Audiodauer dient als Maß für den Aufwand; bei gleicher Dauer bleibt
+    die Tabellenreihenfolge erhalten.
+    """
+    rows = list(range(len(durations)))
+    if policy == "longest":
+        return sorted(rows, key=lambda i: -durations[i])
+    if policy == "shortest":
+        return sorted(rows, key=lambda i: durations[i])
+    if policy != "table":
+        raise ValueError(f"Unbekannte Reihenfolge: {policy}")
+    return rows
+
+
+def predict_makespan(
+    durations: Sequence[float], order: Sequence[int], workers: int
+) -> float:
+    """Gesamtdauer schätzen, wenn ``workers`` Jobs gleichzeitig laufen.
+
+    Jeder freie Platz nimmt den nächsten Job der Reihenfolge; das Ergebnis
+    ist der Zeitpunkt, an dem der letzte Job endet (in Einheiten der
+    Dauer, also bei Echtzeit-Tempo in Sekunden).
+    """
+    slots = [0.0] * max(1, workers)
+    for i in order:
+        heapq.heappush(slots, heapq.heappop(slots) + max(0.0, durations[i]))
+    return max(slots)
+
+
+__all__ = ["POLICIES", "order_jobs", "predict_makespan"]
@@ -0,0 +1,197 @@
+"""Vorschaubilder erzeugen und auf der Platte zwischenspeichern (ohne Qt)."""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Optional, Tuple
+
+from config.paths import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+THUMB_CACHE_DIR = CACHE_DIR / "thumbs"
+DEFAULT_THUMB_BYTES = 256 * 1024**2
+
+# Eingebettete Vorschauen mit abweichendem Seitenverhältnis haben meist
+# schwarze Ränder und werden verworfen
+PREVIEW_ASPECT_TOLERANCE = 0.02
+
+# EXIF-Tags im IFD1 für Lage und Länge der JPEG-Vorschau
+_EXIF_PREVIEW_OFFSET = 0x0201
+_EXIF_PREVIEW_LENGTH = 0x0202
+
+Size = Tuple[int, int]
+
+
+def fit_size(src: Size, size: Size) -> Size:
+    """``src`` mit gleichem Seitenverhältnis in ``size`` einpassen (nie größer)."""
+    w, h = src
+    ratio = min(size[0] / w, size[1] / h, 1.0)
+    return max(1, round(w * ratio)), max(1, round(h * ratio))
+
+
+def _rgba(img):
+    return img.convert("RGBA") if img.mode != "RGBA" else img.copy()
+
+
+def exif_preview(img, target: Size):
+    """In den EXIF-Daten eingebettetes JPEG-Vorschaubild oder ``None``.
+
+    Genutzt wird es nur, wenn es mindestens ``target`` groß ist und das
+    Seitenverhältnis des Hauptbilds hat; es wird dann auf ``target``
+    gebracht. Gelesen werden nur die EXIF-Daten aus dem Dateikopf.
+    """
+    from PIL import ExifTags, Image
+
+    raw = img.info.get("exif")
+    if not raw:
+        return None
+    try:
+        ifd1 = img.getexif().get_ifd(ExifTags.IFD.IFD1)
+        offset = ifd1.get(_EXIF_PREVIEW_OFFSET)
+        length = ifd1.get(_EXIF_PREVIEW_LENGTH)
+        if not offset or not length:
+            return None
+        # Die Offsets zählen ab dem TIFF-Kopf hinter "Exif\0\0"
+        tiff = raw[6:] if raw.startswith(b"Exif\x00\x00") else raw
+        data = tiff[offset : offset + length]
+        if len(data) != length:
+            return None
+        preview = Image.open(io.BytesIO(data))
+        pw, ph = preview.size
+        w, h = img.size
+        if pw < target[0] or ph < target[1]:
+            return None
+        if abs(pw * h - ph * w) > PREVIEW_ASPECT_TOLERANCE * ph * w:
+            return None
+        preview.load()
+    except Exception as e:
+        logger.debug("EXIF-Vorschau unbrauchbar: %s", e)
+        return None
+    return preview if preview.size == target else preview.resize(target)
+
+
+def make_thumbnail(path: Path | str, size: Size):
+    """Bild dekodieren und auf ``size`` verkleinern (Pillow-Bild in RGBA).
+
+    Bei JPEG wird zuerst die eingebettete EXIF-Vorschau versucht; reicht
+    sie nicht, dekodiert ``draft`` gleich in 1/2, 1/4 oder 1/8 der
+    Auflösung, so klein wie es das Ziel erlaubt. Andere Formate werden
+    voll dekodiert und dann verkleinert.
+    """
+    from PIL import Image
+
+    with Image.open(path) as img:
+        if img.format == "JPEG":
+            target = fit_size(img.size, size)
+            preview = exif_preview(img, target)
+            if preview is not None:
+                return _rgba(preview)
+            img.draft(None, target)
+        img.thumbnail(size)
+        return _rgba(img)
+
+
+class ThumbCache:
+    """Vorschaubilder als PNG unter ``root`` ablegen.
+
+    Der Schlüssel besteht aus Pfad, Änderungszeit, Dateigröße und
+    gewünschter Größe; eine geänderte Quelle erzeugt also einen neuen
+    Eintrag, der alte verschwindet mit der Zeit. Übersteigt der Ordner
+    ``max_bytes``, werden die am längsten nicht genutzten Bilder gelöscht
+    (LRU über die Änderungszeit der Cache-Datei, wie bei
+    :class:`api.cache.EncodeCache`).
+    """
+
+    def __init__(
+        self, root: Path = THUMB_CACHE_DIR, max_bytes: int = DEFAULT_THUMB_BYTES
+    ):
+        """Cache-Ordner und Größengrenze festlegen."""
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # Summe der Dateigrößen; erst beim ersten Aufräumen ermittelt
+        self._total: Optional[int] = None
+
+    def key(self, path: Path | str, size: Size) -> str:
+        """Schlüssel aus Pfad, Änderungszeit, Dateigröße und Zielgröße."""
+        st = Path(path).stat()
+        w, h = size
+        raw = f"{Path(path).resolve()}|{st.st_mtime_ns}|{st.st_size}|{w}x{h}"
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.png"
+
+    def get(self, path: Path | str, size: Size):
+        """Gespeichertes Vorschaubild laden oder ``None``."""
+        from PIL import Image
+
+        try:
+            cached = self._path(self.key(path, size))
+            os.utime(cached)
+            with Image.open(cached) as img:
+                return img.copy()
+        except OSError:
+            return None
+
+    def put(self, path: Path | str, size: Size, img) -> None:
+        """Vorschaubild speichern und den Cache bei Bedarf begrenzen."""
+        try:
+            target = self._path(self.key(path, size))
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp = target.with_suffix(f".{threading.get_ident()}.tmp")
+            img.save(tmp, "PNG")
+            os.replace(tmp, target)
+            written = target.stat().st_size
+        except OSError as e:
+            logger.warning("Vorschaubild nicht gespeichert: %s", e)
+            return
+        with self._lock:
+            if self._total is not None:
+                self._total += written
+            over = self._total is None or self._total > self.max_bytes
+        if over:
+            self.evict()
+
+    def thumbnail(self, path: Path | str, size: Size):
+        """Vorschaubild aus dem Cache oder neu erzeugt (und gespeichert)."""
+        img = self.get(path, size)
+        if img is None:
+            img = make_thumbnail(path, size)
+            self.put(path, size, img)
+        return img
+
+    def evict(self) -> None:
+        """Älteste Einträge löschen, bis die Größengrenze eingehalten wird."""
+        with self._lock:
+            entries = []
+            for f in self.root.glob("*/*.png"):
+                try:
+                    st = f.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime_ns, st.st_size, f))
+            total = sum(size for _, size, _ in entries)
+            for _, size, f in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                f.unlink(missing_ok=True)
+                total -= size
+                logger.debug("Vorschaubild entfernt: %s", f.name)
+            self._total = total
+
+
+__all__ = [
+    "DEFAULT_THUMB_BYTES",
+    "PREVIEW_ASPECT_TOLERANCE",
+    "ThumbCache",
+    "exif_preview",
+    "fit_size",
+    "make_thumbnail",
+]
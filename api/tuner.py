@@ -0,0 +1,129 @@
+"""Preset passend zu einem Zeitbudget wählen."""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .converter import build_ffmpeg_cmd, run_ffmpeg
+from .scheduler import order_jobs, predict_makespan
+
+logger = logging.getLogger(__name__)
+
+# Von schnell nach langsam; langsamere Presets komprimieren besser
+TUNE_PRESETS = (
+    "ultrafast",
+    "superfast",
+    "veryfast",
+    "faster",
+    "fast",
+    "medium",
+    "slow",
+)
+SAMPLE_SECONDS = 5.0
+MAX_SAMPLES = 3
+
+
+def measure_preset(
+    samples: Sequence[Tuple[str, str, float]],
+    settings: Dict[str, Any],
+    preset: str,
+    workers: int = 1,
+    sample_seconds: float = SAMPLE_SECONDS,
+    runner: Callable[[List[str]], None] = run_ffmpeg,
+) -> float:
+    """Tempo eines Presets messen (Sekunden Video pro Sekunde und Job).
+
+    Die Proben laufen mit ``workers`` Prozessen gleichzeitig, damit sich die
+    Prozesse wie im echten Stapel die CPU teilen; gibt es weniger Proben als
+    Prozesse, werden sie wiederholt.
+    """
+    runs = max(len(samples), workers) if samples else 0
+    with tempfile.TemporaryDirectory(prefix="videobatch_tune_") as td:
+        cmds, media = [], 0.0
+        for n, (image, audio, duration) in enumerate(
+            itertools.islice(itertools.cycle(samples), runs)
+        ):
+            length = min(sample_seconds, duration) if duration > 0 else sample_seconds
+            media += length
+            cmds.append(
+                build_ffmpeg_cmd(
+                    image,
+                    audio,
+                    str(Path(td) / f"probe_{n}.mp4"),
+                    settings["width"],
+                    settings["height"],
+                    settings["abitrate"],
+                    settings["crf"],
+                    preset,
+                    still=settings.get("still", False),
+                    limit=length,
+                )
+            )
+        parallel = max(1, min(workers, len(cmds)))
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=parallel) as ex:
+            list(ex.map(runner, cmds))
+        wall = time.perf_counter() - t0
+    return media / (wall * parallel) if wall > 0 else float("inf")
+
+
+def estimate_batch(
+    durations: Sequence[float], speed: float, workers: int, policy: str = "table"
+) -> float:
+    """Gesamtdauer des Stapels bei ``speed`` (Sekunden Video pro Sekunde)."""
+    if speed <= 0:
+        return float("inf")
+    scaled = [d / speed for d in durations]
+    return predict_makespan(scaled, order_jobs(scaled, policy), workers)
+
+
+def tune_preset(
+    samples: Sequence[Tuple[str, str, float]],
+    durations: Sequence[float],
+    settings: Dict[str, Any],
+    budget: float,
+    presets: Sequence[str] = TUNE_PRESETS,
+    runner: Callable[[List[str]], None] = run_ffmpeg,
+    log: Optional[Callable[[str], None]] = None,
+) -> Tuple[str, Dict[str, float]]:
+    """Langsamstes Preset wählen, das den Stapel innerhalb ``budget`` schafft.
+
+    Gemessen wird von schnell nach langsam; sobald ein Preset das Budget
+    überschreitet, endet die Messung. Schafft selbst das schnellste Preset
+    das Budget nicht, wird es trotzdem zurückgegeben.
+
+    Returns
+    -------
+    tuple
+        Gewähltes Preset und geschätzte Gesamtdauer je gemessenem Preset.
+    """
+    workers = int(settings.get("jobs", 1))
+    policy = settings.get("order", "table")
+    samples = list(samples)[:MAX_SAMPLES]
+    estimates: Dict[str, float] = {}
+    chosen = presets[0]
+    for preset in presets:
+        speed = measure_preset(samples, settings, preset, workers, runner=runner)
+        estimates[preset] = estimate_batch(durations, speed, workers, policy)
+        msg = f"Preset {preset}: {speed:.1f}x, geschätzt {estimates[preset]:.0f}s"
+        logger.info(msg)
+        if log:
+            log(msg)
+        if estimates[preset] > budget:
+            break
+        chosen = preset
+    return chosen, estimates
+
+
+__all__ = [
+    "TUNE_PRESETS",
+    "estimate_batch",
+    "measure_preset",
+    "tune_preset",
+]
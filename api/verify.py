@@ -0,0 +1,56 @@
+"""Fertige Ausgabedateien mit ffprobe prüfen."""
+
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Erlaubte Abweichung der Videolänge von der Audiodauer: mindestens eine
+# Sekunde (Bildraster, AAC-Vorlauf), bei langen Dateien 2 %
+DURATION_TOLERANCE = 1.0
+DURATION_RATIO = 0.02
+
+
+def verify_output(path: Path | str, expected: float = 0.0) -> str:
+    """Ausgabe auf Video- und Audiospur sowie passende Dauer prüfen.
+
+    Liefert den Fehlergrund oder ``""``, wenn die Datei in Ordnung ist. Bei
+    ``expected <= 0`` (Dauer unbekannt) wird die Länge nicht verglichen.
+    Fehlt ffprobe, gilt die Datei als geprüft.
+    """
+    path = Path(path)
+    try:
+        if path.stat().st_size == 0:
+            return "Ausgabe ist leer"
+    except OSError:
+        return "Ausgabe fehlt"
+    try:
+        import ffmpeg
+
+        pr = ffmpeg.probe(str(path))
+    except (ImportError, FileNotFoundError) as e:
+        logger.warning("Ausgabe nicht geprüft, ffprobe fehlt: %s", e)
+        return ""
+    except Exception as e:
+        stderr = getattr(e, "stderr", b"") or b""
+        lines = stderr.decode(errors="replace").strip().splitlines()
+        return f"Ausgabe nicht lesbar: {lines[-1] if lines else e}"
+    kinds = {st.get("codec_type") for st in pr.get("streams", [])}
+    missing = [
+        name
+        for kind, name in (("video", "Video"), ("audio", "Audio"))
+        if kind not in kinds
+    ]
+    if missing:
+        return f"Keine {'- und '.join(missing)}spur in der Ausgabe"
+    duration = float(pr.get("format", {}).get("duration", 0) or 0)
+    if expected > 0:
+        tolerance = max(DURATION_TOLERANCE, expected * DURATION_RATIO)
+        if abs(duration - expected) > tolerance:
+            return f"Dauer {duration:.1f}s statt {expected:.1f}s"
+    return ""
+
+
+__all__ = ["DURATION_RATIO", "DURATION_TOLERANCE", "verify_output"]
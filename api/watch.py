@@ -0,0 +1,166 @@
+"""Eingangsordner überwachen und neue Paare laufend kodieren."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from utils import AUDIO_EXTS, IMAGE_EXTS, OutputNames, safe_move
+
+logger = logging.getLogger(__name__)
+
+# Eine Datei gilt als fertig geschrieben, wenn Größe und Änderungszeit so
+# lange gleich bleiben
+SETTLE_SECONDS = 2.0
+POLL_SECONDS = 1.0
+
+Signature = Tuple[int, int]
+
+
+class FolderWatcher:
+    """Bild/Audio-Paare (gleicher Dateiname ohne Endung) aus einem Ordner kodieren.
+
+    Der Ordner wird regelmäßig abgefragt (kein inotify, funktioniert auch auf
+    Netzlaufwerken). Ein Paar startet erst, wenn beide Dateien seit
+    ``settle`` Sekunden unverändert sind. Höchstens ``workers`` Paare laufen
+    gleichzeitig; weitere bleiben im Ordner liegen, bis ein Platz frei wird.
+    Fertige Eingaben wandern per :func:`utils.safe_move` nach ``archive_dir``;
+    fehlgeschlagene bleiben liegen und werden erst nach einer Änderung erneut
+    versucht.
+    """
+
+    def __init__(
+        self,
+        in_dir: Path,
+        out_dir: Path,
+        archive_dir: Path,
+        encode: Callable[[Path, Path, Path], None],
+        workers: int = 2,
+        settle: float = SETTLE_SECONDS,
+        log: Optional[Callable[[str], None]] = None,
+    ):
+        """Ordner, Kodierfunktion ``encode(bild, audio, ziel)`` und Grenzen festlegen."""
+        self.in_dir = Path(in_dir)
+        self.out_dir = Path(out_dir)
+        self.archive_dir = Path(archive_dir)
+        self.encode = encode
+        self.workers = max(1, workers)
+        self.settle = settle
+        self.log = log
+        self.done = 0
+        self.failed = 0
+        self._seen: Dict[Path, Tuple[Signature, float]] = {}
+        self._busy: Set[str] = set()
+        self._failed: Dict[str, Tuple[Signature, Signature]] = {}
+        self._lock = threading.Lock()
+        self._names = OutputNames()
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="watch"
+        )
+
+    def _say(self, msg: str) -> None:
+        logger.info(msg)
+        if self.log:
+            self.log(msg)
+
+    def _settled(self, path: Path, now: float) -> Optional[Signature]:
+        """Signatur liefern, sobald die Datei lange genug unverändert ist."""
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            self._seen.pop(path, None)
+            return None
+        sig = (st.st_size, st.st_mtime_ns)
+        prev = self._seen.get(path)
+        if prev is None or prev[0] != sig:
+            self._seen[path] = (sig, now)
+            return None
+        return sig if now - prev[1] >= self.settle else None
+
+    def ready_pairs(
+        self, now: Optional[float] = None
+    ) -> List[Tuple[Path, Path, Tuple[Signature, Signature]]]:
+        """Vollständig geschriebene, noch nicht bearbeitete Paare finden."""
+        now = time.monotonic() if now is None else now
+        images: Dict[str, Path] = {}
+        audios: Dict[str, Path] = {}
+        for f in sorted(self.in_dir.iterdir()):
+            ext = f.suffix.lower()
+            if not f.is_file() or f.name.startswith("."):
+                continue
+            if ext in IMAGE_EXTS:
+                images.setdefault(f.stem, f)
+            elif ext in AUDIO_EXTS:
+                audios.setdefault(f.stem, f)
+        pairs = []
+        for stem in sorted(images.keys() & audios.keys()):
+            img, aud = images[stem], audios[stem]
+            sigs = (self._settled(img, now), self._settled(aud, now))
+            with self._lock:
+                skip = stem in self._busy or self._failed.get(stem) == sigs
+            if None not in sigs and not skip:
+                pairs.append((img, aud, sigs))
+        return pairs
+
+    def poll_once(self, now: Optional[float] = None) -> int:
+        """Einmal abfragen und freie Plätze mit neuen Paaren füllen."""
+        started = 0
+        for img, aud, sigs in self.ready_pairs(now):
+            with self._lock:
+                if len(self._busy) >= self.workers:
+                    break
+                self._busy.add(img.stem)
+            self._pool.submit(self._process, img, aud, sigs)
+            started += 1
+        return started
+
+    def _process(self, img: Path, aud: Path, sigs: Tuple[Signature, Signature]) -> None:
+        (out,) = self._names.reserve(aud, self.out_dir)
+        self._say(f"Neu: {img.name} + {aud.name}")
+        try:
+            self.out_dir.mkdir(parents=True, exist_ok=True)
+            self.encode(img, aud, out)
+            for f in (img, aud):
+                safe_move(f, self.archive_dir)
+        except Exception as e:
+            with self._lock:
+                self._failed[img.stem] = sigs
+                self.failed += 1
+            self._say(f"Fehler bei {img.stem}: {e}")
+        else:
+            with self._lock:
+                self._failed.pop(img.stem, None)
+                self.done += 1
+            self._say(f"Fertig: {out}")
+        finally:
+            with self._lock:
+                self._busy.discard(img.stem)
+                for f in (img, aud):
+                    self._seen.pop(f, None)
+
+    def run(self, stop: threading.Event, interval: float = POLL_SECONDS) -> None:
+        """Bis ``stop`` gesetzt ist abfragen; laufende Paare werden beendet.
+
+        Bei Strg+C erscheint die Meldung sofort, nicht erst nach den
+        laufenden Paaren; danach wird die Unterbrechung weitergereicht.
+        """
+        self._say(f"Überwache {self.in_dir} (bis zu {self.workers} Jobs)")
+        try:
+            while not stop.is_set():
+                self.poll_once()
+                stop.wait(interval)
+        except KeyboardInterrupt:
+            with self._lock:
+                running = len(self._busy)
+            self._say(f"Abbruch: {running} laufende Jobs werden noch beendet")
+            raise
+        finally:
+            self._pool.shutdown(wait=True)
+            self._say(f"Überwachung beendet: {self.done} fertig, {self.failed} Fehler")
+
+
+__all__ = ["FolderWatcher", "POLL_SECONDS", "SETTLE_SECONDS"]
@@ -10,6 +10,7 @@ CONFIG_DIR = BASE_DIR / "config"
 LOG_DIR = BASE_DIR / "logs"
 ARCHIVE_DIR = BASE_DIR / "archive"
 HELP_DIR = BASE_DIR / "help"
+CACHE_DIR = BASE_DIR / "cache"
 USED_DIR = Path.home() / "benutzte_dateien"
 DEFAULT_OUT_DIR = Path.home() / "Videos" / "VideoBatchTool_Out"
 
@@ -17,6 +18,8 @@ DEFAULT_OUT_DIR = Path.home() / "Videos" / "VideoBatchTool_Out"
 NOTES_FILE = BASE_DIR / "notes.txt"
 LOG_FILE = LOG_DIR / f"{datetime.now().strftime('%Y%m%d-%H%M%S')}.log"
 PROJECT_DB = DATA_DIR / "autosave.db"
+MEDIA_DB = DATA_DIR / "media.db"
+CLI_DB = DATA_DIR / "cli_jobs.db"
 
 _DIRS: tuple[Path, ...] = (
     DATA_DIR,
@@ -24,6 +27,7 @@ _DIRS: tuple[Path, ...] = (
     LOG_DIR,
     ARCHIVE_DIR,
     HELP_DIR,
+    CACHE_DIR,
     USED_DIR,
     DEFAULT_OUT_DIR,
 )
@@ -42,10 +46,13 @@ __all__ = [
     "LOG_DIR",
     "ARCHIVE_DIR",
     "HELP_DIR",
+    "CACHE_DIR",
     "USED_DIR",
     "DEFAULT_OUT_DIR",
     "NOTES_FILE",
     "LOG_FILE",
     "PROJECT_DB",
+    "MEDIA_DB",
+    "CLI_DB",
     "ensure_directories",
 ]
@@ -20,3 +20,8 @@ TIP_LOAD_PROJECT = "Projekt laden" " (lädt eine zuvor gespeicherte Datenbankdat
 TIP_SHOW_PATH = "Pfad zeigen" " (zeigt den Speicherort der ausgewählten Datei unten an)"
 TIP_UNDO = "Letzte Aktion rückgängig" " (stellt gelöschte Zeilen wieder her)"
 TIP_STOP = "Vorgang stoppen" " (bricht die aktuelle Umwandlung sofort ab)"
+TIP_RESUME = "Abgebrochenen Stapel fortsetzen" " (kodiert nur noch unfertige Paare)"
+TIP_SLIDESHOW = (
+    "Markierte Zeilen zu einer Diashow zusammenfassen"
+    " (alle Bilder zur Audiodatei der ersten Zeile)"
+)
@@ -5,27 +5,74 @@ from __future__ import annotations
 import json
 import sqlite3
 import threading
+import time
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
-_conn: Optional[sqlite3.Connection] = None
+# Eine Verbindung je Datenbankdatei (GUI-Projekt und CLI-Jobs getrennt)
+_conns: Dict[Path, sqlite3.Connection] = {}
 _cache: Optional[Dict[str, Any]] = None
+_cache_path: Optional[Path] = None
 _mtime: Optional[int] = None
 # Reentrant Lock to avoid deadlocks when nested
 # (allows the same thread to acquire the lock multiple times)
 _lock = threading.RLock()
 
+# Zustände eines Encode-Jobs in der Warteschlange
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+_JOB_COLUMNS = (
+    "id",
+    "batch",
+    "row",
+    "image",
+    "audio",
+    "output",
+    "status",
+    "attempts",
+    "error",
+    "queued",
+    "started",
+    "finished",
+)
+# Ressourcenverbrauch des ffmpeg-Prozesses (siehe api.accounting.ProcessStats)
+JOB_STAT_COLUMNS = {
+    "wall": "REAL",
+    "cpu_user": "REAL",
+    "cpu_system": "REAL",
+    "max_rss_kb": "INTEGER",
+    "read_bytes": "INTEGER",
+    "write_bytes": "INTEGER",
+}
+_JOB_COLUMNS += tuple(JOB_STAT_COLUMNS)
+
 
 def _get_conn(db_path: Path) -> sqlite3.Connection:
-    """Get or create the SQLite connection (thread-safe)."""
-    global _conn
+    """Get or create the SQLite connection for ``db_path`` (thread-safe)."""
+    key = Path(db_path).resolve()
     with _lock:
-        if _conn is None:
-            _conn = sqlite3.connect(db_path, check_same_thread=False)
-            _conn.execute(
+        conn = _conns.get(key)
+        if conn is None:
+            conn = _conns[key] = sqlite3.connect(key, check_same_thread=False)
+            conn.execute(
                 "CREATE TABLE IF NOT EXISTS project (id INTEGER PRIMARY KEY, data TEXT)"
             )
-    return _conn
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id INTEGER PRIMARY KEY, batch TEXT, row INTEGER, image TEXT,"
+                " audio TEXT, output TEXT DEFAULT '', status TEXT,"
+                " attempts INTEGER DEFAULT 0, error TEXT DEFAULT '',"
+                " queued REAL, started REAL, finished REAL)"
+            )
+            # Ältere Datenbanken um die Verbrauchsspalten ergänzen
+            known = {r[1] for r in conn.execute("PRAGMA table_info(jobs)")}
+            for name, sql_type in JOB_STAT_COLUMNS.items():
+                if name not in known:
+                    conn.execute(f"ALTER TABLE jobs ADD COLUMN {name} {sql_type}")
+            conn.commit()
+    return conn
 
 
 def save_project(data: Dict[str, Any], db_path: Path) -> None:
@@ -35,8 +82,9 @@ def save_project(data: Dict[str, Any], db_path: Path) -> None:
         with _lock, conn:
             conn.execute("DELETE FROM project")
             conn.execute("INSERT INTO project (data) VALUES (?)", [json.dumps(data)])
-        global _cache, _mtime
+        global _cache, _cache_path, _mtime
         _cache = data
+        _cache_path = db_path.resolve()
         _mtime = db_path.stat().st_mtime_ns
     except sqlite3.Error as exc:
         raise RuntimeError("Projekt konnte nicht gespeichert werden") from exc
@@ -44,10 +92,14 @@ def save_project(data: Dict[str, Any], db_path: Path) -> None:
 
 def load_project(db_path: Path) -> Dict[str, Any]:
     """Projekt aus SQLite-Datenbank laden (mit Cache und Invalidation)."""
-    global _cache, _mtime
+    global _cache, _cache_path, _mtime
     with _lock:
         current_mtime = db_path.stat().st_mtime_ns if db_path.exists() else None
-        if _cache is not None and _mtime == current_mtime:
+        if (
+            _cache is not None
+            and _cache_path == db_path.resolve()
+            and _mtime == current_mtime
+        ):
             return _cache
         conn = _get_conn(db_path)
         try:
@@ -59,19 +111,162 @@ def load_project(db_path: Path) -> Dict[str, Any]:
             _cache = json.loads(row[0])
         else:
             _cache = {"pairs": [], "settings": {}, "events": []}
+        _cache_path = db_path.resolve()
         _mtime = current_mtime
         return _cache
 
 
+def _job(row: Tuple[Any, ...]) -> Dict[str, Any]:
+    return dict(zip(_JOB_COLUMNS, row))
+
+
+def enqueue_jobs(
+    pairs: Iterable[Tuple[str, Optional[str]]],
+    db_path: Path,
+    batch: str = "gui",
+    order: Optional[Sequence[int]] = None,
+) -> None:
+    """Warteschlange ``batch`` durch neue, wartende Jobs ersetzen.
+
+    ``order`` legt fest, in welcher Reihenfolge die Zeilen abgeholt werden
+    (Standard: Tabellenreihenfolge).
+    """
+    conn = _get_conn(db_path)
+    now = time.time()
+    pairs = list(pairs)
+    if order is None:
+        order = range(len(pairs))
+    try:
+        with _lock, conn:
+            conn.execute("DELETE FROM jobs WHERE batch = ?", [batch])
+            conn.executemany(
+                "INSERT INTO jobs (batch, row, image, audio, status, queued)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                [(batch, i, *pairs[i], JOB_PENDING, now) for i in order],
+            )
+    except sqlite3.Error as exc:
+        raise RuntimeError("Jobs konnten nicht gespeichert werden") from exc
+
+
+def claim_job(db_path: Path, batch: str = "gui") -> Optional[Dict[str, Any]]:
+    """Nächsten wartenden Job als laufend markieren und zurückgeben."""
+    conn = _get_conn(db_path)
+    cols = ", ".join(_JOB_COLUMNS)
+    with _lock, conn:
+        while True:
+            row = conn.execute(
+                f"SELECT {cols} FROM jobs WHERE batch = ? AND status = ?"
+                " ORDER BY id LIMIT 1",
+                [batch, JOB_PENDING],
+            ).fetchone()
+            if row is None:
+                return None
+            cur = conn.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, started = ?"
+                " WHERE id = ? AND status = ?",
+                [JOB_RUNNING, time.time(), row[0], JOB_PENDING],
+            )
+            if cur.rowcount == 1:
+                job = _job(row)
+                job["status"] = JOB_RUNNING
+                job["attempts"] += 1
+                return job
+
+
+def finish_job(
+    job_id: int,
+    status: str,
+    db_path: Path,
+    output: str = "",
+    error: str = "",
+    stats: Optional[Dict[str, float]] = None,
+) -> None:
+    """Ergebnis eines Jobs festhalten (``done``, ``failed`` oder ``pending``).
+
+    ``stats`` enthält den gemessenen Verbrauch (Schlüssel wie
+    :data:`JOB_STAT_COLUMNS`); fehlende Werte bleiben leer.
+    """
+    stats = stats or {}
+    names = list(JOB_STAT_COLUMNS)
+    sets = ", ".join(f"{n} = ?" for n in names)
+    conn = _get_conn(db_path)
+    with _lock, conn:
+        conn.execute(
+            f"UPDATE jobs SET status = ?, output = ?, error = ?, finished = ?, {sets}"
+            " WHERE id = ?",
+            [status, output, error, time.time(), *map(stats.get, names), job_id],
+        )
+
+
+def list_jobs(db_path: Path, batch: str = "gui") -> List[Dict[str, Any]]:
+    """Alle Jobs einer Warteschlange in Tabellenreihenfolge liefern."""
+    conn = _get_conn(db_path)
+    cols = ", ".join(_JOB_COLUMNS)
+    with _lock:
+        rows = conn.execute(
+            f"SELECT {cols} FROM jobs WHERE batch = ? ORDER BY row", [batch]
+        ).fetchall()
+    return [_job(r) for r in rows]
+
+
+def latest_batch(db_path: Path, prefix: str = "") -> Optional[str]:
+    """Name der zuletzt angelegten Warteschlange, die mit ``prefix`` beginnt."""
+    conn = _get_conn(db_path)
+    with _lock:
+        row = conn.execute(
+            "SELECT batch FROM jobs WHERE substr(batch, 1, ?) = ?"
+            " ORDER BY id DESC LIMIT 1",
+            [len(prefix), prefix],
+        ).fetchone()
+    return row[0] if row else None
+
+
+def resume_jobs(
+    db_path: Path, batch: str = "gui", rename: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Unfertige Jobs (laufend oder fehlgeschlagen) wieder einreihen.
+
+    Laufende Jobs stammen aus einem abgebrochenen Lauf (Absturz, Neustart)
+    und werden daher ebenfalls zurückgesetzt. Mit ``rename`` übernimmt der
+    fortsetzende Lauf die Warteschlange unter neuem Namen. Liefert alle Jobs.
+    """
+    conn = _get_conn(db_path)
+    with _lock, conn:
+        conn.execute(
+            "UPDATE jobs SET status = ? WHERE batch = ? AND status IN (?, ?)",
+            [JOB_PENDING, batch, JOB_RUNNING, JOB_FAILED],
+        )
+        if rename is not None:
+            conn.execute("UPDATE jobs SET batch = ? WHERE batch = ?", [rename, batch])
+            batch = rename
+    return list_jobs(db_path, batch)
+
+
 def close() -> None:
-    """Verbindung schließen und Cache leeren (thread-safe)."""
-    global _conn, _cache, _mtime
+    """Alle Verbindungen schließen und Cache leeren (thread-safe)."""
+    global _cache, _cache_path, _mtime
     with _lock:
-        if _conn is not None:
-            _conn.close()
-            _conn = None
+        for conn in _conns.values():
+            conn.close()
+        _conns.clear()
         _cache = None
+        _cache_path = None
         _mtime = None
 
 
-__all__ = ["save_project", "load_project", "close"]
+__all__ = [
+    "save_project",
+    "load_project",
+    "close",
+    "enqueue_jobs",
+    "claim_job",
+    "finish_job",
+    "latest_batch",
+    "list_jobs",
+    "resume_jobs",
+    "JOB_PENDING",
+    "JOB_RUNNING",
+    "JOB_DONE",
+    "JOB_FAILED",
+    "JOB_STAT_COLUMNS",
+]
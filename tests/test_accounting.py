@@ -0,0 +1,47 @@
+from pathlib import Path
+import subprocess
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from api.accounting import (
+    ProcessStats,
+    format_stats,
+    sum_stats,
+    wait_with_stats,
+)  # noqa: E402
+from api.converter import start_ffmpeg  # noqa: E402
+
+CHILD = (
+    "import sys; data = bytearray(32 * 1024 * 1024); sys.stdout.write('x' * 100000);"
+    " sum(range(2_000_000)); sys.exit(3)"
+)
+
+
+def test_wait_with_stats_measures_child():
+    proc = start_ffmpeg([sys.executable, "-c", CHILD])
+    proc.stdout.read()
+    stats = wait_with_stats(proc)
+    assert proc.returncode == 3 and proc.poll() == 3
+    assert stats.wall > 0 and stats.cpu > 0
+    if sys.platform.startswith("linux"):
+        assert stats.max_rss_kb > 32 * 1024
+        assert stats.write_bytes >= 100000
+
+
+def test_wait_with_stats_after_reap_keeps_wall_time():
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    proc.wait()
+    stats = wait_with_stats(proc)
+    assert stats.cpu == 0 and proc.returncode == 0
+
+
+def test_sum_and_format_stats():
+    total = sum_stats(
+        [
+            ProcessStats(wall=2, cpu_user=1, max_rss_kb=1024, read_bytes=1048576),
+            ProcessStats(wall=3, cpu_system=2, max_rss_kb=4096, write_bytes=2097152),
+        ]
+    )
+    assert (total.wall, total.cpu, total.max_rss_kb) == (5, 3, 4096)
+    assert format_stats(total) == "CPU 3.0s (Wand 5.0s), max. 4 MB, E/A 1.0/2.0 MB"
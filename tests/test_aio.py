@@ -0,0 +1,81 @@
+import asyncio
+import os
+from contextlib import aclosing
+from pathlib import Path
+import sys
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from api import FfmpegProgress, run_batch_async, run_ffmpeg_async  # noqa: E402
+
+
+def _fake(tmp_path, name, body):
+    fake = tmp_path / name
+    fake.write_text(f"#!{sys.executable}\nimport sys, time, os\n{body}\n")
+    fake.chmod(0o755)
+    return str(fake)
+
+
+def test_run_ffmpeg_async_success_and_failure(tmp_path):
+    ok = _fake(
+        tmp_path,
+        "ok",
+        "print('out_time_us=2000000'); print('speed=3.0x'); print('progress=end')",
+    )
+    bad = _fake(tmp_path, "bad", "sys.stderr.write('kaputt\\n'); sys.exit(1)")
+    prog = FfmpegProgress(duration=4)
+    asyncio.run(run_ffmpeg_async([ok, "out.mp4"], prog))
+    assert prog.done and prog.speed == 3.0
+    with pytest.raises(RuntimeError, match="kaputt"):
+        asyncio.run(run_ffmpeg_async([bad, "out.mp4"]))
+
+
+def test_run_batch_async_limits_concurrency(tmp_path, monkeypatch):
+    body = (
+        "d = os.environ['VB_DIR']\n"
+        "open(os.path.join(d, str(os.getpid())), 'w').close()\n"
+        "n = len(os.listdir(d)); time.sleep(0.2)\n"
+        "print(f'out_time_us={n}'); print('progress=continue')\n"
+        "os.remove(os.path.join(d, str(os.getpid())))\n"
+        "sys.exit(1 if sys.argv[-1] == 'fail' else 0)"
+    )
+    run_dir = tmp_path / "running"
+    run_dir.mkdir()
+    monkeypatch.setenv("VB_DIR", str(run_dir))
+    fake = _fake(tmp_path, "job", body)
+    cmds = [[fake, "a"], [fake, "fail"], [fake, "c"], [fake, "d"]]
+
+    async def collect():
+        # Dauer 4 µs: Prozent = gleichzeitig laufende Jobs * 25
+        batch = run_batch_async(cmds, concurrency=2, durations=[4e-6] * 4)
+        return [ev async for ev in batch]
+
+    events = asyncio.run(collect())
+    done = {ev.index: ev for ev in events if ev.done}
+    assert sorted(done) == [0, 1, 2, 3]
+    assert done[1].error and not done[0].error
+    assert 0 < max(ev.percent for ev in events if not ev.done) <= 50.0
+    assert not list(run_dir.iterdir())
+
+
+def test_cancel_kills_running_processes(tmp_path):
+    pid_file = tmp_path / "pid"
+    fake = _fake(
+        tmp_path,
+        "slow",
+        f"open({str(pid_file)!r}, 'w').write(str(os.getpid()))\n"
+        "print('progress=continue', flush=True); time.sleep(30)",
+    )
+
+    async def main():
+        async with aclosing(run_batch_async([[fake, "x"]])) as events:
+            async for ev in events:
+                assert not ev.done
+                break
+
+    asyncio.run(asyncio.wait_for(main(), 10))
+    pid = int(pid_file.read_text())
+    with pytest.raises(ProcessLookupError):
+        os.kill(pid, 0)
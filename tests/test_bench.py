@@ -0,0 +1,43 @@
+import csv
+import json
+from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from api import bench  # noqa: E402
+
+
+def test_run_benchmark_and_reports(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_run(cmd, **kw):
+        calls.append(cmd)
+        Path(cmd[-1]).write_bytes(b"x" * 100)
+
+    monkeypatch.setattr(bench.converter, "run_ffmpeg", fake_run)
+    monkeypatch.setattr(bench.converter, "SEGMENT_DIR", tmp_path / "seg")
+    rows = bench.run_benchmark(
+        seconds=5, presets=("ultrafast",), sizes=((320, 240),), modes=("normal", "loop")
+    )
+    assert [r["mode"] for r in rows] == ["normal", "loop"]
+    assert all(r["output_bytes"] == 100 and r["media_seconds"] == 5 for r in rows)
+    assert any("testsrc2=size=320x240" in c for cmd in calls for c in cmd)
+    assert not list((tmp_path / "seg").glob("*.mp4"))
+
+    bench.write_report(rows, tmp_path / "r.json")
+    data = json.loads((tmp_path / "r.json").read_text(encoding="utf-8"))
+    assert data["results"] == rows and "host" in data["meta"]
+    bench.write_report(rows, tmp_path / "r.csv")
+    with (tmp_path / "r.csv").open(encoding="utf-8") as fh:
+        assert [r["preset"] for r in csv.DictReader(fh)] == ["ultrafast"] * 2
+
+
+def test_thumb_benchmark_measures_each_decoder(tmp_path):
+    photo = bench.make_photo(tmp_path / "p.jpg", (600, 400), preview=(160, 107))
+    rows = bench.run_thumb_benchmark([photo], repeat=2)
+    assert [r["decoder"] for r in rows] == list(bench.THUMB_DECODERS)
+    assert all(r["files"] == 2 and r["max_rss_kb"] > 0 for r in rows)
+    bench.write_report(rows, tmp_path / "t.csv", bench.THUMB_FIELDS)
+    with (tmp_path / "t.csv").open(encoding="utf-8") as fh:
+        assert {r["images"] for r in csv.DictReader(fh)} == {"eigene"}
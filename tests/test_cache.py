@@ -0,0 +1,77 @@
+import os
+from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from api.cache import EncodeCache  # noqa: E402
+from videobatch_extra import cli_encode  # noqa: E402
+
+SETTINGS = {"width": 640, "height": 360, "crf": 23, "preset": "fast"}
+
+
+def _pair(tmp_path):
+    img = tmp_path / "img.jpg"
+    img.write_bytes(b"bild")
+    aud = tmp_path / "aud.mp3"
+    aud.write_bytes(b"ton")
+    return img, aud
+
+
+def test_key_depends_on_content_and_settings(tmp_path):
+    img, aud = _pair(tmp_path)
+    cache = EncodeCache(tmp_path / "cache")
+    key = cache.key(img, aud, SETTINGS)
+    assert key == cache.key(img, aud, dict(SETTINGS))
+    assert key != cache.key(img, aud, {**SETTINGS, "crf": 18})
+    aud.write_bytes(b"anderer ton")
+    assert key != cache.key(img, aud, SETTINGS)
+
+
+def test_store_fetch_and_lru_eviction(tmp_path):
+    cache = EncodeCache(tmp_path / "cache", max_bytes=10)
+    for name in ("a", "b", "c"):
+        src = tmp_path / f"{name}.mp4"
+        src.write_bytes(b"12345")
+        cache.store(name, src)
+        os.utime(cache._path(name), ns=(0, {"a": 1, "b": 2, "c": 3}[name]))
+        cache.evict()
+    # Nur zwei Einträge passen; "a" wurde am längsten nicht genutzt
+    assert not cache.fetch("a", tmp_path / "x.mp4")
+    assert cache.fetch("b", tmp_path / "y.mp4")
+    assert (tmp_path / "y.mp4").read_bytes() == b"12345"
+
+
+def test_cli_encode_uses_cache(tmp_path, monkeypatch):
+    img, aud = _pair(tmp_path)
+    calls = []
+
+    def fake_run(cmd, **kw):
+        calls.append(cmd)
+        Path(cmd[-1]).write_bytes(b"video")
+
+    monkeypatch.setattr("videobatch_extra.run_ffmpeg", fake_run)
+    cache = EncodeCache(tmp_path / "cache")
+    out = tmp_path / "out"
+    assert cli_encode([img], [aud], out, cache=cache) == 0
+    for f in out.iterdir():
+        f.unlink()
+    assert cli_encode([img], [aud], out, cache=cache) == 0
+    assert len(calls) == 1
+    assert [f.read_bytes() for f in out.iterdir()] == [b"video"]
+
+
+def test_entries_are_independent_of_outputs(tmp_path):
+    cache = EncodeCache(tmp_path / "cache")
+    src = tmp_path / "a.mp4"
+    src.write_bytes(b"video")
+    cache.store("k", src)
+    assert cache.fetch("k", tmp_path / "b.mp4")
+    # Nachträgliche Bearbeitung in place (z.B. Tag-Editor)
+    with open(src, "r+b") as fh:
+        fh.write(b"V")
+    with open(tmp_path / "b.mp4", "r+b") as fh:
+        fh.write(b"X")
+    assert cache.fetch("k", tmp_path / "c.mp4")
+    assert (tmp_path / "c.mp4").read_bytes() == b"video"
+    assert src.stat().st_ino != cache._path("k").stat().st_ino
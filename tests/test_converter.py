@@ -1,4 +1,7 @@
 from pathlib import Path
+import re
+import shutil
+import subprocess
 import sys
 
 sys.path.append(str(Path(__file__).resolve().parents[1]))
@@ -6,6 +9,23 @@ sys.path.append(str(Path(__file__).resolve().parents[1]))
 from api import run_ffmpeg  # noqa: E402
 import pytest
 
+needs_ffmpeg = pytest.mark.skipif(not shutil.which("ffmpeg"), reason="ffmpeg fehlt")
+
+
+def _media_duration(path) -> float:
+    """Containerdauer aus der Ausgabe von ``ffmpeg -i`` (ohne ffprobe)."""
+    err = subprocess.run(["ffmpeg", "-i", str(path)], capture_output=True, text=True)
+    h, m, s = re.search(r"Duration: (\d+):(\d+):([\d.]+)", err.stderr).groups()
+    return int(h) * 3600 + int(m) * 60 + float(s)
+
+
+def _aac_media(tmp_path, seconds: float):
+    img, aud = tmp_path / "img.png", tmp_path / "aud.m4a"
+    base = ["ffmpeg", "-v", "error", "-y", "-f", "lavfi", "-i"]
+    subprocess.run(base + ["testsrc2=size=320x240", "-frames:v", "1", str(img)])
+    subprocess.run(base + [f"sine=duration={seconds}", "-c:a", "aac", str(aud)])
+    return img, aud
+
 
 def test_run_ffmpeg_success():
     res = run_ffmpeg(["python", "-c", "print('ok')"])
@@ -15,3 +35,229 @@ def test_run_ffmpeg_success():
 def test_run_ffmpeg_failure():
     with pytest.raises(RuntimeError):
         run_ffmpeg(["python", "-c", "import sys; sys.exit(1)"])
+
+
+def test_build_ffmpeg_cmd_still_mode():
+    from api import build_ffmpeg_cmd
+
+    normal = build_ffmpeg_cmd("a.png", "a.mp3", "o.mp4", 640, 360, "192k", 23, "fast")
+    still = build_ffmpeg_cmd(
+        "a.png", "a.mp3", "o.mp4", 640, 360, "192k", 23, "fast", still=True
+    )
+    assert "-framerate" not in normal and "-g" not in normal
+    assert still[still.index("-framerate") + 1] == "1"
+    assert still.index("-framerate") < still.index("a.png")
+    assert still[still.index("-r") + 1] == "1"
+    assert still[-1] == "o.mp4"
+
+
+def test_prepare_encode_cmd_loop_reuses_segment(tmp_path, monkeypatch):
+    from api import converter
+
+    img = tmp_path / "a.png"
+    img.write_bytes(b"png")
+    monkeypatch.setattr(converter, "SEGMENT_DIR", tmp_path / "seg")
+    calls = []
+
+    def fake_run(cmd):
+        calls.append(cmd)
+        Path(cmd[-1]).write_bytes(b"mp4")
+
+    monkeypatch.setattr(converter, "run_ffmpeg", fake_run)
+    args = (str(img), "a.mp3", "o.mp4", 640, 360, "192k", 23, "fast")
+    first = converter.prepare_encode_cmd(*args, loop=True)
+    second = converter.prepare_encode_cmd(*args, loop=True)
+    assert len(calls) == 1
+    assert "-an" in calls[0] and calls[0][calls[0].index("-t") + 1] == "10"
+    assert first == second
+    seg = first[first.index("-stream_loop") + 3]
+    assert Path(seg).exists() and Path(seg).parent == tmp_path / "seg"
+    assert first[first.index("-c:v") + 1] == "copy"
+
+
+def test_segments_are_evicted_least_recently_used(tmp_path, monkeypatch):
+    import os
+
+    from api import converter
+
+    monkeypatch.setattr(converter, "SEGMENT_DIR", tmp_path / "seg")
+    monkeypatch.setattr(converter, "SEGMENT_MAX_BYTES", 250)
+    monkeypatch.setattr(
+        converter, "run_ffmpeg", lambda cmd: Path(cmd[-1]).write_bytes(b"x" * 100)
+    )
+    for name in "abc":
+        (tmp_path / f"{name}.png").write_bytes(name.encode())
+    segs = {}
+    for n, name in enumerate("abac"):
+        img = str(tmp_path / f"{name}.png")
+        segs[name] = converter.ensure_segment(img, 640, 360, 23, "fast")
+        os.utime(segs[name], ns=(n * 10**9, n * 10**9))
+    # b wurde am längsten nicht benutzt, a dank Wiederverwendung behalten
+    assert not segs["b"].exists()
+    assert segs["a"].exists() and segs["c"].exists()
+    assert not list((tmp_path / "seg" / "tmp").iterdir())
+
+
+def test_audio_passthrough_only_for_compatible_aac(monkeypatch):
+    from api import converter, probe
+
+    infos = {
+        "low.m4a": {"codec": "aac", "bit_rate": 128000},
+        "high.m4a": {"codec": "aac", "bit_rate": 256000},
+        "song.mp3": {"codec": "mp3", "bit_rate": 128000},
+    }
+    monkeypatch.setattr(probe, "probe_audio", lambda path: infos[path])
+    for audio, copied in (("low.m4a", True), ("high.m4a", False), ("song.mp3", False)):
+        cmd = converter.prepare_encode_cmd(
+            "a.png",
+            audio,
+            "o.mp4",
+            640,
+            360,
+            "192k",
+            23,
+            "fast",
+            audio_passthrough=True,
+        )
+        codec = cmd[cmd.index("-c:a") + 1]
+        assert codec == ("copy" if copied else "aac")
+        assert ("-b:a" in cmd) is not copied
+
+
+def test_ffmpeg_progress_parser():
+    from api import FfmpegProgress
+
+    prog = FfmpegProgress(duration=10.0)
+    lines = [
+        "Input #0, png_pipe, from 'a.png':",
+        "frame=12",
+        "fps=24.5",
+        "bitrate= 512.3kbits/s",
+        "out_time_us=2500000",
+        "out_time=00:00:02.500000",
+        "speed=3.21x",
+    ]
+    assert not any(prog.feed(line) for line in lines)
+    assert prog.feed("progress=continue")
+    assert prog.out_time == 2.5
+    assert prog.percent == 25.0
+    assert (prog.fps, prog.bitrate, prog.speed) == (24.5, 512.3, 3.21)
+    assert prog.last_message.startswith("Input #0")
+    prog.feed("out_time_us=N/A")
+    prog.feed("speed=N/A")
+    assert prog.feed("progress=end")
+    assert prog.done and prog.percent == 100.0
+    assert prog.out_time == 2.5 and prog.speed == 0.0
+
+
+def test_run_ffmpeg_with_progress(tmp_path):
+    from api import FfmpegProgress
+
+    fake = tmp_path / "fake_ffmpeg"
+    fake.write_text(
+        f"#!{sys.executable}\n"
+        "import sys\n"
+        "assert sys.argv[1:5] == ['-hide_banner', '-nostats', '-progress', 'pipe:1']\n"
+        "print('out_time_us=1000000'); print('speed=2.0x'); print('progress=end')\n"
+        "sys.stderr.write('Fehler am Ende\\n'); sys.exit(1)\n"
+    )
+    fake.chmod(0o755)
+    prog = FfmpegProgress(duration=4)
+    with pytest.raises(RuntimeError, match="Fehler am Ende"):
+        run_ffmpeg([str(fake), "-i", "x"], progress=prog)
+    assert prog.speed == 2.0 and prog.done
+
+
+def test_slideshow_concat_list_and_cmd(tmp_path, monkeypatch):
+    from api import converter
+
+    monkeypatch.setattr(converter, "SLIDES_DIR", tmp_path / "slides")
+    monkeypatch.setattr(converter, "probe_duration", lambda p: 90.0)
+    cmd = converter.prepare_encode_cmd(
+        "a.png", "a.mp3", "o.mp4", 640, 360, "192k", 23, "fast", slides=["b's.png"]
+    )
+    assert cmd[cmd.index("-f") + 1] == "concat"
+    assert cmd[cmd.index("-r") + 1] == str(converter.SLIDE_FPS)
+    lines = Path(cmd[cmd.index("-i") + 1]).read_text(encoding="utf-8").splitlines()
+    assert lines[0] == "ffconcat version 1.0"
+    assert lines[2::2] == ["duration 45", "duration 45"]
+    assert lines[3].endswith("b'\\''s.png'")
+    assert lines[-1] == lines[3]  # letztes Bild doppelt, sonst fehlt seine Standzeit
+    converter.remove_concat_list(cmd)
+    assert not list((tmp_path / "slides").iterdir())
+
+    assert converter.slide_durations(2, 0) == [converter.SLIDE_SECONDS] * 2
+    assert converter.slide_durations(2, 90, [10, 80]) == [10.0, 80.0]
+    with pytest.raises(ValueError):
+        converter.slide_durations(3, 90, [10, 80])
+
+
+def test_build_ffmpeg_cmd_rendition_ladder():
+    from api import build_ffmpeg_cmd
+    from utils import parse_renditions
+
+    ladder = [(w, h, f"o_{h}p.mp4") for w, h in parse_renditions("1280x720, 640x360")]
+    cmd = build_ffmpeg_cmd(
+        "a.png", "a.mp3", "o.mp4", 1920, 1080, "192k", 23, "fast", ladder=ladder
+    )
+    assert "-vf" not in cmd and cmd.count("-i") == 2
+    graph = cmd[cmd.index("-filter_complex") + 1]
+    assert graph.startswith("[0:v]scale=1920:1080") and "split=3[s0][s1][s2]" in graph
+    assert "[s2]scale=640:360" in graph
+    maps = [cmd[i + 1] for i, a in enumerate(cmd) if a == "-map"]
+    assert maps == ["[s0]", "1:a", "[v1]", "1:a", "[v2]", "1:a"]
+    assert [a for a in cmd if a.endswith(".mp4")] == [
+        "o.mp4",
+        "o_720p.mp4",
+        "o_360p.mp4",
+    ]
+    assert cmd.count("-crf") == 3
+
+
+def test_renditions_above_main_size_are_rejected():
+    from api import build_ffmpeg_cmd
+    from utils import parse_renditions
+
+    assert parse_renditions("3840x2160 1280x720 1920x720", (1920, 1080)) == [
+        (1280, 720),
+        (1920, 720),
+    ]
+    with pytest.raises(ValueError):
+        build_ffmpeg_cmd(
+            "a.png",
+            "a.mp3",
+            "o.mp4",
+            1280,
+            720,
+            "192k",
+            23,
+            "fast",
+            ladder=[(1920, 1080, "o_1080p.mp4")],
+        )
+
+
+@needs_ffmpeg
+def test_still_mode_ends_with_aac_audio(tmp_path):
+    from api import build_ffmpeg_cmd, run_ffmpeg
+    from api.verify import DURATION_TOLERANCE
+
+    img, aud = _aac_media(tmp_path, 37.01)
+    out = tmp_path / "o.mp4"
+    ladder = [(160, 120, str(tmp_path / "o_small.mp4"))]
+    for extra in ([], ladder):
+        cmd = build_ffmpeg_cmd(
+            str(img),
+            str(aud),
+            str(out),
+            320,
+            240,
+            "128k",
+            30,
+            "ultrafast",
+            still=True,
+            ladder=extra,
+        )
+        run_ffmpeg(cmd)
+        for f in [out] + [Path(o) for *_, o in extra]:
+            # Ohne "-fflags +shortest" lief das Video bis zu 11 s länger
+            assert abs(_media_duration(f) - 37.01) <= DURATION_TOLERANCE
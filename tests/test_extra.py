@@ -1,10 +1,21 @@
+import os
 from pathlib import Path
 import sys
 
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
 from videobatch_extra import build_out_name, human_time  # noqa: E402
-from videobatch_extra import cli_encode  # noqa: E402
+from videobatch_extra import cli_encode, cli_slideshow  # noqa: E402
+
+
+def _media(root: Path, count: int):
+    """Leere Dateien ``img{n}.jpg`` und ``aud{n}.mp3`` in ``root`` anlegen."""
+    root.mkdir(parents=True, exist_ok=True)
+    images = [root / f"img{n}.jpg" for n in range(count)]
+    audios = [root / f"aud{n}.mp3" for n in range(count)]
+    for f in images + audios:
+        f.write_bytes(b"")
+    return images, audios
 
 
 def test_human_time_format():
@@ -16,22 +27,172 @@ def test_build_out_name(tmp_path):
     assert result.parent == Path(tmp_path)
     assert result.suffix == ".mp4"
     assert result.name.startswith("song_")
+    assert build_out_name("song.mp3", tmp_path, "1280x720").name.endswith(
+        "_1280x720.mp4"
+    )
 
 
 def test_cli_encode_exit_codes(tmp_path, monkeypatch):
-    img = tmp_path / "img.jpg"
-    img.write_bytes(b"")
-    aud = tmp_path / "aud.mp3"
-    aud.write_bytes(b"")
-    monkeypatch.setattr("videobatch_extra.run_ffmpeg", lambda cmd: None)
+    [img], [aud] = _media(tmp_path, 1)
+    monkeypatch.setattr("videobatch_extra.run_ffmpeg", lambda cmd, **kw: None)
     ok = cli_encode([img], [aud], tmp_path)
     assert ok == 0
     bad = cli_encode([img], [], tmp_path)
     assert bad == 1
 
-    def fail(cmd):
+    def fail(cmd, **kw):
         raise RuntimeError("fail")
 
     monkeypatch.setattr("videobatch_extra.run_ffmpeg", fail)
     err = cli_encode([img], [aud], tmp_path)
     assert err == 2
+
+
+def test_cli_encode_parallel_summary(tmp_path, monkeypatch, capsys):
+    images, audios = _media(tmp_path, 3)
+
+    def flaky(cmd, **kw):
+        if "aud1" in cmd[-1]:
+            raise RuntimeError("kaputt")
+
+    monkeypatch.setattr("videobatch_extra.run_ffmpeg", flaky)
+    assert cli_encode(images, audios, tmp_path, jobs=3) == 2
+    out = capsys.readouterr().out
+    assert out.count("/3] ") == 3
+    assert "FFmpeg-Fehler: kaputt" in out
+    assert "Fertig: 2/3, Fehler: 1" in out
+
+
+def test_cli_encode_unexpected_error_fails_only_that_job(tmp_path, monkeypatch, capsys):
+    from storage import close, latest_batch, list_jobs
+
+    close()
+    db = tmp_path / "jobs.db"
+    images, audios = _media(tmp_path, 2)
+
+    def missing_ffmpeg(cmd, **kw):
+        if "aud0" in cmd[-1]:
+            raise FileNotFoundError("ffmpeg")
+
+    monkeypatch.setattr("videobatch_extra.run_ffmpeg", missing_ffmpeg)
+    assert cli_encode(images, audios, tmp_path, db_path=db) == 2
+    assert "Fertig: 1/2, Fehler: 1" in capsys.readouterr().out
+    batch = latest_batch(db, "cli-")
+    assert [j["status"] for j in list_jobs(db, batch)] == ["failed", "done"]
+    close()
+
+
+def test_cli_encode_resume_from_job_queue(tmp_path, monkeypatch):
+    from storage import close, latest_batch, list_jobs
+
+    close()
+    db = tmp_path / "jobs.db"
+    images, audios = _media(tmp_path, 3)
+    calls = []
+
+    def crash_on_second(cmd, **kw):
+        calls.append(cmd[-1])
+        if "aud1" in cmd[-1]:
+            raise RuntimeError("Abbruch")
+
+    monkeypatch.setattr("videobatch_extra.run_ffmpeg", crash_on_second)
+    assert cli_encode(images, audios, tmp_path, db_path=db) == 2
+    first = latest_batch(db, "cli-")
+    assert [j["status"] for j in list_jobs(db, first)] == ["done", "failed", "done"]
+    calls.clear()
+    monkeypatch.setattr("videobatch_extra.run_ffmpeg", lambda cmd, **kw: None)
+    assert cli_encode([], [], tmp_path, db_path=db, resume=True) == 0
+    jobs = list_jobs(db, latest_batch(db, "cli-"))
+    assert [j["status"] for j in jobs] == ["done"] * 3
+    assert jobs[1]["attempts"] == 2 and jobs[0]["attempts"] == 1
+    assert list_jobs(db, first) == []  # vom Fortsetzen übernommen
+    close()
+
+
+def test_cli_runs_keep_separate_queues(tmp_path, monkeypatch, capsys):
+    from storage import close, enqueue_jobs, latest_batch, list_jobs
+
+    close()
+    db = tmp_path / "jobs.db"
+    [img], [aud] = _media(tmp_path, 1)
+    # Fremder, noch laufender Lauf (PID des Elternprozesses)
+    other = f"cli-{os.getppid()}-20260101-000000-1"
+    enqueue_jobs([("x.jpg", "x.mp3")], db, batch=other)
+    monkeypatch.setattr("videobatch_extra.run_ffmpeg", lambda cmd, **kw: None)
+    assert cli_encode([img], [aud], tmp_path, db_path=db) == 0
+    assert [j["image"] for j in list_jobs(db, other)] == ["x.jpg"]
+    enqueue_jobs([("x.jpg", "x.mp3")], db, batch=other)
+    assert latest_batch(db, "cli-") == other
+    assert cli_encode([], [], tmp_path, db_path=db, resume=True) == 1
+    assert "wird noch bearbeitet" in capsys.readouterr().out
+    close()
+
+
+def test_cli_slideshow(tmp_path, monkeypatch):
+    imgs = [tmp_path / f"{n}.jpg" for n in "abc"]
+    for img in imgs:
+        img.write_bytes(b"")
+    aud = tmp_path / "aud.mp3"
+    aud.write_bytes(b"")
+    cmds = []
+    monkeypatch.setattr("api.converter.SLIDES_DIR", tmp_path / "slides")
+
+    def run(cmd, **kw):
+        assert Path(cmd[cmd.index("-i") + 1]).exists()
+        cmds.append(cmd)
+
+    monkeypatch.setattr("videobatch_extra.run_ffmpeg", run)
+    assert cli_slideshow(imgs, aud, tmp_path, durations=[1, 2, 3]) == 0
+    assert len(cmds) == 1 and "concat" in cmds[0]
+    assert not list((tmp_path / "slides").iterdir())  # Liste wieder gelöscht
+    assert cli_slideshow(imgs, aud, tmp_path, durations=[1]) == 1
+    assert cli_slideshow(imgs + [tmp_path / "x.jpg"], aud, tmp_path) == 1
+
+
+def test_cli_encode_same_stem_gets_unique_outputs(tmp_path, monkeypatch):
+    # aud0.mp3 in zwei Ordnern: gleicher Stamm, gleiche Sekunde
+    images, audios = [], []
+    for folder in ("a", "b"):
+        imgs, auds = _media(tmp_path / folder, 1)
+        images += imgs
+        audios += auds
+    outs = []
+    monkeypatch.setattr(
+        "videobatch_extra.run_ffmpeg", lambda cmd, **kw: outs.append(cmd[-1])
+    )
+    out_dir = tmp_path / "out"
+    assert cli_encode(images, audios, out_dir, jobs=2) == 0
+    assert len(set(outs)) == 2
+    assert {Path(o).parent for o in outs} == {out_dir}
+
+
+def test_output_names_skip_taken_and_existing(tmp_path):
+    from utils import OutputNames
+
+    names = OutputNames()
+    first, small = names.reserve("x/song.mp3", tmp_path, ["640x360"])
+    assert small.name == first.stem + "_640x360.mp4"
+    (second,) = names.reserve("y/song.mp3", tmp_path)
+    assert second != first and second.stem.startswith(first.stem)
+    fresh = OutputNames()
+    (third,) = fresh.reserve("song.mp3", tmp_path)
+    third.write_bytes(b"")
+    assert fresh.reserve("song.mp3", tmp_path)[0] != third
+
+
+def test_cli_renditions_with_same_height_keep_apart(tmp_path, monkeypatch):
+    from utils import parse_renditions
+
+    [img], [aud] = _media(tmp_path, 1)
+    cmds = []
+    monkeypatch.setattr(
+        "videobatch_extra.run_ffmpeg", lambda cmd, **kw: cmds.append(cmd)
+    )
+    sizes = parse_renditions("640x360 480x360 640x360")
+    assert sizes == [(640, 360), (480, 360)]
+    assert cli_encode([img], [aud], tmp_path, renditions=sizes) == 0
+    main, *extra = [Path(a) for a in cmds[0] if a.endswith(".mp4")]
+    assert [p.name for p in extra] == [
+        f"{main.stem}_640x360.mp4",
+        f"{main.stem}_480x360.mp4",
+    ]
@@ -0,0 +1,57 @@
+import os
+from pathlib import Path
+import subprocess
+import sys
+import threading
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from api import ResourceGovernor, build_ffmpeg_cmd  # noqa: E402
+
+
+def test_threads_split_across_jobs():
+    gov = ResourceGovernor(jobs=4, cpus=range(8))
+    cmd = build_ffmpeg_cmd(
+        "a.png",
+        "a.mp3",
+        "o.mp4",
+        640,
+        360,
+        "192k",
+        23,
+        "fast",
+        ladder=[(320, 180, "s.mp4")],
+    )
+    out = gov.apply(cmd)
+    assert out.count("-threads") == 2  # je Ausgabe hinter -c:v
+    assert out[out.index("libx264") + 1 : out.index("libx264") + 3] == ["-threads", "2"]
+    assert ResourceGovernor(jobs=1, cpus=range(8)).apply(cmd) == cmd
+
+
+def test_each_worker_thread_gets_own_cores():
+    gov = ResourceGovernor(jobs=2, cpus=[0, 1, 2, 3])
+    plans = []
+    threads = [
+        threading.Thread(target=lambda: plans.append(gov.plan())) for _ in range(2)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(plans) == [(2, [0, 1]), (2, [2, 3])]
+    assert ResourceGovernor(jobs=3, cpus=[0, 1]).plan() == (1, [0])
+
+
+@pytest.mark.skipif(not hasattr(os, "sched_setaffinity"), reason="nur Linux")
+def test_pin_sets_affinity():
+    cpu = sorted(os.sched_getaffinity(0))[0]
+    gov = ResourceGovernor(jobs=1, cpus=[cpu], affinity=True)
+    proc = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(2)"])
+    try:
+        gov.pin(proc.pid)
+        assert os.sched_getaffinity(proc.pid) == {cpu}
+    finally:
+        proc.kill()
+        proc.wait()
@@ -1,17 +1,88 @@
+import ctypes
 import os
 from pathlib import Path
+import shutil
+import subprocess
 import sys
 
 os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
 os.environ["HOME"] = "/tmp"
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
+import PySide6  # noqa: E402
 from PySide6 import QtGui, QtWidgets  # noqa: E402
 from PySide6.QtCore import Qt  # noqa: E402
 from videobatch_gui import MainWindow, human_time, make_thumb, PairItem  # noqa: E402
 from utils import check_ffmpeg  # noqa: E402
 from storage import load_project  # noqa: E402
 from config.paths import DEFAULT_OUT_DIR, NOTES_FILE  # noqa: E402
+import pytest  # noqa: E402
+
+# PySide6 6.12 liefert bei Signal.emit() True ohne eigene Referenz zurück;
+# ohne Reserve bricht der Interpreter am Ende ab (bool_dealloc)
+if PySide6.__version__.startswith("6.12"):
+    for _ in range(100_000):
+        ctypes.pythonapi.Py_IncRef(ctypes.py_object(True))
+
+
+class FakeProc:
+    """Ersatz für einen ffmpeg-Prozess, der sofort erfolgreich endet."""
+
+    pid = -1  # kein echter Kindprozess, Verbrauch wird nicht gemessen
+    lines = ["progress=end\n"]
+
+    def __init__(self):
+        self.stdout = iter(self.lines)
+        self.returncode = None
+
+    def poll(self):
+        return self.returncode
+
+    def wait(self):
+        self.returncode = 0
+        return 0
+
+    def kill(self):
+        self.returncode = -9
+
+
+@pytest.fixture
+def started(monkeypatch):
+    """``start_ffmpeg`` durch :class:`FakeProc` ersetzen, Ausgaben sammeln."""
+    outputs = []
+
+    def fake_start(cmd, **kw):
+        outputs.append(cmd[-1])
+        return FakeProc()
+
+    monkeypatch.setattr("videobatch_gui.start_ffmpeg", fake_start)
+    return outputs
+
+
+def _worker_pairs(tmp_path, count, duration=1.0):
+    """Leere Bild-/Audiodateien anlegen und als Zeilen zurückgeben."""
+    pairs = []
+    for n in range(count):
+        img = tmp_path / f"img{n}.png"
+        img.write_bytes(b"")
+        aud = tmp_path / f"aud{n}.mp3"
+        aud.write_bytes(b"")
+        pairs.append(PairItem(str(img), str(aud), duration=duration))
+    return pairs
+
+
+def _worker_settings(tmp_path, **extra):
+    settings = {
+        "out_dir": str(tmp_path / "out"),
+        "width": 320,
+        "height": 240,
+        "crf": 23,
+        "preset": "ultrafast",
+        "abitrate": "192k",
+        "jobs": 2,
+    }
+    settings.update(extra)
+    return settings
 
 
 def test_human_time_gui():
@@ -169,3 +240,352 @@ def test_start_encode_requires_ffmpeg(monkeypatch, tmp_path):
     win._start_encode()
     assert called["msg"].startswith("FFmpeg")
     win.close()
+
+
+def test_encode_worker_parallel_jobs(tmp_path, monkeypatch):
+    import threading
+
+    from videobatch_gui import EncodeWorker
+
+    QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    pairs = _worker_pairs(tmp_path, 4, duration=2.0)
+    running = {"now": 0, "max": 0}
+    lock = threading.Lock()
+
+    class CountingProc(FakeProc):
+        lines = ["out_time_us=1000000\n", "progress=continue\n"]
+
+        def __init__(self):
+            with lock:
+                running["now"] += 1
+                running["max"] = max(running["max"], running["now"])
+            super().__init__()
+
+        def wait(self):
+            import time
+
+            time.sleep(0.05)
+            with lock:
+                running["now"] -= 1
+            return super().wait()
+
+    monkeypatch.setattr("videobatch_gui.start_ffmpeg", lambda cmd, **kw: CountingProc())
+    worker = EncodeWorker(pairs, _worker_settings(tmp_path), copy_only=True)
+    progress = []
+    worker.overall_progress.connect(progress.append)
+    worker.run()
+    QtWidgets.QApplication.processEvents()
+    assert all(p.status == "FERTIG" for p in pairs)
+    assert running["max"] == 2
+    assert max(progress) == 100.0
+
+
+def test_progress_aggregator_coalesces_rows(tmp_path):
+    QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    from videobatch_gui import PairTableModel, ProgressAggregator
+
+    pairs = [PairItem(f"img{n}.png", f"aud{n}.mp3") for n in range(8)]
+    model = PairTableModel(pairs, show_thumbs=False)
+    agg = ProgressAggregator(model)
+    changes, overall = [], []
+    model.dataChanged.connect(
+        lambda a, b, roles=None: changes.append((a.row(), b.row(), a.column()))
+    )
+    agg.overall_changed.connect(overall.append)
+    for step in range(50):
+        for row in (2, 5, 3):
+            agg.row_progress(row, float(step))
+        agg.overall_progress(step / 2)
+    agg.flush()
+    assert changes == [(2, 5, 6)]
+    assert overall == [24.5]
+    assert pairs[5].progress == 49.0 and pairs[0].progress == 0.0
+    agg.flush()
+    assert len(changes) == 1 and len(overall) == 1
+
+
+def test_encode_worker_resumes_from_job_queue(tmp_path, started):
+    QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    from videobatch_gui import EncodeWorker
+    import storage
+
+    storage.close()
+    db = tmp_path / "jobs.db"
+    pairs = _worker_pairs(tmp_path, 3)
+    storage.enqueue_jobs([(p.image_path, p.audio_path) for p in pairs], db)
+    job = storage.claim_job(db)
+    storage.finish_job(job["id"], "done", db, output="fertig.mp4")
+    storage.claim_job(db)  # bleibt nach "Absturz" als running liegen
+    storage.resume_jobs(db)
+    pairs[0].status = "FERTIG"
+    settings = _worker_settings(tmp_path)
+    worker = EncodeWorker(pairs, settings, True, db_path=db, resume=True)
+    worker.run()
+    assert len(started) == 2
+    assert [j["status"] for j in storage.list_jobs(db)] == ["done"] * 3
+    storage.close()
+
+
+def test_merge_rows_into_slideshow(tmp_path):
+    os.environ["XDG_CONFIG_HOME"] = str(tmp_path)
+    QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    paths = []
+    for n in "abc":
+        (tmp_path / f"{n}.png").write_bytes(b"")
+        paths.append(str(tmp_path / f"{n}.png"))
+    aud = tmp_path / "a.mp3"
+    aud.write_bytes(b"")
+    win = MainWindow()
+    win.model.add_pairs([PairItem(paths[0]), PairItem(paths[1], str(aud))])
+    win.model.add_pairs([PairItem(paths[2])])
+    win.table.selectAll()
+    win.btn_slideshow.click()
+    assert len(win.pairs) == 1
+    item = win.pairs[0]
+    assert item.slides == paths[1:] and item.audio_path == str(aud)
+    assert item.valid
+    assert win.model.index(0, 2).data() == "a.png (+2)"
+    assert win._project_data()["pairs"][0]["slides"] == paths[1:]
+    win.btn_undo.click()
+    assert len(win.pairs) == 3
+    win.close()
+
+
+def test_encode_worker_verifies_outputs(tmp_path, monkeypatch, started):
+    QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    from videobatch_gui import EncodeWorker
+
+    pairs = _worker_pairs(tmp_path, 3)
+    checked = []
+
+    def fake_verify(path, expected):
+        checked.append((Path(path).name.split("_")[0], expected))
+        return "Keine Audiospur in der Ausgabe" if "aud1" in path else ""
+
+    monkeypatch.setattr("videobatch_gui.verify_output", fake_verify)
+    worker = EncodeWorker(pairs, _worker_settings(tmp_path, verify=True), True)
+    errors = []
+    worker.row_error.connect(lambda row, msg: errors.append((row, msg)))
+    worker.run()
+    QtWidgets.QApplication.processEvents()
+    assert sorted(checked) == [("aud0", 1.0), ("aud1", 1.0), ("aud2", 1.0)]
+    assert [p.status for p in pairs] == ["FERTIG", "FEHLER", "FERTIG"]
+    assert errors and errors[0][0] == 1 and "Keine Audiospur" in errors[0][1]
+
+
+def test_probe_service_fills_durations_in_background(monkeypatch):
+    import threading
+
+    QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    from videobatch_gui import PairTableModel, ProbeService
+
+    gate = threading.Event()
+    main = threading.get_ident()
+    calls = []
+
+    def fake_probe(path):
+        calls.append(threading.get_ident())
+        gate.wait(5)
+        return float(path[1:-4])
+
+    monkeypatch.setattr("videobatch_gui.probe_duration", fake_probe)
+    pairs = [PairItem(f"i{n}.png", f"a{n}.mp3") for n in range(1, 6)]
+    pairs.append(PairItem("ohne.png"))
+    model = PairTableModel(pairs, show_thumbs=False)
+    service = ProbeService(model, workers=3)
+    changes = []
+    model.dataChanged.connect(
+        lambda a, b, roles=None: changes.append((a.row(), b.row(), a.column()))
+    )
+    service.request(pairs)
+    assert service.busy == 5
+    assert model.data(model.index(0, 4)) == "?"
+    gate.set()
+    service.wait()
+    assert service.busy == 0
+    assert main not in calls
+    assert [p.duration for p in pairs] == [1.0, 2.0, 3.0, 4.0, 5.0, 0.0]
+    assert changes == [(0, 4, 4)]
+    assert model.data(model.index(2, 4)) == "00:03"
+    service.shutdown()
+
+
+def test_probe_service_resolves_failed_probes(monkeypatch):
+    QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    from videobatch_gui import PairTableModel, ProbeService
+
+    def fake_probe(path):
+        if path == "kaputt.mp3":
+            raise ValueError("kaputt")
+        return 2.0
+
+    monkeypatch.setattr("videobatch_gui.probe_duration", fake_probe)
+    pairs = [PairItem("a.png", "kaputt.mp3"), PairItem("b.png", "gut.mp3")]
+    service = ProbeService(PairTableModel(pairs, show_thumbs=False))
+    service.request(pairs)
+    service.wait()
+    assert service.busy == 0 and not service._timer.isActive()
+    assert [p.duration for p in pairs] == [0.0, 2.0]
+    service.shutdown()
+
+
+def test_probe_service_uses_media_cache(tmp_path, monkeypatch):
+    QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    from api.mediainfo import MediaInfoCache
+    from videobatch_gui import PairTableModel, ProbeService
+
+    spawned = []
+    monkeypatch.setattr("videobatch_gui.probe_duration", spawned.append)
+    aud = tmp_path / "a.mp3"
+    aud.write_bytes(b"a")
+    cache = MediaInfoCache(tmp_path / "media.db", probe=lambda p: {"duration": 7.0})
+    cache.duration(aud)
+    cache.probe = lambda p: spawned.append(p) or {}
+    pairs = [PairItem("a.png", str(aud))]
+    service = ProbeService(PairTableModel(pairs, show_thumbs=False), cache=cache)
+    service.request(pairs)
+    service.wait()
+    assert pairs[0].duration == 7.0 and spawned == []
+    service.shutdown()
+    cache.close()
+
+
+def test_thumb_loader_decodes_off_thread(tmp_path, monkeypatch):
+    import threading
+
+    QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    import videobatch_gui
+    from videobatch_gui import PairTableModel, ThumbLoader
+
+    from PIL import Image
+
+    pairs = []
+    for n in range(3):
+        img = tmp_path / f"img{n}.png"
+        Image.new("RGB", (400, 300), "red").save(img)
+        pairs.append(PairItem(str(img)))
+    decoded = []
+    real = videobatch_gui.thumb_image
+
+    def spy(path, size, cache=None):
+        decoded.append(threading.get_ident())
+        return real(path, size, cache)
+
+    monkeypatch.setattr("videobatch_gui.thumb_image", spy)
+    model = PairTableModel(pairs)
+    loader = ThumbLoader(model)
+    model.thumb_loader = loader
+    changes = []
+    model.dataChanged.connect(
+        lambda a, b, roles=None: changes.append((a.row(), b.row(), a.column()))
+    )
+    first = model.data(model.index(0, 1), Qt.DecorationRole)
+    assert first is loader.placeholder() and pairs[0].thumb is None
+    for row in range(3):
+        model.data(model.index(row, 1), Qt.DecorationRole)
+        model.data(model.index(row, 1), Qt.DecorationRole)
+    assert loader.busy == 3
+    loader.wait()
+    assert len(decoded) == 3 and threading.get_ident() not in decoded
+    assert changes == [(0, 2, 1)]
+    thumb = model.data(model.index(1, 1), Qt.DecorationRole)
+    assert thumb is pairs[1].thumb and thumb.width() == 120
+    loader.shutdown()
+
+
+def test_thumb_loader_drops_rows_out_of_view(monkeypatch):
+    import threading
+
+    QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    from videobatch_gui import PairTableModel, ThumbLoader
+
+    gate = threading.Event()
+    decoded = []
+
+    def slow(path, size, cache=None):
+        gate.wait(5)
+        decoded.append(path)
+        return QtGui.QImage(size[0], size[1], QtGui.QImage.Format_RGBA8888)
+
+    monkeypatch.setattr("videobatch_gui.thumb_image", slow)
+    pairs = [PairItem(f"img{n}.png") for n in range(6)]
+    model = PairTableModel(pairs)
+    loader = ThumbLoader(model, workers=1)
+    for p in pairs:
+        loader.request(p)
+    # img0 läuft schon, img5 ist noch sichtbar, der Rest wird verworfen
+    assert loader.retain([pairs[5]]) == 4
+    gate.set()
+    loader.wait()
+    assert decoded == ["img0.png", "img5.png"]
+    assert pairs[0].thumb is not None and pairs[3].thumb is None
+    loader.shutdown()
+
+
+def test_encode_worker_same_stem_gets_unique_outputs(tmp_path, started):
+    QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    from videobatch_gui import EncodeWorker
+
+    pairs = []
+    for folder in ("a", "b", "c"):
+        (tmp_path / folder).mkdir()
+        img = tmp_path / folder / "cover.png"
+        img.write_bytes(b"")
+        aud = tmp_path / folder / "track.mp3"
+        aud.write_bytes(b"")
+        pairs.append(PairItem(str(img), str(aud), duration=1.0))
+    worker = EncodeWorker(pairs, _worker_settings(tmp_path, jobs=3), True)
+    worker.run()
+    QtWidgets.QApplication.processEvents()
+    assert len(set(started)) == 3
+    assert sorted(started) == sorted(p.output for p in pairs)
+
+
+def test_encode_worker_verifier_errors_finish_the_row(tmp_path, monkeypatch, started):
+    QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    from videobatch_gui import EncodeWorker
+    from api.cache import EncodeCache
+    import storage
+
+    storage.close()
+    db = tmp_path / "jobs.db"
+    pairs = _worker_pairs(tmp_path, 2)
+    settings = _worker_settings(tmp_path, verify=True, cache=True)
+    worker = EncodeWorker(pairs, settings, True, db_path=db)
+    worker.cache = EncodeCache(tmp_path / "cache")
+
+    def broken_store(key, src):
+        raise RuntimeError("Cache defekt")
+
+    monkeypatch.setattr(worker.cache, "store", broken_store)
+    monkeypatch.setattr("videobatch_gui.verify_output", lambda path, expected: "")
+    errors = []
+    worker.row_error.connect(lambda row, msg: errors.append(msg))
+    worker.run()
+    QtWidgets.QApplication.processEvents()
+    assert [p.status for p in pairs] == ["FEHLER", "FEHLER"]
+    assert errors == ["Prüfung fehlgeschlagen: Cache defekt"] * 2
+    assert [j["status"] for j in storage.list_jobs(db)] == ["failed"] * 2
+    storage.close()
+
+
+@pytest.mark.skipif(
+    not (shutil.which("ffmpeg") and shutil.which("ffprobe")),
+    reason="ffmpeg/ffprobe fehlt",
+)
+def test_encode_worker_verifies_still_mode_with_aac(tmp_path):
+    QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    from videobatch_gui import EncodeWorker
+
+    img, aud = tmp_path / "img.png", tmp_path / "aud.m4a"
+    base = ["ffmpeg", "-v", "error", "-y", "-f", "lavfi", "-i"]
+    subprocess.run(base + ["testsrc2=size=320x240", "-frames:v", "1", str(img)])
+    subprocess.run(base + ["sine=duration=37.01", "-c:a", "aac", str(aud)])
+    pairs = [PairItem(str(img), str(aud), duration=37.01)]
+    settings = _worker_settings(tmp_path, still=True, verify=True, jobs=1)
+    worker = EncodeWorker(pairs, settings, copy_only=True)
+    errors = []
+    worker.row_error.connect(lambda row, msg: errors.append(msg))
+    worker.run()
+    QtWidgets.QApplication.processEvents()
+    assert errors == [] and pairs[0].status == "FERTIG"
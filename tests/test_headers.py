@@ -0,0 +1,109 @@
+from pathlib import Path
+import shutil
+import subprocess
+import sys
+import wave
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from api import probe  # noqa: E402
+from api.headers import read_header  # noqa: E402
+
+needs_ffmpeg = pytest.mark.skipif(not shutil.which("ffmpeg"), reason="ffmpeg fehlt")
+needs_ffprobe = pytest.mark.skipif(
+    not (shutil.which("ffmpeg") and shutil.which("ffprobe")),
+    reason="ffmpeg/ffprobe fehlt",
+)
+
+# name, ffmpeg-Optionen, erwarteter Codec
+CASES = [
+    ("cbr.mp3", ["-c:a", "libmp3lame", "-b:a", "128k"], "mp3"),
+    ("vbr.mp3", ["-c:a", "libmp3lame", "-q:a", "4"], "mp3"),
+    ("mono22k.mp3", ["-c:a", "libmp3lame", "-ac", "1", "-ar", "22050"], "mp3"),
+    ("tagged.mp3", ["-c:a", "libmp3lame", "-metadata", "title=Test"], "mp3"),
+    ("plain.flac", [], "flac"),
+    ("s24.wav", ["-c:a", "pcm_s24le", "-ac", "2"], "pcm_s24le"),
+    ("f32.wav", ["-c:a", "pcm_f32le"], "pcm_f32le"),
+]
+
+
+def _make(path: Path, args, seconds: float = 7.3) -> Path:
+    subprocess.run(
+        ["ffmpeg", "-v", "error", "-y", "-f", "lavfi"]
+        + ["-i", f"sine=d={seconds}:r=44100", *args, str(path)],
+        check=True,
+    )
+    return path
+
+
+def test_wav_from_wave_module(tmp_path):
+    path = tmp_path / "a.wav"
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(2)
+        w.setsampwidth(2)
+        w.setframerate(8000)
+        w.writeframes(b"\0\0\0\0" * 12000)
+    assert read_header(path) == {
+        "duration": 1.5,
+        "audio_codec": "pcm_s16le",
+        "sample_rate": 8000,
+    }
+
+
+def test_unknown_or_unsure_headers(tmp_path):
+    junk = tmp_path / "x.m4a"
+    junk.write_bytes(b"\0\0\0\x20ftypM4A " + b"\0" * 100)
+    assert read_header(junk) is None
+    cut = tmp_path / "cut.wav"
+    with wave.open(str(cut), "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(8000)
+        w.writeframes(b"\0\0" * 8000)
+    cut.write_bytes(cut.read_bytes()[:1000])  # Länge im Kopf stimmt nicht mehr
+    assert read_header(cut) is None
+    assert read_header(tmp_path / "fehlt.mp3") is None
+
+
+@needs_ffmpeg
+@pytest.mark.parametrize("name,args,codec", CASES)
+def test_generated_files(tmp_path, name, args, codec):
+    info = read_header(_make(tmp_path / name, args))
+    assert info is not None
+    # MP3 zählt ganze Frames (1152 bzw. 576 Samples) inkl. Encoder-Vorlauf
+    assert info["duration"] == pytest.approx(7.3, abs=0.1)
+    assert info["audio_codec"] == codec
+
+
+@needs_ffmpeg
+def test_mp3_without_xing_falls_back(tmp_path, monkeypatch):
+    path = _make(tmp_path / "raw.mp3", ["-c:a", "libmp3lame", "-write_xing", "0"])
+    assert read_header(path) is None
+    monkeypatch.setattr("ffmpeg.probe", lambda p: {"format": {"duration": "7.3"}})
+    assert probe.probe_duration(str(path)) == 7.3
+
+
+@needs_ffmpeg
+def test_probe_skips_ffprobe_for_known_headers(tmp_path, monkeypatch):
+    path = _make(tmp_path / "a.flac", [])
+
+    def boom(p):
+        raise AssertionError("ffprobe darf nicht laufen")
+
+    monkeypatch.setattr("ffmpeg.probe", boom)
+    assert probe.probe_duration(str(path)) == pytest.approx(7.3)
+    assert probe.probe_media(str(path))["sample_rate"] == 44100
+
+
+@needs_ffprobe
+@pytest.mark.parametrize("name,args,codec", CASES)
+def test_matches_ffprobe(tmp_path, name, args, codec):
+    import ffmpeg
+
+    path = _make(tmp_path / name, args)
+    pr = ffmpeg.probe(str(path))
+    info = read_header(path)
+    assert info["duration"] == pytest.approx(float(pr["format"]["duration"]), abs=0.03)
+    assert info["audio_codec"] == pr["streams"][0]["codec_name"] == codec
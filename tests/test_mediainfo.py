@@ -0,0 +1,90 @@
+import os
+from pathlib import Path
+import sys
+import threading
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from api.mediainfo import MediaInfoCache  # noqa: E402
+
+
+def _fake_probe(calls):
+    def probe(path):
+        calls.append(path)
+        if path.endswith(".bad"):
+            return {}
+        return {"duration": 12.5, "audio_codec": "mp3", "sample_rate": 44100}
+
+    return probe
+
+
+def test_hit_miss_and_invalidation(tmp_path):
+    calls = []
+    db = tmp_path / "media.db"
+    aud = tmp_path / "a.mp3"
+    aud.write_bytes(b"x" * 10)
+    cache = MediaInfoCache(db, probe=_fake_probe(calls))
+    assert cache.get(aud) is None
+    assert cache.duration(aud) == 12.5
+    info = cache.info(aud)
+    assert info["audio_codec"] == "mp3" and info["sample_rate"] == 44100
+    assert info["width"] is None
+    assert len(calls) == 1
+    cache.close()
+
+    # Neu geöffnet (z.B. nach Neustart): kein weiterer Aufruf
+    cache = MediaInfoCache(db, probe=_fake_probe(calls))
+    assert cache.duration(aud) == 12.5 and len(calls) == 1
+    aud.write_bytes(b"x" * 11)
+    assert cache.get(aud) is None
+    cache.duration(aud)
+    assert len(calls) == 2
+    st = aud.stat()
+    os.utime(aud, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    cache.duration(aud)
+    assert len(calls) == 3
+    cache.close()
+
+
+def test_failures_are_not_stored(tmp_path):
+    calls = []
+    bad = tmp_path / "kaputt.bad"
+    bad.write_bytes(b"?")
+    cache = MediaInfoCache(tmp_path / "media.db", probe=_fake_probe(calls))
+    assert cache.duration(bad) == 0.0
+    assert cache.duration(bad) == 0.0
+    assert cache.duration(tmp_path / "fehlt.mp3") == 0.0
+    assert len(calls) == 2
+    cache.close()
+
+
+def test_database_errors_fall_back_to_probe(tmp_path):
+    calls = []
+    aud = tmp_path / "a.mp3"
+    aud.write_bytes(b"x")
+    cache = MediaInfoCache(tmp_path / "media.db", probe=_fake_probe(calls))
+    cache._conn.execute("DROP TABLE media")  # wie eine beschädigte Datei
+    assert cache.duration(aud) == 12.5
+    cache.close()
+    assert cache.duration(aud) == 12.5
+    assert len(calls) == 2
+
+
+def test_concurrent_lookups(tmp_path):
+    calls = []
+    files = []
+    for n in range(20):
+        f = tmp_path / f"{n}.wav"
+        f.write_bytes(b"w")
+        files.append(f)
+    cache = MediaInfoCache(tmp_path / "media.db", probe=_fake_probe(calls))
+    threads = [
+        threading.Thread(target=lambda: [cache.duration(f) for f in files])
+        for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert all(cache.get(f) for f in files)
+    cache.close()
@@ -0,0 +1,25 @@
+from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from api.scheduler import order_jobs, predict_makespan  # noqa: E402
+import pytest  # noqa: E402
+
+
+def test_order_jobs_policies():
+    durations = [30.0, 300.0, 10.0, 300.0]
+    assert order_jobs(durations) == [0, 1, 2, 3]
+    assert order_jobs(durations, "longest") == [1, 3, 0, 2]
+    assert order_jobs(durations, "shortest") == [2, 0, 1, 3]
+    with pytest.raises(ValueError):
+        order_jobs(durations, "zufall")
+
+
+def test_longest_first_shortens_makespan():
+    durations = [10.0, 10.0, 10.0, 10.0, 40.0]
+    table = predict_makespan(durations, order_jobs(durations), 2)
+    longest = predict_makespan(durations, order_jobs(durations, "longest"), 2)
+    assert table == 60.0
+    assert longest == 40.0
+    assert predict_makespan(durations, range(5), 1) == sum(durations)
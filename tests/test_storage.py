@@ -21,3 +21,89 @@ def test_thread_safe(tmp_path):
     # After all threads, database should contain last written value (0-4)
     assert load_project(db)["v"] in range(5)
     close()
+
+
+def test_job_queue_claim_finish_resume(tmp_path):
+    from storage import (
+        claim_job,
+        enqueue_jobs,
+        finish_job,
+        list_jobs,
+        resume_jobs,
+    )
+
+    close()
+    db = tmp_path / "jobs.db"
+    enqueue_jobs([("a.jpg", "a.mp3"), ("b.jpg", "b.mp3"), ("c.jpg", "c.mp3")], db)
+    enqueue_jobs([("x.jpg", "x.mp3")], db, batch="cli")
+    first = claim_job(db)
+    second = claim_job(db)
+    assert (first["row"], second["row"]) == (0, 1)
+    assert first["status"] == "running" and first["attempts"] == 1
+    finish_job(first["id"], "done", db, output="a.mp4")
+    finish_job(second["id"], "failed", db, error="kaputt")
+    # Absturz: Job 3 bleibt "running" liegen
+    assert claim_job(db)["row"] == 2
+    jobs = resume_jobs(db)
+    assert [j["status"] for j in jobs] == ["done", "pending", "pending"]
+    assert jobs[0]["output"] == "a.mp4"
+    again = claim_job(db)
+    assert again["row"] == 1 and again["attempts"] == 2
+    assert [j["image"] for j in list_jobs(db, batch="cli")] == ["x.jpg"]
+    close()
+
+
+def test_latest_batch_and_resume_rename(tmp_path):
+    from storage import enqueue_jobs, latest_batch, list_jobs, resume_jobs
+
+    close()
+    db = tmp_path / "jobs.db"
+    assert latest_batch(db, "cli-") is None
+    enqueue_jobs([("a.jpg", "a.mp3")], db, batch="cli-1")
+    enqueue_jobs([("b.jpg", "b.mp3")], db, batch="cli-2")
+    enqueue_jobs([("c.jpg", "c.mp3")], db)
+    assert latest_batch(db, "cli-") == "cli-2"
+    jobs = resume_jobs(db, "cli-2", rename="cli-3")
+    assert [j["batch"] for j in jobs] == ["cli-3"]
+    assert list_jobs(db, "cli-2") == [] and len(list_jobs(db, "cli-1")) == 1
+    close()
+
+
+def test_job_stats_columns_and_migration(tmp_path):
+    import sqlite3
+
+    from storage import claim_job, enqueue_jobs, finish_job, list_jobs
+
+    db = tmp_path / "alt.db"
+    old = sqlite3.connect(db)
+    old.execute(
+        "CREATE TABLE jobs (id INTEGER PRIMARY KEY, batch TEXT, row INTEGER,"
+        " image TEXT, audio TEXT, output TEXT DEFAULT '', status TEXT,"
+        " attempts INTEGER DEFAULT 0, error TEXT DEFAULT '', queued REAL,"
+        " started REAL, finished REAL)"
+    )
+    old.close()
+    enqueue_jobs([("a.png", "a.mp3"), ("b.png", "b.mp3")], db)
+    job = claim_job(db)
+    finish_job(
+        job["id"], "done", db, "a.mp4", stats={"cpu_user": 1.5, "max_rss_kb": 2048}
+    )
+    first, second = list_jobs(db)
+    assert first["cpu_user"] == 1.5 and first["max_rss_kb"] == 2048
+    assert first["read_bytes"] is None and second["wall"] is None
+    close()
+
+
+def test_each_database_path_gets_its_own_connection(tmp_path):
+    from storage import enqueue_jobs, list_jobs
+
+    close()
+    gui, cli = tmp_path / "project.db", tmp_path / "cli_jobs.db"
+    save_project({"name": "gui"}, gui)
+    enqueue_jobs([("a.png", "a.mp3")], cli, batch="cli-1")
+    enqueue_jobs([("b.png", "b.mp3"), ("c.png", "c.mp3")], gui)
+    assert [j["audio"] for j in list_jobs(cli, "cli-1")] == ["a.mp3"]
+    assert len(list_jobs(gui)) == 2
+    assert load_project(gui) == {"name": "gui"}
+    assert load_project(cli)["pairs"] == []
+    close()
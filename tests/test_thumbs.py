@@ -0,0 +1,89 @@
+import os
+from pathlib import Path
+import sys
+
+from PIL import Image, JpegImagePlugin
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from api.bench import make_photo  # noqa: E402
+from api.thumbs import ThumbCache, make_thumbnail  # noqa: E402
+
+
+def _image(path: Path, color: str = "red") -> Path:
+    Image.new("RGB", (640, 480), color).save(path)
+    return path
+
+
+def test_thumbnail_is_cached_and_reused(tmp_path, monkeypatch):
+    src = _image(tmp_path / "a.jpg")
+    cache = ThumbCache(tmp_path / "thumbs")
+    first = cache.thumbnail(src, (160, 90))
+    assert first.size == (120, 90) and first.mode == "RGBA"
+    assert len(list((tmp_path / "thumbs").glob("*/*.png"))) == 1
+
+    # Neuer Cache (z.B. nach Neustart) dekodiert die Quelle nicht erneut
+    def boom(path, size):
+        raise AssertionError("Quelle darf nicht dekodiert werden")
+
+    monkeypatch.setattr("api.thumbs.make_thumbnail", boom)
+    again = ThumbCache(tmp_path / "thumbs").thumbnail(src, (160, 90))
+    assert again.tobytes() == first.tobytes()
+
+
+def test_key_covers_mtime_and_size(tmp_path):
+    src = _image(tmp_path / "a.png")
+    cache = ThumbCache(tmp_path / "thumbs")
+    key = cache.key(src, (160, 90))
+    assert key != cache.key(src, (80, 45))
+    st = src.stat()
+    os.utime(src, ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+    assert key != cache.key(src, (160, 90))
+    cache.thumbnail(src, (160, 90))
+    _image(src, "blue")
+    assert cache.get(src, (160, 90)) is None
+
+
+def test_lru_eviction_keeps_recent_entries(tmp_path):
+    cache = ThumbCache(tmp_path / "thumbs")
+    sources = [_image(tmp_path / f"{n}.png") for n in range(3)]
+    for n, src in enumerate(sources):
+        cache.thumbnail(src, (160, 90))
+        entry = cache._path(cache.key(src, (160, 90)))
+        os.utime(entry, ns=(0, n + 1))
+    one = entry.stat().st_size
+    cache.max_bytes = 2 * one
+    cache.evict()
+    assert cache.get(sources[0], (160, 90)) is None
+    assert cache.get(sources[2], (160, 90)) is not None
+    assert cache._total <= cache.max_bytes
+
+
+def test_exif_preview_avoids_decoding_the_photo(tmp_path, monkeypatch):
+    photo = make_photo(tmp_path / "p.jpg", (1200, 800), preview=(160, 107))
+
+    def no_draft(self, mode, size):
+        raise AssertionError("Hauptbild darf nicht dekodiert werden")
+
+    monkeypatch.setattr(JpegImagePlugin.JpegImageFile, "draft", no_draft)
+    thumb = make_thumbnail(photo, (160, 90))
+    assert thumb.size == (135, 90) and thumb.mode == "RGBA"
+
+
+def test_unsuitable_preview_falls_back_to_draft(tmp_path, monkeypatch):
+    drafts = []
+    draft = JpegImagePlugin.JpegImageFile.draft
+
+    def spy(self, mode, size):
+        drafts.append(size)
+        return draft(self, mode, size)
+
+    monkeypatch.setattr(JpegImagePlugin.JpegImageFile, "draft", spy)
+    # 4:3-Vorschau zu einem 3:2-Foto hätte schwarze Ränder
+    photo = make_photo(tmp_path / "p.jpg", (1200, 800), preview=(160, 120))
+    assert make_thumbnail(photo, (160, 90)).size == (135, 90)
+    assert drafts[0] == (135, 90)
+    small = make_photo(tmp_path / "s.jpg", (1200, 800), preview=(60, 40))
+    assert make_thumbnail(small, (160, 90)).size == (135, 90)
+    png = make_thumbnail(_image(tmp_path / "a.png"), (160, 90))
+    assert png.size == (120, 90) and png.mode == "RGBA"
@@ -0,0 +1,77 @@
+from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from api import tuner  # noqa: E402
+from api.converter import build_ffmpeg_cmd  # noqa: E402
+
+SETTINGS = {"width": 640, "height": 360, "abitrate": "128k", "crf": 23, "jobs": 1}
+
+
+def test_build_ffmpeg_cmd_limit():
+    cmd = build_ffmpeg_cmd(
+        "i.png", "a.mp3", "o.mp4", 640, 360, "128k", 23, "fast", limit=5
+    )
+    assert cmd[-3:] == ["-t", "5", "o.mp4"]
+    assert "-t" not in build_ffmpeg_cmd(
+        "i.png", "a.mp3", "o.mp4", 640, 360, "128k", 23, "fast"
+    )
+
+
+def test_tune_preset_picks_slowest_within_budget(monkeypatch):
+    # Fake-Tempo je Preset: ultrafast 10x, superfast 5x, veryfast 2x
+    speeds = {"ultrafast": 10.0, "superfast": 5.0, "veryfast": 2.0}
+    measured = []
+
+    def fake_measure(samples, settings, preset, workers, runner):
+        measured.append(preset)
+        assert len(samples) == tuner.MAX_SAMPLES
+        return speeds[preset]
+
+    monkeypatch.setattr(tuner, "measure_preset", fake_measure)
+    samples = [("i.png", "a.mp3", 60.0)] * 5
+    durations = [60.0] * 5  # 300 s Audio
+    preset, est = tuner.tune_preset(samples, durations, SETTINGS, budget=100)
+    assert preset == "superfast"  # 60 s <= 100 s, veryfast bräuchte 150 s
+    assert measured == ["ultrafast", "superfast", "veryfast"]
+    assert est["veryfast"] == 150.0
+
+    preset, _ = tuner.tune_preset(samples, durations, SETTINGS, budget=1)
+    assert preset == "ultrafast"
+
+
+def test_measure_preset_uses_limited_samples():
+    cmds = []
+    speed = tuner.measure_preset(
+        [("i.png", "a.mp3", 2.0), ("j.png", "b.mp3", 30.0)],
+        SETTINGS,
+        "fast",
+        runner=cmds.append,
+    )
+    assert speed > 0
+    assert [c[c.index("-t") + 1] for c in cmds] == ["2", "5"]
+    assert all("fast" in c for c in cmds)
+
+
+def test_measure_preset_repeats_samples_for_all_workers():
+    import threading
+    import time
+
+    running = {"now": 0, "max": 0}
+    lock = threading.Lock()
+    outputs = []
+
+    def runner(cmd):
+        with lock:
+            running["now"] += 1
+            running["max"] = max(running["max"], running["now"])
+            outputs.append(cmd[-1])
+        time.sleep(0.05)
+        with lock:
+            running["now"] -= 1
+
+    samples = [("i.png", "a.mp3", 60.0)] * tuner.MAX_SAMPLES
+    tuner.measure_preset(samples, SETTINGS, "fast", workers=5, runner=runner)
+    assert running["max"] == 5
+    assert len(set(outputs)) == 5
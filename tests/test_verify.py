@@ -0,0 +1,44 @@
+from pathlib import Path
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from api.verify import verify_output  # noqa: E402
+
+needs_ffprobe = pytest.mark.skipif(
+    not (shutil.which("ffmpeg") and shutil.which("ffprobe")),
+    reason="ffmpeg/ffprobe fehlt",
+)
+
+
+def test_missing_and_empty_output(tmp_path):
+    assert verify_output(tmp_path / "fehlt.mp4") == "Ausgabe fehlt"
+    empty = tmp_path / "leer.mp4"
+    empty.write_bytes(b"")
+    assert verify_output(empty) == "Ausgabe ist leer"
+
+
+def _make(path: Path, seconds: int, audio: bool = True) -> Path:
+    cmd = ["ffmpeg", "-y", "-v", "error"]
+    cmd += ["-f", "lavfi", "-i", f"color=c=blue:s=64x64:d={seconds}"]
+    if audio:
+        cmd += ["-f", "lavfi", "-i", f"sine=d={seconds}", "-c:a", "aac"]
+    subprocess.run(cmd + ["-c:v", "libx264", "-shortest", str(path)], check=True)
+    return path
+
+
+@needs_ffprobe
+def test_streams_and_duration(tmp_path):
+    good = _make(tmp_path / "gut.mp4", 3)
+    assert verify_output(good, 3.0) == ""
+    assert verify_output(good) == ""
+    assert verify_output(good, 10.0).startswith("Dauer 3.0s statt 10.0s")
+    silent = _make(tmp_path / "stumm.mp4", 2, audio=False)
+    assert verify_output(silent, 2.0) == "Keine Audiospur in der Ausgabe"
+    broken = tmp_path / "kaputt.mp4"
+    broken.write_bytes(b"kein mp4")
+    assert verify_output(broken).startswith("Ausgabe nicht lesbar")
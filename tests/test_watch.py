@@ -0,0 +1,145 @@
+from pathlib import Path
+import sys
+import threading
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from api.watch import FolderWatcher  # noqa: E402
+
+
+def _watcher(tmp_path, encode, workers=2):
+    inbox = tmp_path / "in"
+    inbox.mkdir()
+    return FolderWatcher(
+        inbox, tmp_path / "out", tmp_path / "used", encode, workers, settle=1.0
+    )
+
+
+def _idle(w):
+    for _ in range(100):
+        if not w._busy:
+            return
+        threading.Event().wait(0.02)
+
+
+def test_pairs_wait_until_files_are_stable(tmp_path):
+    done = []
+
+    def encode(img, aud, out):
+        out.write_text("video")
+        done.append(img.stem)
+
+    w = _watcher(tmp_path, encode)
+    (w.in_dir / "a.png").write_bytes(b"img")
+    (w.in_dir / "a.mp3").write_bytes(b"aud")
+    (w.in_dir / "b.png").write_bytes(b"nur Bild")
+    assert w.ready_pairs(now=0.0) == []  # erst gesehen
+    (w.in_dir / "a.mp3").write_bytes(b"audio, noch im Schreiben")
+    assert w.ready_pairs(now=5.0) == []  # Größe geändert
+    assert w.poll_once(now=10.0) == 1
+    _idle(w)
+    assert done == ["a"]
+    assert sorted(p.name for p in (tmp_path / "used").iterdir()) == ["a.mp3", "a.png"]
+    assert [p.name for p in w.in_dir.iterdir()] == ["b.png"]
+    assert len(list((tmp_path / "out").glob("a_*.mp4"))) == 1
+
+
+def test_failed_pair_is_not_retried_until_changed(tmp_path):
+    calls = []
+
+    def encode(img, aud, out):
+        calls.append(img.stem)
+        raise RuntimeError("kaputt")
+
+    w = _watcher(tmp_path, encode)
+    img, aud = w.in_dir / "x.jpg", w.in_dir / "x.wav"
+    img.write_bytes(b"1")
+    aud.write_bytes(b"2")
+    w.poll_once(now=0.0)
+    w.poll_once(now=2.0)
+    _idle(w)
+    w.poll_once(now=3.0)
+    w.poll_once(now=5.0)
+    assert calls == ["x"] and w.failed == 1
+    assert img.exists() and aud.exists()
+    aud.write_bytes(b"neu")
+    w.poll_once(now=6.0)
+    w.poll_once(now=8.0)
+    _idle(w)
+    assert calls == ["x", "x"]
+
+
+def test_worker_limit_and_run_stops(tmp_path):
+    release = threading.Event()
+    running, peak = [], []
+
+    def encode(img, aud, out):
+        running.append(img.stem)
+        peak.append(len(running))
+        release.wait(5)
+        running.remove(img.stem)
+
+    w = _watcher(tmp_path, encode, workers=1)
+    for stem in ("a", "b"):
+        (w.in_dir / f"{stem}.png").write_bytes(b"i")
+        (w.in_dir / f"{stem}.mp3").write_bytes(b"a")
+    w.poll_once(now=0.0)
+    assert w.poll_once(now=2.0) == 1  # nur ein Platz frei
+    assert w.poll_once(now=3.0) == 0
+    release.set()
+    w.settle = 0.0
+    stop = threading.Event()
+    t = threading.Thread(target=w.run, args=(stop, 0.05))
+    t.start()
+    for _ in range(100):
+        if w.done == 2:
+            break
+        threading.Event().wait(0.05)
+    stop.set()
+    t.join(5)
+    assert w.done == 2 and max(peak) == 1
+    assert list(w.in_dir.iterdir()) == []
+
+
+def test_interrupt_is_reported_before_jobs_drain(tmp_path):
+    release = threading.Event()
+    messages = []
+
+    def encode(img, aud, out):
+        release.wait(5)
+        messages.append("kodiert")
+
+    class Interrupt:
+        calls = 0
+
+        def is_set(self):
+            return False
+
+        def wait(self, timeout):
+            self.calls += 1
+            if self.calls == 2:  # zweite Abfrage hat das Paar gestartet
+                raise KeyboardInterrupt
+
+    w = _watcher(tmp_path, encode)
+    w.settle, w.log = 0.0, messages.append
+    (w.in_dir / "a.png").write_bytes(b"i")
+    (w.in_dir / "a.mp3").write_bytes(b"a")
+    errors = []
+
+    def run():
+        try:
+            w.run(Interrupt(), 0.0)
+        except KeyboardInterrupt:
+            errors.append("abbruch")
+
+    t = threading.Thread(target=run)
+    t.start()
+    for _ in range(100):
+        if any(m.startswith("Abbruch") for m in messages):
+            break
+        threading.Event().wait(0.02)
+    assert "Abbruch: 1 laufende Jobs werden noch beendet" in messages
+    assert "kodiert" not in messages
+    release.set()
+    t.join(5)
+    assert errors == ["abbruch"] and w.done == 1
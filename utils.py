@@ -3,10 +3,17 @@
 from __future__ import annotations
 
 from datetime import datetime
+import logging
 from pathlib import Path
 import re
 import shutil
-from typing import Tuple
+import threading
+from typing import Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".bmp", ".webp")
+AUDIO_EXTS = (".mp3", ".wav", ".flac", ".m4a", ".aac")
 
 
 def human_time(sec: int) -> str:
@@ -17,10 +24,79 @@ def human_time(sec: int) -> str:
     return f"{h:02d}:{m:02d}:{s:02d}" if h else f"{m:02d}:{s:02d}"
 
 
-def build_out_name(audio: Path | str, out_dir: Path) -> Path:
-    """Ausgabedatei aus Audiopfad und Zeitstempel ableiten."""
+def build_out_name(audio: Path | str, out_dir: Path, suffix: str = "") -> Path:
+    """Ausgabedatei aus Audiopfad und Zeitstempel ableiten.
+
+    ``suffix`` (z.B. ``"1280x720"``) unterscheidet mehrere Auflösungen.
+    """
     audio = Path(audio)
-    return out_dir / f"{audio.stem}_{datetime.now().strftime('%Y%m%d-%H%M%S')}.mp4"
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    tail = f"_{suffix}" if suffix else ""
+    return out_dir / f"{audio.stem}_{stamp}{tail}.mp4"
+
+
+class OutputNames:
+    """Eindeutige Ausgabenamen für parallel laufende Jobs vergeben.
+
+    :func:`build_out_name` hat nur Sekunden im Zeitstempel; zwei Audios mit
+    gleichem Namen aus verschiedenen Ordnern, die in derselben Sekunde
+    starten, bekämen dieselbe Datei (und ffmpeg ``-y`` überschreibt sie
+    stillschweigend). :meth:`reserve` merkt sich vergebene Namen und hängt
+    bei Bedarf ``-2``, ``-3`` … an.
+    """
+
+    def __init__(self) -> None:
+        """Leere Vergabeliste anlegen."""
+        self._lock = threading.Lock()
+        self._taken: Set[Path] = set()
+
+    def reserve(
+        self, audio: Path | str, out_dir: Path, suffixes: Iterable[str] = ()
+    ) -> List[Path]:
+        """Hauptausgabe und je ``suffix`` eine weitere Datei reservieren.
+
+        Alle Namen teilen Stamm und Zeitstempel. Ein Name gilt als belegt,
+        wenn er schon vergeben wurde oder die Datei bereits existiert.
+        """
+        base = build_out_name(audio, out_dir).stem
+        suffixes = list(suffixes)
+        with self._lock:
+            n = 1
+            while True:
+                stem = base if n == 1 else f"{base}-{n}"
+                paths = [out_dir / f"{stem}.mp4"]
+                paths += [out_dir / f"{stem}_{s}.mp4" for s in suffixes]
+                if not any(p in self._taken or p.exists() for p in paths):
+                    break
+                n += 1
+            self._taken.update(paths)
+        return paths
+
+
+def safe_move(src: Path, dst_dir: Path, copy_only: bool = False) -> Path:
+    """Move or copy a file into dst_dir and handle name clashes safely."""
+    try:
+        dst_dir.mkdir(parents=True, exist_ok=True)
+    except OSError as err:
+        raise RuntimeError(f"Zielordner konnte nicht erstellt werden: {err}") from err
+    tgt = dst_dir / src.name
+    if tgt.exists():
+        stem, suf = src.stem, src.suffix
+        tgt = dst_dir / f"{stem}_{datetime.now().strftime('%Y%m%d-%H%M%S')}{suf}"
+    try:
+        if copy_only:
+            shutil.copy2(src, tgt)
+        else:
+            shutil.move(src, tgt)
+    except Exception as e:
+        logger.debug("Verschieben fehlgeschlagen (%s), Kopie wird erstellt", e)
+        shutil.copy2(src, tgt)
+        if not copy_only:
+            try:
+                src.unlink()
+            except Exception as del_err:
+                logger.debug("Quelle konnte nicht gelöscht werden: %s", del_err)
+    return tgt
 
 
 def which(p: str) -> str | None:
@@ -46,6 +122,28 @@ def normalize_bitrate(text: str) -> str:
     return f"{value}{unit}"
 
 
+def parse_renditions(
+    text: str, max_size: Optional[Tuple[int, int]] = None
+) -> List[Tuple[int, int]]:
+    """Auflösungen wie ``"1280x720, 854x480"`` lesen (ungültige überspringen).
+
+    Mit ``max_size`` (Hauptauflösung) werden größere Auflösungen ebenfalls
+    übersprungen: Sie entstehen aus dem bereits verkleinerten Hauptbild und
+    wären nur hochskaliert. Doppelte Angaben zählen nur einmal.
+    """
+    sizes = []
+    for part in re.split(r"[,;\s]+", text.strip()):
+        m = re.fullmatch(r"(\d+)[xX×](\d+)", part)
+        if not m or int(m.group(1)) < 16 or int(m.group(2)) < 16:
+            continue
+        w, h = int(m.group(1)), int(m.group(2))
+        if max_size and (w > max_size[0] or h > max_size[1]):
+            continue
+        if (w, h) not in sizes:
+            sizes.append((w, h))
+    return sizes
+
+
 def validate_pair(image: Path | str, audio: Path | str | None) -> Tuple[bool, str]:
     """Bild und Audio auf Existenz und Format prüfen."""
     if not image or not audio:
@@ -55,18 +153,23 @@ def validate_pair(image: Path | str, audio: Path | str | None) -> Tuple[bool, st
         return False, f"Bild fehlt: {ip}"
     if not ap.exists():
         return False, f"Audio fehlt: {ap}"
-    if ip.suffix.lower() not in (".jpg", ".jpeg", ".png", ".bmp", ".webp"):
+    if ip.suffix.lower() not in IMAGE_EXTS:
         return False, "Ungültiges Bildformat"
-    if ap.suffix.lower() not in (".mp3", ".wav", ".flac", ".m4a", ".aac"):
+    if ap.suffix.lower() not in AUDIO_EXTS:
         return False, "Ungültiges Audioformat"
     return True, ""
 
 
 __all__ = [
+    "AUDIO_EXTS",
+    "IMAGE_EXTS",
     "human_time",
+    "OutputNames",
     "build_out_name",
     "which",
     "check_ffmpeg",
     "normalize_bitrate",
+    "parse_renditions",
+    "safe_move",
     "validate_pair",
 ]
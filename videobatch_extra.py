@@ -1,22 +1,104 @@
 # =========================================
 # QUICKSTART
 # CLI-Encode:  python3 videobatch_extra.py --img 1.jpg 2.jpg --aud 1.mp3 2.mp3 --out outdir
+# Parallel:    python3 videobatch_extra.py ... --jobs 8
+# Fortsetzen:  python3 videobatch_extra.py --resume --out outdir
+# Diashow:     python3 videobatch_extra.py --img 1.jpg 2.jpg 3.jpg --aud a.mp3 --slideshow
+# Ordner:      python3 videobatch_extra.py --watch eingang --out outdir --jobs 2
+# Zeitbudget:  python3 videobatch_extra.py --img a.png --aud a.mp3 --budget 30
+# Benchmark:   python3 videobatch_extra.py --bench bench.json
+# Vorschauen:  python3 videobatch_extra.py --bench-thumbs thumbs.json [--img a.jpg]
 # Selftests:   python3 videobatch_extra.py --selftest
 # Edit:        micro videobatch_extra.py
 # =========================================
 
 # videobatch_extra.py
 """Zusatzfunktionen und Selbsttests für die Videobearbeitung."""
+
 from __future__ import annotations
 
+import itertools
+import os
 import re
 import sys
 import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Tuple
+
+from utils import (
+    OutputNames,
+    build_out_name,
+    human_time,
+    parse_renditions,
+    validate_pair,
+)
+from api import (
+    FfmpegProgress,
+    ResourceGovernor,
+    prepare_encode_cmd,
+    remove_concat_list,
+    run_ffmpeg,
+)
+from api.accounting import ProcessStats, format_stats, sum_stats
+from api.cache import DEFAULT_MAX_BYTES, EncodeCache, cached_encode_key
+from api.probe import probe_duration
+from api.scheduler import POLICIES, order_jobs, predict_makespan
+from api.tuner import tune_preset
+from api.watch import POLL_SECONDS, SETTLE_SECONDS, FolderWatcher
+from config.paths import CLI_DB, USED_DIR
+from storage import (
+    JOB_DONE,
+    JOB_FAILED,
+    claim_job,
+    enqueue_jobs,
+    finish_job,
+    latest_batch,
+    resume_jobs,
+)
+
+# Warteschlangen der Kommandozeile heißen "cli-<PID>-<Zeit>-<Nr>"
+CLI_BATCH_PREFIX = "cli-"
+_RUN_IDS = itertools.count(1)
+
+
+def _cli_batch() -> str:
+    """Eigener Warteschlangenname für diesen Lauf."""
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return f"{CLI_BATCH_PREFIX}{os.getpid()}-{stamp}-{next(_RUN_IDS)}"
+
 
-from utils import build_out_name, human_time, validate_pair
-from api import build_ffmpeg_cmd, run_ffmpeg
+def _batch_alive(batch: str) -> bool:
+    """Ob der Prozess, dem die Warteschlange gehört, noch läuft (nur POSIX)."""
+    try:
+        pid = int(batch[len(CLI_BATCH_PREFIX) :].split("-", 1)[0])
+    except ValueError:
+        return False
+    if os.name != "posix" or pid == os.getpid():
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass
+    return True
+
+
+def _renditions(args) -> List[Tuple[int, int]]:
+    """Zusätzliche Auflösungen; größere als die Hauptausgabe entfallen."""
+    text = " ".join(args.renditions)
+    main_size = (args.width, args.height)
+    sizes = parse_renditions(text, main_size)
+    dropped = [s for s in parse_renditions(text) if s not in sizes]
+    if dropped:
+        print(
+            f"Hinweis: größer als {args.width}x{args.height}, übersprungen: "
+            + ", ".join(f"{w}x{h}" for w, h in dropped)
+        )
+    return sizes
 
 
 def cli_encode(
@@ -28,26 +110,289 @@ def cli_encode(
     crf: int = 23,
     preset: str = "ultrafast",
     abitrate: str = "192k",
+    jobs: int = 1,
+    still: bool = False,
+    loop: bool = False,
+    copy_audio: bool = False,
+    cache: Optional[EncodeCache] = None,
+    db_path: Optional[Path] = None,
+    resume: bool = False,
+    order: str = "table",
+    renditions: Optional[List[Tuple[int, int]]] = None,
+    affinity: bool = False,
 ) -> int:
     """Encode multiple image/audio pairs into videos (CLI helper).
 
+    Up to ``jobs`` pairs are encoded concurrently; completion lines are
+    printed as soon as a pair finishes, so their order may vary. With a
+    ``cache``, unchanged pairs are copied from earlier results instead of
+    being encoded again.
+
+    With ``db_path`` the pairs are kept in the persistent job queue and
+    claimed from there. Every run gets its own batch (``cli-<pid>-...``),
+    so concurrent runs on the same database do not replace each other's
+    queue. ``resume`` ignores ``images`` and ``audios`` and takes over the
+    unfinished jobs of the most recent batch instead, unless the process
+    that owns it is still running.
+    ``order`` selects the scheduling policy (``"table"``, ``"longest"`` or
+    ``"shortest"`` by probed audio duration). Each ``renditions`` size is
+    written as an extra ``_<height>p`` file by the same ffmpeg process.
+    Encoder threads are split across the ``jobs`` processes; ``affinity``
+    also pins each process to its share of the cores. CPU time, peak
+    memory and I/O of every ffmpeg run are stored with the job and summed
+    up in the final summary.
+
     Returns 0 on success, 1 if lists mismatch, or 2 when ffmpeg fails.
     """
     out_dir.mkdir(parents=True, exist_ok=True)
-    if len(images) != len(audios):
+    skipped = 0
+    batch = _cli_batch()
+    if resume:
+        if db_path is None:
+            print("Fehler: Fortsetzen braucht eine Job-Datenbank")
+            return 1
+        previous = latest_batch(db_path, CLI_BATCH_PREFIX)
+        if previous is None:
+            print("Nichts fortzusetzen: keine Warteschlange gefunden")
+            return 1
+        if _batch_alive(previous):
+            print(f"Fehler: Warteschlange {previous} wird noch bearbeitet")
+            return 1
+        queued = resume_jobs(db_path, previous, rename=batch)
+        images = [Path(j["image"]) for j in queued]
+        audios = [Path(j["audio"]) for j in queued]
+        skipped = sum(1 for j in queued if j["status"] == JOB_DONE)
+    elif len(images) != len(audios):
         print("Fehler: Anzahl Bilder != Anzahl Audios")
         return 1
     total = len(images)
-    done = 0
-    errors = 0
-    for i, (img, aud) in enumerate(zip(images, audios), 1):
+    rows = list(range(total))
+    if not resume and order != "table":
+        durations = [probe_duration(str(a)) for a in audios]
+        rows = order_jobs(durations, order)
+        print(
+            f"Reihenfolge: {POLICIES[order]}, geschätzte Dauer "
+            f"{human_time(predict_makespan(durations, rows, jobs))} bei Echtzeit"
+            f" (Tabelle: {human_time(predict_makespan(durations, range(total), jobs))})"
+        )
+    if not resume and db_path is not None:
+        enqueue_jobs(
+            [(str(i), str(a)) for i, a in zip(images, audios)],
+            db_path,
+            batch=batch,
+            order=rows,
+        )
+    governor = ResourceGovernor(max(1, min(jobs, total or 1)), affinity=affinity)
+    if governor.jobs > 1:
+        print(
+            f"{governor.jobs} Jobs auf {len(governor.cpus)} Kernen: "
+            f"{governor.threads} Threads je ffmpeg"
+            + (", feste Kerne" if governor.affinity else "")
+        )
+    settings = {
+        "width": width,
+        "height": height,
+        "crf": crf,
+        "preset": preset,
+        "abitrate": abitrate,
+        "still": still,
+        "loop": loop,
+        "audio_copy": copy_audio,
+    }
+    names = OutputNames()
+
+    def encode(img: Path, aud: Path, stats: ProcessStats) -> Tuple[bool, str, str]:
+        ok, msg = validate_pair(img, aud)
+        if not ok:
+            return False, f"{msg}: {img} / {aud}", ""
+        out_file, *extra = names.reserve(
+            aud, out_dir, [f"{w}x{h}" for w, h in renditions or []]
+        )
+        ladder = [(w, h, str(o)) for (w, h), o in zip(renditions or [], extra)]
+        key = None if ladder else cached_encode_key(cache, img, aud, settings)
+        if key and cache.fetch(key, out_file):
+            return True, f"Aus Cache: {out_file}", str(out_file)
+        try:
+            cmd = prepare_encode_cmd(
+                str(img),
+                str(aud),
+                str(out_file),
+                width,
+                height,
+                abitrate,
+                crf,
+                preset,
+                still=still,
+                loop=loop,
+                audio_passthrough=copy_audio,
+                ladder=ladder,
+            )
+            progress = FfmpegProgress()
+            run_ffmpeg(cmd, progress=progress, governor=governor, stats=stats)
+        except RuntimeError as e:
+            return False, f"FFmpeg-Fehler: {e}", ""
+        if key:
+            cache.store(key, out_file)
+        extra = f" + {len(ladder)} Auflösungen" if ladder else ""
+        msg = f"Fertig: {out_file}{extra} ({progress.speed:.1f}x)"
+        return True, msg, str(out_file)
+
+    lock = threading.Lock()
+    pending = list(rows)
+    counts = {"done": skipped, "errors": 0}
+    measured: List[ProcessStats] = []
+
+    def next_job() -> Optional[Tuple[int, Optional[int]]]:
+        if db_path is None:
+            with lock:
+                return (pending.pop(0), None) if pending else None
+        job = claim_job(db_path, batch=batch)
+        return (job["row"], job["id"]) if job else None
+
+    def drain() -> None:
+        while (nxt := next_job()) is not None:
+            i, job_id = nxt
+            stats = ProcessStats()
+            try:
+                ok, msg, out_file = encode(images[i], audios[i], stats)
+            except Exception as e:
+                # z.B. ffmpeg fehlt, Cache/Segment nicht schreibbar: nur
+                # dieser Job scheitert, der Stapel läuft weiter
+                ok, msg, out_file = False, f"Fehler: {e}", ""
+            ran = stats.wall > 0
+            if job_id is not None:
+                status = JOB_DONE if ok else JOB_FAILED
+                error = "" if ok else msg
+                usage = stats.as_dict() if ran else None
+                finish_job(job_id, status, db_path, out_file, error, usage)
+            with lock:
+                print(f"[{i + 1}/{total}] {msg}")
+                counts["done" if ok else "errors"] += 1
+                if ran:
+                    measured.append(stats)
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        for fut in [pool.submit(drain) for _ in range(max(1, jobs))]:
+            fut.result()
+    print(f"Fertig: {counts['done']}/{total}, Fehler: {counts['errors']}")
+    if measured:
+        print(f"Verbrauch ({len(measured)} Jobs): {format_stats(sum_stats(measured))}")
+    return 0 if counts["errors"] == 0 else 2
+
+
+def cli_slideshow(
+    images: List[Path],
+    audio: Path,
+    out_dir: Path,
+    width: int = 1920,
+    height: int = 1080,
+    crf: int = 23,
+    preset: str = "ultrafast",
+    abitrate: str = "192k",
+    still: bool = False,
+    copy_audio: bool = False,
+    durations: Optional[List[float]] = None,
+    renditions: Optional[List[Tuple[int, int]]] = None,
+) -> int:
+    """Encode all ``images`` as one slideshow over ``audio``.
+
+    ``durations`` gives the display time per image; without it the audio
+    length is spread evenly. Returns 0 on success, 1 on invalid input or
+    2 when ffmpeg fails.
+    """
+    for img in images:
+        ok, msg = validate_pair(img, audio)
+        if not ok:
+            print(f"Fehler: {msg}")
+            return 1
+    out_dir.mkdir(parents=True, exist_ok=True)
+    out_file, *extra = OutputNames().reserve(
+        audio, out_dir, [f"{w}x{h}" for w, h in renditions or []]
+    )
+    ladder = [(w, h, str(o)) for (w, h), o in zip(renditions or [], extra)]
+    cmd: List[str] = []
+    try:
+        cmd = prepare_encode_cmd(
+            str(images[0]),
+            str(audio),
+            str(out_file),
+            width,
+            height,
+            abitrate,
+            crf,
+            preset,
+            still=still,
+            audio_passthrough=copy_audio,
+            slides=[str(i) for i in images[1:]],
+            durations=durations,
+            ladder=ladder,
+        )
+        progress = FfmpegProgress()
+        run_ffmpeg(cmd, progress=progress)
+    except ValueError as e:
+        print(f"Fehler: {e}")
+        return 1
+    except RuntimeError as e:
+        print(f"FFmpeg-Fehler: {e}")
+        return 2
+    finally:
+        remove_concat_list(cmd)
+    print(f"Fertig: {out_file} ({len(images)} Bilder, {progress.speed:.1f}x)")
+    return 0
+
+
+def cli_watch(
+    in_dir: Path,
+    out_dir: Path,
+    archive_dir: Path = USED_DIR,
+    width: int = 1920,
+    height: int = 1080,
+    crf: int = 23,
+    preset: str = "ultrafast",
+    abitrate: str = "192k",
+    jobs: int = 2,
+    still: bool = False,
+    loop: bool = False,
+    copy_audio: bool = False,
+    cache: Optional[EncodeCache] = None,
+    interval: float = POLL_SECONDS,
+    settle: float = SETTLE_SECONDS,
+    affinity: bool = False,
+    stop: Optional[threading.Event] = None,
+) -> int:
+    """Watch ``in_dir`` and encode image/audio pairs as they arrive.
+
+    Files are paired by name without extension and only picked up once
+    neither has changed for ``settle`` seconds. At most ``jobs`` pairs are
+    encoded at once; finished inputs are moved to ``archive_dir``. Runs
+    until interrupted (Ctrl+C) or ``stop`` is set.
+
+    Returns 0 if every pair succeeded, 1 if ``in_dir`` is missing, or 2
+    when at least one encode failed.
+    """
+    if not in_dir.is_dir():
+        print(f"Fehler: Ordner nicht gefunden: {in_dir}")
+        return 1
+    governor = ResourceGovernor(max(1, jobs), affinity=affinity)
+    settings = {
+        "width": width,
+        "height": height,
+        "crf": crf,
+        "preset": preset,
+        "abitrate": abitrate,
+        "still": still,
+        "loop": loop,
+        "audio_copy": copy_audio,
+    }
+
+    def encode(img: Path, aud: Path, out_file: Path) -> None:
         ok, msg = validate_pair(img, aud)
         if not ok:
-            print(f"[{i}/{total}] {msg}: {img} / {aud}")
-            errors += 1
-            continue
-        out_file = build_out_name(aud, out_dir)
-        cmd = build_ffmpeg_cmd(
+            raise RuntimeError(msg)
+        key = cached_encode_key(cache, img, aud, settings)
+        if key and cache.fetch(key, out_file):
+            return
+        cmd = prepare_encode_cmd(
             str(img),
             str(aud),
             str(out_file),
@@ -56,15 +401,24 @@ def cli_encode(
             abitrate,
             crf,
             preset,
+            still=still,
+            loop=loop,
+            audio_passthrough=copy_audio,
         )
-        try:
-            run_ffmpeg(cmd)
-            done += 1
-        except RuntimeError as e:
-            print(f"FFmpeg-Fehler: {e}")
-            errors += 1
-    print(f"Fertig: {done}/{total}")
-    return 0 if errors == 0 else 2
+        run_ffmpeg(cmd, progress=FfmpegProgress(), governor=governor)
+        if key:
+            cache.store(key, out_file)
+
+    watcher = FolderWatcher(
+        in_dir, out_dir, archive_dir, encode, jobs, settle, log=print
+    )
+    stop = stop if stop is not None else threading.Event()
+    try:
+        watcher.run(stop, interval)
+    except KeyboardInterrupt:
+        # Die Meldung kam schon aus watcher.run, bevor es gewartet hat
+        stop.set()
+    return 0 if watcher.failed == 0 else 2
 
 
 def run_selftests() -> int:
@@ -78,6 +432,68 @@ def run_selftests() -> int:
     return 0
 
 
+def run_bench(report: Path, seconds: int = 30) -> int:
+    """Run the encoding benchmark and write the report."""
+    from api.bench import run_benchmark, write_report
+
+    try:
+        rows = run_benchmark(seconds)
+    except RuntimeError as e:
+        print(f"Benchmark fehlgeschlagen: {e}")
+        return 2
+    for r in rows:
+        print(
+            f"{r['mode']:>6} {r['preset']:>9} {r['width']}x{r['height']}: "
+            f"{r['realtime_factor']:.1f}x Echtzeit, {r['wall_seconds']:.1f}s, "
+            f"CPU {r['cpu_seconds']:.1f}s, {r['output_bytes'] // 1024} KiB"
+        )
+    write_report(rows, report)
+    print(f"Bericht: {report}")
+    return 0
+
+
+def run_thumb_bench(report: Path, images: Optional[List[Path]] = None) -> int:
+    """Compare thumbnail decode paths and write the report."""
+    from api.bench import THUMB_FIELDS, run_thumb_benchmark, write_report
+
+    try:
+        rows = run_thumb_benchmark(images)
+    except (OSError, RuntimeError) as e:
+        print(f"Benchmark fehlgeschlagen: {e}")
+        return 2
+    for r in rows:
+        print(
+            f"{r['images']:>13} {r['decoder']:>8}: {r['ms_per_file']:.1f} ms/Bild, "
+            f"+{r['extra_rss_kb'] // 1024} MiB Spitze"
+        )
+    write_report(rows, report, THUMB_FIELDS)
+    print(f"Bericht: {report}")
+    return 0
+
+
+def tune_for_budget(images: List[Path], audios: List[Path], args) -> str:
+    """Pick the slowest preset that finishes the batch within ``args.budget``."""
+    pairs = [(str(i), str(a), probe_duration(a)) for i, a in zip(images, audios)]
+    pairs = [p for p in pairs if p[2] > 0]
+    if not pairs:
+        print("Audiodauer unbekannt, Preset bleibt unverändert")
+        return args.preset
+    settings = {
+        "width": args.width,
+        "height": args.height,
+        "abitrate": args.abitrate,
+        "crf": args.crf,
+        "still": args.still,
+        "jobs": args.jobs,
+        "order": args.order,
+    }
+    preset, estimates = tune_preset(
+        pairs, [d for _, _, d in pairs], settings, args.budget * 60, log=print
+    )
+    print(f"Preset {preset} gewählt (geschätzt {human_time(int(estimates[preset]))})")
+    return preset
+
+
 def main() -> None:
     """Command line interface entry point."""
     import argparse
@@ -92,14 +508,195 @@ def main() -> None:
     p.add_argument("--crf", type=int, default=23)
     p.add_argument("--preset", default="ultrafast")
     p.add_argument("--abitrate", default="192k")
+    p.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Anzahl gleichzeitiger ffmpeg-Prozesse (Standard: CPU-Kerne)",
+    )
+    p.add_argument(
+        "--still",
+        action="store_true",
+        help="Standbild-Modus: niedrige Bildrate, deutlich schneller",
+    )
+    p.add_argument(
+        "--loop",
+        action="store_true",
+        help="Bild einmal kodieren und bis zur Audiolänge kopieren (lange Audios)",
+    )
+    p.add_argument(
+        "--copy-audio",
+        action="store_true",
+        help="AAC-Audio bis zur Ziel-Bitrate unverändert übernehmen",
+    )
+    p.add_argument(
+        "--cache",
+        action="store_true",
+        help="Ergebnis-Cache verwenden (liest jede Eingabe einmal für die"
+        " Prüfsumme; Größe siehe --cache-max-gb)",
+    )
+    p.add_argument(
+        "--cache-max-gb",
+        type=float,
+        default=DEFAULT_MAX_BYTES / 1024**3,
+        help="Maximale Größe des Ergebnis-Caches in GB (Standard: %(default)g);"
+        " älteste Einträge werden gelöscht",
+    )
+    p.add_argument(
+        "--db",
+        default=str(CLI_DB),
+        help="SQLite-Datei der Job-Warteschlange (Standard: eigene Datei der"
+        " Kommandozeile, getrennt vom Projekt der Oberfläche)",
+    )
+    p.add_argument(
+        "--resume",
+        action="store_true",
+        help="Unfertige Jobs des letzten Laufs fortsetzen",
+    )
+    p.add_argument(
+        "--order",
+        choices=list(POLICIES),
+        default="table",
+        help="Reihenfolge der Jobs (longest = längste Audios zuerst)",
+    )
+    p.add_argument(
+        "--pin-cpus",
+        action="store_true",
+        help="Jeden parallelen Job an eigene CPU-Kerne binden",
+    )
+    p.add_argument(
+        "--renditions",
+        nargs="+",
+        default=[],
+        metavar="BxH",
+        help="Weitere, kleinere Auflösungen im selben Lauf, z.B. 1280x720 854x480",
+    )
+    p.add_argument(
+        "--slideshow",
+        action="store_true",
+        help="Alle Bilder nacheinander als ein Video zur ersten Audiodatei kodieren",
+    )
+    p.add_argument(
+        "--slide-durations",
+        type=float,
+        nargs="+",
+        metavar="SEK",
+        help="Standzeit je Bild für --slideshow (Standard: Audiolänge gleichmäßig verteilt)",
+    )
+    p.add_argument(
+        "--watch",
+        metavar="ORDNER",
+        help="ORDNER dauerhaft überwachen und neue Paare sofort kodieren",
+    )
+    p.add_argument(
+        "--watch-interval",
+        type=float,
+        default=POLL_SECONDS,
+        metavar="SEK",
+        help="Abfrageintervall für --watch",
+    )
+    p.add_argument(
+        "--watch-settle",
+        type=float,
+        default=SETTLE_SECONDS,
+        metavar="SEK",
+        help="So lange müssen Dateien unverändert sein, bevor --watch sie kodiert",
+    )
+    p.add_argument(
+        "--archive",
+        default=str(USED_DIR),
+        help="Zielordner für fertig kodierte Eingaben bei --watch",
+    )
+    p.add_argument(
+        "--budget",
+        type=float,
+        metavar="MINUTEN",
+        help="Preset per Probekodierung so wählen, dass der Stapel in MINUTEN fertig ist",
+    )
+    p.add_argument(
+        "--bench",
+        nargs="?",
+        const="bench.json",
+        metavar="BERICHT",
+        help="Kodiertempo mit Testdateien messen (Bericht als .json oder .csv)",
+    )
+    p.add_argument(
+        "--bench-seconds",
+        type=int,
+        default=30,
+        help="Länge des Testaudios für --bench in Sekunden",
+    )
+    p.add_argument(
+        "--bench-thumbs",
+        nargs="?",
+        const="bench_thumbs.json",
+        metavar="BERICHT",
+        help="Dekodierwege für Vorschaubilder vergleichen (eigene Bilder per --img)",
+    )
     args = p.parse_args()
 
     if args.selftest:
         sys.exit(run_selftests())
-    if args.img and args.aud:
-        images = [Path(p) for p in args.img]
-        audios = [Path(p) for p in args.aud]
+    if args.bench:
+        sys.exit(run_bench(Path(args.bench), args.bench_seconds))
+    if args.bench_thumbs:
+        images = [Path(p) for p in args.img] if args.img else None
+        sys.exit(run_thumb_bench(Path(args.bench_thumbs), images))
+    if args.watch:
+        sys.exit(
+            cli_watch(
+                Path(args.watch),
+                Path(args.out),
+                Path(args.archive),
+                args.width,
+                args.height,
+                args.crf,
+                args.preset,
+                args.abitrate,
+                args.jobs,
+                args.still,
+                args.loop,
+                args.copy_audio,
+                (
+                    EncodeCache(max_bytes=int(args.cache_max_gb * 1024**3))
+                    if args.cache
+                    else None
+                ),
+                args.watch_interval,
+                args.watch_settle,
+                args.pin_cpus,
+            )
+        )
+    if args.slideshow and args.img and args.aud:
+        sys.exit(
+            cli_slideshow(
+                [Path(i) for i in args.img],
+                Path(args.aud[0]),
+                Path(args.out),
+                args.width,
+                args.height,
+                args.crf,
+                args.preset,
+                args.abitrate,
+                args.still,
+                args.copy_audio,
+                args.slide_durations,
+                _renditions(args),
+            )
+        )
+    if args.resume or (args.img and args.aud):
+        images = [Path(p) for p in args.img or []]
+        audios = [Path(p) for p in args.aud or []]
         out_dir = Path(args.out)
+        db_path = Path(args.db)
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        if args.budget and images:
+            args.preset = tune_for_budget(images, audios, args)
+        cache = (
+            EncodeCache(max_bytes=int(args.cache_max_gb * 1024**3))
+            if args.cache
+            else None
+        )
         sys.exit(
             cli_encode(
                 images,
@@ -110,6 +707,16 @@ def main() -> None:
                 args.crf,
                 args.preset,
                 args.abitrate,
+                args.jobs,
+                args.still,
+                args.loop,
+                args.copy_audio,
+                cache,
+                db_path,
+                args.resume,
+                args.order,
+                _renditions(args),
+                args.pin_cpus,
             )
         )
     print("GUI starten: python3 videobatch_launcher.py")
@@ -9,24 +9,46 @@
 
 from __future__ import annotations
 import logging
-import shutil
+import queue
 import subprocess
 import sys
-from datetime import datetime
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from utils import (
-    build_out_name,
+    OutputNames,
     human_time,
     check_ffmpeg,
     normalize_bitrate,
+    parse_renditions,
+    safe_move,
     validate_pair,
 )
 
-from api import build_ffmpeg_cmd, start_ffmpeg
+from api import (
+    FfmpegProgress,
+    ResourceGovernor,
+    prepare_encode_cmd,
+    remove_concat_list,
+    start_ffmpeg,
+)
+from api.accounting import ProcessStats, format_stats, sum_stats, wait_with_stats
+from api.cache import (
+    DEFAULT_MAX_BYTES,
+    ENCODE_CACHE_DIR,
+    EncodeCache,
+    cached_encode_key,
+)
+from api.mediainfo import MediaInfoCache
+from api.thumbs import ThumbCache, make_thumbnail
+from api.probe import probe_duration
+from api.scheduler import POLICIES, order_jobs, predict_makespan
+from api.tuner import tune_preset
+from api.verify import verify_output
 from logging_config import setup_logging
 
 from PySide6 import QtCore, QtGui, QtWidgets
@@ -38,13 +60,25 @@ import os
 
 from config.paths import (
     LOG_FILE,
+    MEDIA_DB,
     NOTES_FILE,
     PROJECT_DB,
     DEFAULT_OUT_DIR,
     USED_DIR,
     ensure_directories,
 )
-from storage import save_project, load_project, close as close_storage
+from storage import (
+    JOB_DONE,
+    JOB_FAILED,
+    JOB_PENDING,
+    claim_job,
+    enqueue_jobs,
+    finish_job,
+    resume_jobs,
+    save_project,
+    load_project,
+    close as close_storage,
+)
 from help.tooltips import (
     TIP_ADD_IMAGES,
     TIP_ADD_AUDIOS,
@@ -56,6 +90,8 @@ from help.tooltips import (
     TIP_SHOW_PATH,
     TIP_UNDO,
     TIP_STOP,
+    TIP_RESUME,
+    TIP_SLIDESHOW,
 )
 
 # ---------- Logging & Persistenz ----------
@@ -65,69 +101,44 @@ logger.addHandler(logging.NullHandler())
 
 
 # ---------- Helpers ----------
-def probe_duration(path: str) -> float:
-    """Return audio duration in seconds using ffmpeg (falls back to 0)."""
-    try:
-        import ffmpeg
-
-        pr = ffmpeg.probe(path)
-        fmt = pr.get("format", {})
-        if "duration" in fmt:
-            return float(fmt["duration"])
-        for st in pr.get("streams", []):
-            if st.get("codec_type") == "audio":
-                return float(st.get("duration", 0) or 0)
-    except Exception as e:
-        logger.debug("Dauer konnte nicht ermittelt werden: %s", e)
-    return 0.0
+THUMB_SIZE = (160, 90)
 
 
-def safe_move(src: Path, dst_dir: Path, copy_only: bool = False) -> Path:
-    """Move or copy a file into dst_dir and handle name clashes safely."""
-    try:
-        dst_dir.mkdir(parents=True, exist_ok=True)
-    except OSError as err:
-        raise RuntimeError(f"Zielordner konnte nicht erstellt werden: {err}") from err
-    tgt = dst_dir / src.name
-    if tgt.exists():
-        stem, suf = src.stem, src.suffix
-        tgt = dst_dir / f"{stem}_{datetime.now().strftime('%Y%m%d-%H%M%S')}{suf}"
+def thumb_image(
+    path: str, size: Tuple[int, int] = THUMB_SIZE, cache: Optional[ThumbCache] = None
+) -> QtGui.QImage:
+    """Decode a thumbnail as QImage (usable off the GUI thread, gray on error).
+
+    With ``cache`` the thumbnail is read from / stored in the disk cache.
+    """
     try:
-        if copy_only:
-            shutil.copy2(src, tgt)
-        else:
-            shutil.move(src, tgt)
+        img = cache.thumbnail(path, size) if cache else make_thumbnail(path, size)
+        data = img.tobytes("raw", "RGBA")
+        # copy(): das QImage darf nicht auf den Python-Puffer verweisen
+        return QtGui.QImage(
+            data, img.size[0], img.size[1], QtGui.QImage.Format_RGBA8888
+        ).copy()
     except Exception as e:
-        logger.debug("Verschieben fehlgeschlagen (%s), Kopie wird erstellt", e)
-        shutil.copy2(src, tgt)
-        if not copy_only:
-            try:
-                src.unlink()
-            except Exception as del_err:
-                logger.debug("Quelle konnte nicht gelöscht werden: %s", del_err)
-    return tgt
+        logger.debug("Thumbnail-Erstellung fehlgeschlagen: %s", e)
+        qimg = QtGui.QImage(size[0], size[1], QtGui.QImage.Format_RGBA8888)
+        qimg.fill(QtGui.QColor(Qt.gray))
+        return qimg
 
 
 @lru_cache(maxsize=128)
-def make_thumb(path: str, size: Tuple[int, int] = (160, 90)) -> QtGui.QPixmap:
+def make_thumb(path: str, size: Tuple[int, int] = THUMB_SIZE) -> QtGui.QPixmap:
     """Create a thumbnail pixmap for the GUI (returns gray on error)."""
-    try:
-        from PIL import Image
-
-        with Image.open(path) as img:
-            img.thumbnail(size)
-            if img.mode != "RGBA":
-                img = img.convert("RGBA")
-            data = img.tobytes("raw", "RGBA")
-        qimg = QtGui.QImage(
-            data, img.size[0], img.size[1], QtGui.QImage.Format_RGBA8888
-        )
-        return QtGui.QPixmap.fromImage(qimg)
-    except Exception as e:
-        logger.debug("Thumbnail-Erstellung fehlgeschlagen: %s", e)
-        pix = QtGui.QPixmap(size[0], size[1])
-        pix.fill(Qt.gray)
-        return pix
+    return QtGui.QPixmap.fromImage(thumb_image(path, size))
+
+
+# Gleichzeitige ffprobe-Prüfungen fertiger Ausgaben
+VERIFY_WORKERS = 2
+# Gleichzeitige ffprobe-Aufrufe für Audiodauern beim Hinzufügen
+PROBE_WORKERS = 4
+# Threads zum Dekodieren der Vorschaubilder
+THUMB_WORKERS = 2
+# Zeilen ober- und unterhalb des sichtbaren Bereichs, deren Bilder bleiben
+THUMB_MARGIN = 20
 
 
 # ---------- Datenmodell ----------
@@ -147,6 +158,9 @@ class PairItem:
     thumb: Optional[QtGui.QPixmap] = field(default=None, repr=False)
     valid: bool = True
     validation_msg: str = ""
+    slides: List[str] = field(default_factory=list)
+    slide_times: List[float] = field(default_factory=list)
+    stats: Optional[ProcessStats] = field(default=None, repr=False)
 
     def update_duration(self) -> None:
         """Ermittle Audiodauer neu."""
@@ -161,6 +175,10 @@ class PairItem:
     def validate(self) -> None:
         """Pfadpaar prüfen und Status setzen."""
         ok, msg = validate_pair(self.image_path, self.audio_path)
+        for img in self.slides:
+            if not ok:
+                break
+            ok, msg = validate_pair(img, self.audio_path)
         self.valid = ok
         self.validation_msg = msg
 
@@ -173,6 +191,8 @@ class PairTableModel(QAbstractTableModel):
         super().__init__()
         self.pairs = pairs
         self.show_thumbs = show_thumbs
+        # Ohne Loader werden Vorschaubilder direkt im GUI-Thread erzeugt
+        self.thumb_loader: Optional["ThumbLoader"] = None
 
     def rowCount(self, parent=QModelIndex()):
         """Anzahl der Zeilen liefern."""
@@ -198,7 +218,8 @@ class PairTableModel(QAbstractTableModel):
             if col == 0:
                 return str(idx.row() + 1)
             if col == 2:
-                return Path(item.image_path).name
+                name = Path(item.image_path).name
+                return f"{name} (+{len(item.slides)})" if item.slides else name
             if col == 3:
                 return Path(item.audio_path).name if item.audio_path else "—"
             if col == 4:
@@ -210,12 +231,15 @@ class PairTableModel(QAbstractTableModel):
             if col == 7:
                 return item.status
         if role == Qt.DecorationRole and col == 1 and self.show_thumbs:
+            if item.thumb is None and self.thumb_loader is not None:
+                self.thumb_loader.request(item)
+                return self.thumb_loader.placeholder()
             item.load_thumb()
             return item.thumb
         if role == Qt.ToolTipRole:
             if col in (2, 3, 5):
                 return {
-                    2: item.image_path,
+                    2: "\n".join([item.image_path, *item.slides]),
                     3: item.audio_path or "",
                     5: item.output or "",
                 }[col]
@@ -262,6 +286,13 @@ class PairTableModel(QAbstractTableModel):
         self.pairs.extend(new_pairs)
         self.endInsertRows()
 
+    def remove_rows(self, rows: List[int]):
+        """Zeilen entfernen (von unten nach oben)."""
+        for r in sorted(set(rows), reverse=True):
+            self.beginRemoveRows(QModelIndex(), r, r)
+            del self.pairs[r]
+            self.endRemoveRows()
+
     def clear(self):
         """Alle Einträge entfernen."""
         self.beginResetModel()
@@ -269,6 +300,294 @@ class PairTableModel(QAbstractTableModel):
         self.endResetModel()
 
 
+class ProgressAggregator(QtCore.QObject):
+    """Fortschrittsmeldungen sammeln und gebündelt an die Tabelle geben.
+
+    Pro Zeile zählt nur der letzte Wert; im festen Takt (``interval_ms``)
+    werden alle geänderten Zeilen mit einem einzigen ``dataChanged`` über
+    den betroffenen Bereich der Spalte "Fortschritt" gemeldet.
+    """
+
+    overall_changed = Signal(float)
+
+    def __init__(self, model: PairTableModel, interval_ms: int = 100):
+        """Sammler für ``model`` anlegen."""
+        super().__init__()
+        self.model = model
+        self._rows: Dict[int, float] = {}
+        self._overall: Optional[float] = None
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.flush)
+
+    @QtCore.Slot(int, float)
+    def row_progress(self, row: int, perc: float) -> None:
+        """Fortschritt einer Zeile vormerken."""
+        self._rows[row] = perc
+
+    @QtCore.Slot(float)
+    def overall_progress(self, perc: float) -> None:
+        """Gesamtfortschritt vormerken."""
+        self._overall = perc
+
+    def start(self) -> None:
+        """Regelmäßiges Übertragen beginnen."""
+        self._timer.start()
+
+    def stop(self) -> None:
+        """Takt anhalten und ausstehende Werte sofort übertragen."""
+        self._timer.stop()
+        self.flush()
+
+    def flush(self) -> None:
+        """Gesammelte Werte in das Modell schreiben."""
+        rows, self._rows = self._rows, {}
+        rows = {r: p for r, p in rows.items() if 0 <= r < len(self.model.pairs)}
+        if rows:
+            for row, perc in rows.items():
+                self.model.pairs[row].progress = perc
+            self.model.dataChanged.emit(
+                self.model.index(min(rows), 6), self.model.index(max(rows), 6)
+            )
+        if self._overall is not None:
+            overall, self._overall = self._overall, None
+            self.overall_changed.emit(overall)
+
+
+class ProbeService(QtCore.QObject):
+    """Audiodauern im Hintergrund ermitteln und gebündelt eintragen.
+
+    :meth:`request` kehrt sofort zurück; bis das Ergebnis da ist, zeigt die
+    Tabelle "?" als Dauer. ffprobe läuft in einem Thread-Pool, die
+    Ergebnisse sammelt ein Takt im GUI-Thread und meldet sie mit einem
+    ``dataChanged`` über die Spalte "Dauer". Die Ergebnisse hängen am
+    Paar, nicht an der Zeile, damit Löschen oder Umsortieren während des
+    Prüfens nichts durcheinanderbringt.
+    """
+
+    def __init__(
+        self,
+        model: PairTableModel,
+        workers: int = PROBE_WORKERS,
+        interval_ms: int = 100,
+        cache: Optional[MediaInfoCache] = None,
+    ):
+        """Dienst für ``model`` mit ``workers`` parallelen ffprobe-Aufrufen.
+
+        Mit ``cache`` werden unveränderte Dateien ohne ffprobe beantwortet.
+        """
+        super().__init__()
+        self.model = model
+        self.cache = cache
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(1, workers), thread_name_prefix="probe"
+        )
+        self._lock = threading.Lock()
+        self._pending: Dict[int, Tuple[str, Future]] = {}
+        self._results: List[Tuple[PairItem, str, float]] = []
+        self._closed = False
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.flush)
+
+    @property
+    def busy(self) -> int:
+        """Anzahl noch offener Abfragen."""
+        with self._lock:
+            return len(self._pending)
+
+    def request(self, items: Iterable[PairItem]) -> None:
+        """Dauer der Paare im Hintergrund neu bestimmen lassen."""
+        for item in items:
+            if not item.audio_path or self._closed:
+                continue
+            item.duration = 0.0
+            with self._lock:
+                self._pending[id(item)] = (
+                    item.audio_path,
+                    self._pool.submit(self._probe, item, item.audio_path),
+                )
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def _probe(self, item: PairItem, path: str) -> None:
+        # Jede Anfrage muss ein Ergebnis liefern, sonst bleibt sie offen
+        try:
+            if self.cache:
+                duration = self.cache.duration(path)
+            else:
+                duration = probe_duration(path)
+        except Exception as exc:
+            logger.error("Dauer nicht ermittelt (%s): %s", path, exc)
+            duration = 0.0
+        with self._lock:
+            self._results.append((item, path, duration))
+
+    def flush(self) -> None:
+        """Vorliegende Ergebnisse in das Modell schreiben."""
+        with self._lock:
+            results, self._results = self._results, []
+            for item, path, _ in results:
+                if self._pending.get(id(item), ("",))[0] == path:
+                    del self._pending[id(item)]
+            idle = not self._pending
+        if idle:
+            self._timer.stop()
+        changed = set()
+        for item, path, duration in results:
+            # Audio inzwischen ausgetauscht: neue Abfrage läuft bereits
+            if item.audio_path == path:
+                item.duration = duration
+                changed.add(id(item))
+        rows = [r for r, p in enumerate(self.model.pairs) if id(p) in changed]
+        if rows:
+            self.model.dataChanged.emit(
+                self.model.index(min(rows), 4), self.model.index(max(rows), 4)
+            )
+
+    def wait(self) -> None:
+        """Blockierend auf alle offenen Abfragen warten und eintragen."""
+        with self._lock:
+            futures = [f for _, f in self._pending.values()]
+        for fut in futures:
+            fut.exception()
+        self.flush()
+
+    def shutdown(self) -> None:
+        """Offene Abfragen verwerfen und den Pool beenden."""
+        self._closed = True
+        self._timer.stop()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+class ThumbLoader(QtCore.QObject):
+    """Vorschaubilder im Hintergrund dekodieren.
+
+    Das Modell fordert Bilder nur für angezeigte Zeilen an und erhält bis
+    dahin einen Platzhalter. Die Worker liefern ``QImage`` (``QPixmap`` ist
+    nur im GUI-Thread erlaubt); ein Takt im GUI-Thread wandelt sie um und
+    meldet die fertigen Zeilen gebündelt per ``dataChanged``. Mit :meth:`retain`
+    werden Anfragen für Zeilen verworfen, die nicht mehr sichtbar sind.
+    """
+
+    def __init__(
+        self,
+        model: PairTableModel,
+        workers: int = THUMB_WORKERS,
+        interval_ms: int = 50,
+        size: Tuple[int, int] = THUMB_SIZE,
+        cache: Optional[ThumbCache] = None,
+    ):
+        """Loader für ``model`` mit ``workers`` Dekodier-Threads.
+
+        Mit ``cache`` überleben die Vorschaubilder einen Neustart.
+        """
+        super().__init__()
+        self.model = model
+        self.size = size
+        self.cache = cache
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(1, workers), thread_name_prefix="thumb"
+        )
+        self._lock = threading.Lock()
+        self._pending: Dict[int, Tuple[str, Future]] = {}
+        self._results: List[Tuple[PairItem, str, QtGui.QImage]] = []
+        self._placeholder: Optional[QtGui.QPixmap] = None
+        self._closed = False
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.flush)
+
+    @property
+    def busy(self) -> int:
+        """Anzahl angeforderter, noch nicht eingetragener Bilder."""
+        with self._lock:
+            return len(self._pending)
+
+    def placeholder(self) -> QtGui.QPixmap:
+        """Graue Fläche, bis das Vorschaubild fertig ist."""
+        if self._placeholder is None:
+            self._placeholder = QtGui.QPixmap(*self.size)
+            self._placeholder.fill(Qt.gray)
+        return self._placeholder
+
+    def request(self, item: PairItem) -> None:
+        """Vorschaubild für ``item`` anfordern (doppelte Anfragen zählen einmal)."""
+        path = item.image_path
+        if not path or self._closed:
+            return
+        with self._lock:
+            if self._pending.get(id(item), ("",))[0] == path:
+                return
+            self._pending[id(item)] = (
+                path,
+                self._pool.submit(self._decode, item, path),
+            )
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def _decode(self, item: PairItem, path: str) -> None:
+        img = thumb_image(path, self.size, self.cache)
+        with self._lock:
+            self._results.append((item, path, img))
+
+    def retain(self, items: Iterable[PairItem]) -> int:
+        """Nur Anfragen für ``items`` behalten; liefert die Zahl verworfener."""
+        keep = {id(i) for i in items}
+        dropped = 0
+        with self._lock:
+            for key, (_, fut) in list(self._pending.items()):
+                # Bereits laufende Dekodierungen werden fertig eingetragen
+                if key not in keep and fut.cancel():
+                    del self._pending[key]
+                    dropped += 1
+        return dropped
+
+    def cancel(self) -> None:
+        """Alle offenen Anfragen verwerfen."""
+        self.retain(())
+
+    def flush(self) -> None:
+        """Fertige Bilder eintragen und ihre Zeilen neu zeichnen lassen."""
+        with self._lock:
+            results, self._results = self._results, []
+            for item, path, _ in results:
+                if self._pending.get(id(item), ("",))[0] == path:
+                    del self._pending[id(item)]
+            idle = not self._pending
+        if idle:
+            self._timer.stop()
+        done = set()
+        for item, path, img in results:
+            # Bild inzwischen ausgetauscht: neue Anfrage folgt beim Zeichnen
+            if item.image_path == path and self.model.show_thumbs:
+                item.thumb = QtGui.QPixmap.fromImage(img)
+                done.add(id(item))
+        rows = [r for r, p in enumerate(self.model.pairs) if id(p) in done]
+        if rows:
+            self.model.dataChanged.emit(
+                self.model.index(min(rows), 1),
+                self.model.index(max(rows), 1),
+                [Qt.DecorationRole],
+            )
+
+    def wait(self) -> None:
+        """Blockierend auf alle offenen Anfragen warten und eintragen."""
+        with self._lock:
+            futures = [f for _, f in self._pending.values()]
+        for fut in futures:
+            if not fut.cancelled():
+                fut.exception()
+        self.flush()
+
+    def shutdown(self) -> None:
+        """Offene Anfragen verwerfen und laufende Dekodierungen abwarten."""
+        self._closed = True
+        self._timer.stop()
+        # Keine QImage-Erzeugung mehr nach dem Abbau der Qt-Objekte
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+
 # ---------- Worker ----------
 class EncodeWorker(QtCore.QObject):
     """Hintergrund-Worker zum Enkodieren der Paare."""
@@ -276,100 +595,99 @@ class EncodeWorker(QtCore.QObject):
     row_progress = Signal(int, float)
     overall_progress = Signal(float)
     row_error = Signal(int, str)
+    job_stats = Signal(int, object)
     log = Signal(str)
     finished = Signal()
 
     def __init__(
-        self, pairs: List[PairItem], settings: Dict[str, Any], copy_only: bool
+        self,
+        pairs: List[PairItem],
+        settings: Dict[str, Any],
+        copy_only: bool,
+        db_path: Optional[Path] = None,
+        resume: bool = False,
     ):
-        """Worker vorbereiten."""
+        """Worker vorbereiten.
+
+        Mit ``db_path`` werden die Jobs dauerhaft in der SQLite-Warteschlange
+        geführt; ``resume`` setzt eine vorhandene Warteschlange fort, statt
+        sie neu anzulegen.
+        """
         super().__init__()
         self.pairs = pairs
         self.settings = settings
         self.copy_only = copy_only
+        self.db_path = db_path
+        self.resume = resume
+        self._queue: "queue.Queue[int]" = queue.Queue()
         self._stop = False
-        self._proc: Optional[subprocess.Popen] = None
+        self._procs: Dict[int, subprocess.Popen] = {}
+        self._lock = threading.Lock()
+        self._names = OutputNames()
+        self.cache = EncodeCache() if settings.get("cache", False) else None
+        self.governor: Optional[ResourceGovernor] = None
+        self._verifier: Optional[ThreadPoolExecutor] = None
+        self._checks: Dict[int, Tuple[List[str], Optional[str]]] = {}
 
     def stop(self):
-        """Aktuellen ffmpeg-Prozess beenden."""
+        """Alle laufenden ffmpeg-Prozesse beenden."""
         self._stop = True
-        if self._proc and self._proc.poll() is None:
-            try:
-                self._proc.kill()
-            except Exception as exc:
-                self.log.emit(f"Prozess konnte nicht beendet werden: {exc}")
+        with self._lock:
+            procs = list(self._procs.values())
+        for proc in procs:
+            if proc.poll() is None:
+                try:
+                    proc.kill()
+                except Exception as exc:
+                    self.log.emit(f"Prozess konnte nicht beendet werden: {exc}")
 
     def run(self):
-        """Enkodierungsschleife ausführen."""
+        """Enkodierung mit mehreren parallelen Jobs ausführen."""
         total = len(self.pairs)
-        for i, item in enumerate(self.pairs):
-            if self._stop:
-                self.log.emit("Abbruch durch Benutzer.")
-                break
-            item.validate()
-            if not item.valid:
-                item.status = "FEHLER"
-                self.row_error.emit(i, item.validation_msg)
-                continue
-            try:
-                item.status = "ENCODIERE"
-                item.progress = 0.0
-                self.row_progress.emit(i, 0.0)
-                out_dir = Path(self.settings["out_dir"]).resolve()
-                out_dir.mkdir(parents=True, exist_ok=True)
-                item.output = build_out_name(item.audio_path, out_dir)
-                w, h = self.settings["width"], self.settings["height"]
-                crf = self.settings["crf"]
-                preset = self.settings["preset"]
-                ab = self.settings["abitrate"]
-                duration = item.duration or 1
-                cmd = build_ffmpeg_cmd(
-                    item.image_path,
-                    item.audio_path,
-                    item.output,
-                    w,
-                    h,
-                    ab,
-                    crf,
-                    preset,
-                )
-                self._proc = start_ffmpeg(cmd)
-                last_line = ""
-                for line in self._proc.stderr:
-                    if self._stop:
-                        self._proc.kill()
-                        break
-                    if line:
-                        last_line = line.strip()
-                    if "time=" in line:
-                        try:
-                            t = line.split("time=")[1].split(" ")[0]
-                            h_, m_, s_ = t.split(":")
-                            elapsed = float(h_) * 3600 + float(m_) * 60 + float(s_)
-                            perc = min(100.0, elapsed / duration * 100.0)
-                            item.progress = perc
-                            self.row_progress.emit(i, perc)
-                        except Exception as e:
-                            self.log.emit(f"Fortschritt nicht lesbar: {e}")
-                self._proc.wait()
-                rc = self._proc.returncode
-                self._proc = None
-                if rc != 0:
-                    item.status = "FEHLER"
-                    msg = (
-                        f"FFmpeg-Fehler: {last_line}" if last_line else "FFmpeg-Fehler"
-                    )
-                    self.row_error.emit(i, msg)
-                else:
-                    item.status = "FERTIG"
-                    item.progress = 100.0
-                    self.row_progress.emit(i, 100.0)
-                    self.log.emit(f"Fertig: {item.output}")
-            except Exception as e:
-                item.status = "FEHLER"
-                self.row_error.emit(i, str(e))
-            done = sum(1 for p in self.pairs if p.status == "FERTIG")
-            self.overall_progress.emit(done / max(1, total) * 100.0)
+        jobs = max(1, min(int(self.settings.get("jobs", 1)), total or 1))
+        policy = self.settings.get("order", "table")
+        durations = [p.duration for p in self.pairs]
+        order = order_jobs(durations, policy)
+        if not self.resume:
+            self.log.emit(
+                f"Reihenfolge: {POLICIES[policy]}, geschätzte Dauer "
+                f"{human_time(predict_makespan(durations, order, jobs))} bei Echtzeit"
+                f" (Tabelle: {human_time(predict_makespan(durations, range(total), jobs))})"
+            )
+        self.governor = ResourceGovernor(
+            jobs, affinity=self.settings.get("affinity", False)
+        )
+        if jobs > 1:
+            self.log.emit(
+                f"{jobs} Jobs auf {len(self.governor.cpus)} Kernen: "
+                f"{self.governor.threads} Threads je ffmpeg"
+                + (", feste Kerne" if self.governor.affinity else "")
+            )
+        if self.settings.get("verify", False):
+            # Prüfen überlappt mit den nächsten Kodierungen
+            self._verifier = ThreadPoolExecutor(
+                max_workers=VERIFY_WORKERS, thread_name_prefix="verify"
+            )
+        if self.db_path is None:
+            for i in order:
+                self._queue.put(i)
+        elif not self.resume:
+            enqueue_jobs(
+                [(p.image_path, p.audio_path) for p in self.pairs],
+                self.db_path,
+                order=order,
+            )
+        workers = [
+            threading.Thread(target=self._drain, daemon=True) for _ in range(jobs)
+        ]
+        for t in workers:
+            t.start()
+        for t in workers:
+            t.join()
+        if self._verifier is not None:
+            self._verifier.shutdown(wait=True)
+        if self._stop:
+            self.log.emit("Abbruch durch Benutzer.")
         if all(p.status == "FERTIG" for p in self.pairs):
             try:
                 dst = USED_DIR
@@ -386,6 +704,220 @@ class EncodeWorker(QtCore.QObject):
                 self.log.emit(f"Archivierung fehlgeschlagen: {e}")
         self.finished.emit()
 
+    def _next_job(self) -> Optional[Tuple[int, Optional[int]]]:
+        """Nächste Zeile (und ggf. Job-ID) aus der Warteschlange holen."""
+        if self.db_path is None:
+            try:
+                return self._queue.get_nowait(), None
+            except queue.Empty:
+                return None
+        while True:
+            job = claim_job(self.db_path)
+            if job is None:
+                return None
+            if 0 <= job["row"] < len(self.pairs):
+                return job["row"], job["id"]
+            finish_job(job["id"], JOB_FAILED, self.db_path, error="Zeile fehlt")
+
+    def _drain(self) -> None:
+        """Jobs aus der gemeinsamen Warteschlange abarbeiten."""
+        while not self._stop:
+            nxt = self._next_job()
+            if nxt is None:
+                return
+            i, job_id = nxt
+            error = self._encode_row(i)
+            if self.pairs[i].status == "PRÜFE":
+                self._verifier.submit(self._verify_row, i, job_id)
+            else:
+                self._finish_row(i, job_id, error)
+
+    def _finish_row(self, i: int, job_id: Optional[int], error: str) -> None:
+        """Ergebnis einer Zeile in die Warteschlange schreiben und melden."""
+        if job_id is not None:
+            item = self.pairs[i]
+            status = {"FERTIG": JOB_DONE, "FEHLER": JOB_FAILED}.get(
+                item.status, JOB_PENDING
+            )
+            stats = item.stats.as_dict() if item.stats else None
+            try:
+                finish_job(job_id, status, self.db_path, item.output, error, stats)
+            except Exception as e:
+                logger.error("Job %s nicht gespeichert: %s", job_id, e)
+                self.log.emit(f"Warteschlange nicht aktualisiert: {e}")
+        with self._lock:
+            done = sum(1 for p in self.pairs if p.status == "FERTIG")
+        self.overall_progress.emit(done / max(1, len(self.pairs)) * 100.0)
+
+    def _verify_row(self, i: int, job_id: Optional[int]) -> None:
+        """Ausgaben einer kodierten Zeile prüfen (läuft im Prüf-Pool).
+
+        Niemand liest das Future dieses Aufrufs: Jeder Fehler setzt die Zeile
+        deshalb auf FEHLER, statt sie in „PRÜFE“ hängen zu lassen.
+        """
+        item = self.pairs[i]
+        error = ""
+        try:
+            with self._lock:
+                outputs, key = self._checks.pop(i)
+            for out in outputs:
+                reason = verify_output(out, item.duration)
+                if reason:
+                    error = f"Prüfung fehlgeschlagen ({Path(out).name}): {reason}"
+                    break
+            if not error and key:
+                self.cache.store(key, item.output)
+        except Exception as e:
+            logger.error("Prüfung von Zeile %d abgebrochen: %s", i, e)
+            error = f"Prüfung fehlgeschlagen: {e}"
+        if error:
+            item.status = "FEHLER"
+            self.row_error.emit(i, error)
+        else:
+            item.status = "FERTIG"
+        self._finish_row(i, job_id, error)
+
+    def _encode_row(self, i: int) -> str:
+        """Ein einzelnes Paar enkodieren; liefert die Fehlermeldung oder ``""``."""
+        item = self.pairs[i]
+        item.stats = None
+        item.validate()
+        if not item.valid:
+            item.status = "FEHLER"
+            self.row_error.emit(i, item.validation_msg)
+            return item.validation_msg
+        try:
+            item.status = "ENCODIERE"
+            item.progress = 0.0
+            self.row_progress.emit(i, 0.0)
+            out_dir = Path(self.settings["out_dir"]).resolve()
+            out_dir.mkdir(parents=True, exist_ok=True)
+            renditions = self.settings.get("renditions", [])
+            out, *extra = self._names.reserve(
+                item.audio_path, out_dir, [f"{w}x{h}" for w, h in renditions]
+            )
+            item.output = str(out)
+            ladder = [(w, h, str(o)) for (w, h), o in zip(renditions, extra)]
+            # Der Cache-Schlüssel kennt nur ein Bild und eine Ausgabe
+            key = None
+            if not item.slides and not ladder:
+                key = cached_encode_key(
+                    self.cache, item.image_path, item.audio_path, self.settings
+                )
+            if key and self.cache.fetch(key, item.output):
+                item.status = "FERTIG"
+                item.progress = 100.0
+                self.row_progress.emit(i, 100.0)
+                self.log.emit(f"Aus Cache: {item.output}")
+                return ""
+            w, h = self.settings["width"], self.settings["height"]
+            crf = self.settings["crf"]
+            preset = self.settings["preset"]
+            ab = self.settings["abitrate"]
+            cmd = prepare_encode_cmd(
+                item.image_path,
+                item.audio_path,
+                item.output,
+                w,
+                h,
+                ab,
+                crf,
+                preset,
+                still=self.settings.get("still", False),
+                loop=self.settings.get("loop", False),
+                audio_passthrough=self.settings.get("audio_copy", False),
+                slides=item.slides,
+                durations=item.slide_times,
+                ladder=ladder,
+            )
+            with self._lock:
+                if self._stop:
+                    item.status = "WARTET"
+                    remove_concat_list(cmd)
+                    return ""
+                try:
+                    proc = self._procs[i] = start_ffmpeg(
+                        cmd, progress=True, governor=self.governor
+                    )
+                except Exception:
+                    remove_concat_list(cmd)
+                    raise
+            progress = FfmpegProgress(item.duration)
+            try:
+                for line in proc.stdout:
+                    if self._stop:
+                        proc.kill()
+                        break
+                    if progress.feed(line):
+                        item.progress = progress.percent
+                        self.row_progress.emit(i, item.progress)
+                item.stats = wait_with_stats(proc)
+            finally:
+                with self._lock:
+                    self._procs.pop(i, None)
+                remove_concat_list(cmd)
+            self.job_stats.emit(i, item.stats)
+            if proc.returncode != 0:
+                item.status = "FEHLER"
+                last_line = progress.last_message
+                msg = f"FFmpeg-Fehler: {last_line}" if last_line else "FFmpeg-Fehler"
+                self.row_error.emit(i, msg)
+                return msg
+            else:
+                item.progress = 100.0
+                self.row_progress.emit(i, 100.0)
+                self.log.emit(
+                    f"Fertig: {item.output} ({progress.speed:.1f}x, "
+                    f"{progress.fps:.0f} fps)"
+                )
+                for *_, extra in ladder:
+                    self.log.emit(f"Fertig: {extra}")
+                if self._verifier is not None:
+                    item.status = "PRÜFE"
+                    with self._lock:
+                        self._checks[i] = (
+                            [item.output] + [extra for *_, extra in ladder],
+                            key,
+                        )
+                    return ""
+                item.status = "FERTIG"
+                if key:
+                    self.cache.store(key, item.output)
+                return ""
+        except Exception as e:
+            item.status = "FEHLER"
+            self.row_error.emit(i, str(e))
+            return str(e)
+
+
+class TuneWorker(QtCore.QObject):
+    """Probekodierungen im Hintergrund, um ein Preset zu wählen."""
+
+    log = Signal(str)
+    finished = Signal(str, float)
+
+    def __init__(self, pairs: List[PairItem], settings: Dict[str, Any], budget: float):
+        """Paare, Einstellungen und Zeitbudget in Sekunden übernehmen."""
+        super().__init__()
+        self.pairs = pairs
+        self.settings = settings
+        self.budget = budget
+
+    def run(self):
+        """Presets messen und das gewählte mit seiner Schätzung melden."""
+        ready = [p for p in self.pairs if p.audio_path and p.duration > 0]
+        samples = [(p.image_path, p.audio_path, p.duration) for p in ready]
+        durations = [p.duration for p in ready]
+        try:
+            preset, estimates = tune_preset(
+                samples, durations, self.settings, self.budget, log=self.log.emit
+            )
+        except Exception as e:
+            self.log.emit(f"Anpassung fehlgeschlagen: {e}")
+            self.finished.emit("", 0.0)
+            return
+        self.finished.emit(preset, estimates[preset])
+
 
 # ---------- UI Widgets ----------
 class DropListWidget(QtWidgets.QListWidget):
@@ -479,6 +1011,8 @@ class InfoDashboard(QtWidgets.QWidget):
         self.mini_log.setReadOnly(True)
         self.mini_log.setMaximumBlockCount(300)
         self.mini_log.setFixedHeight(90)
+        self.stats_lbl = QtWidgets.QLabel("")
+        self.stats_lbl.setAccessibleName("Ressourcenverbrauch")
         row = QtWidgets.QHBoxLayout()
         for w in (
             QtWidgets.QLabel("Gesamt:"),
@@ -496,6 +1030,7 @@ class InfoDashboard(QtWidgets.QWidget):
         row.addStretch(1)
         lay = QtWidgets.QVBoxLayout(self)
         lay.addLayout(row)
+        lay.addWidget(self.stats_lbl)
         lay.addWidget(self.mini_log)
 
     def set_counts(self, t, d, e):
@@ -508,6 +1043,13 @@ class InfoDashboard(QtWidgets.QWidget):
         """Fortschritt anzeigen."""
         self.progress.setValue(v)
 
+    def set_stats(self, stats: Optional[ProcessStats], jobs: int = 0):
+        """Summierten Verbrauch der gemessenen Jobs anzeigen."""
+        if stats is None or not jobs:
+            self.stats_lbl.setText("")
+            return
+        self.stats_lbl.setText(f"Verbrauch ({jobs} Jobs): {format_stats(stats)}")
+
     def set_env(self, ff_ok, imp_ok=True):
         """Status von ffmpeg und Umgebung anzeigen."""
         self.ffmpeg_lbl.setText(f"ffmpeg: {'OK' if ff_ok else 'FEHLT'}")
@@ -559,6 +1101,16 @@ class MainWindow(QtWidgets.QMainWindow):
 
         self.pairs: List[PairItem] = []
         self.model = PairTableModel(self.pairs, show_thumbs)
+        self.progress_agg = ProgressAggregator(self.model)
+        self.progress_agg.overall_changed.connect(self._on_overall_progress)
+        try:
+            media = MediaInfoCache(MEDIA_DB)
+        except Exception as exc:
+            logger.error("Medien-Cache nicht verfügbar: %s", exc)
+            media = None
+        self.probe = ProbeService(self.model, cache=media)
+        self.thumbs = ThumbLoader(self.model, cache=ThumbCache())
+        self.model.thumb_loader = self.thumbs
 
         self.dashboard = InfoDashboard()
         self.dashboard.set_env(check_ffmpeg(), True)
@@ -584,6 +1136,12 @@ class MainWindow(QtWidgets.QMainWindow):
         header.setSectionResizeMode(QHeaderView.ResizeToContents)
         for col in (2, 3, 5):
             header.setSectionResizeMode(col, QHeaderView.Stretch)
+        header.setSectionResizeMode(1, QHeaderView.Fixed)
+        header.resizeSection(1, THUMB_SIZE[0] + 8)
+        # Breiten nur aus den sichtbaren Zeilen ermitteln; sonst fragt jedes
+        # dataChanged bis zu 1000 Zeilen ab
+        header.setResizeContentsPrecision(0)
+        self.table.verticalScrollBar().valueChanged.connect(self._on_table_scrolled)
 
         self.help_pane = HelpPane()
 
@@ -633,6 +1191,85 @@ class MainWindow(QtWidgets.QMainWindow):
             QtGui.QRegularExpressionValidator(QtCore.QRegularExpression(r"\d+[kKmM]?"))
         )
         self.abitrate_edit.setAccessibleName("Audio-Bitrate")
+        self.renditions_edit = QtWidgets.QLineEdit(
+            self.settings.value("encode/renditions", "", str)
+        )
+        self.renditions_edit.setPlaceholderText("z.B. 1280x720, 854x480")
+        self.renditions_edit.setAccessibleName("Weitere Auflösungen")
+        self.renditions_edit.setToolTip(
+            "Kleinere Fassungen aus demselben Lauf; Auflösungen über der"
+            " Hauptauflösung werden übersprungen"
+        )
+        self.jobs_spin = QtWidgets.QSpinBox()
+        self.jobs_spin.setRange(1, max(1, os.cpu_count() or 1))
+        self.jobs_spin.setValue(self.settings.value("encode/jobs", 1, int))
+        self.jobs_spin.setAccessibleName("Parallele Jobs")
+        self.order_combo = QtWidgets.QComboBox()
+        for key, label in POLICIES.items():
+            self.order_combo.addItem(label, key)
+        self.order_combo.setCurrentIndex(
+            max(
+                0,
+                self.order_combo.findData(
+                    self.settings.value("encode/order", "table", str)
+                ),
+            )
+        )
+        self.order_combo.setAccessibleName("Reihenfolge")
+        self.still_check = QtWidgets.QCheckBox("Standbild-Modus (schneller)")
+        self.still_check.setToolTip(
+            "Kodiert nur ein Bild pro Sekunde; sieht gleich aus, ist viel schneller"
+        )
+        self.still_check.setStatusTip(self.still_check.toolTip())
+        self.still_check.setAccessibleName("Standbild-Modus")
+        self.still_check.setChecked(self.settings.value("encode/still", False, bool))
+        self.loop_check = QtWidgets.QCheckBox("Schleifen-Modus (lange Audios)")
+        self.loop_check.setToolTip(
+            "Kodiert das Bild einmal als kurzes Video und wiederholt es ohne"
+            " Neukodierung bis zum Ende des Audios"
+        )
+        self.loop_check.setStatusTip(self.loop_check.toolTip())
+        self.loop_check.setAccessibleName("Schleifen-Modus")
+        self.loop_check.setChecked(self.settings.value("encode/loop", False, bool))
+        self.audio_copy_check = QtWidgets.QCheckBox("AAC-Audio direkt übernehmen")
+        self.audio_copy_check.setToolTip(
+            "Audio, das schon AAC mit höchstens der Ziel-Bitrate ist, wird"
+            " kopiert statt neu kodiert"
+        )
+        self.audio_copy_check.setStatusTip(self.audio_copy_check.toolTip())
+        self.audio_copy_check.setAccessibleName("AAC-Audio direkt übernehmen")
+        self.audio_copy_check.setChecked(
+            self.settings.value("encode/audio_copy", False, bool)
+        )
+        self.cache_check = QtWidgets.QCheckBox("Ergebnis-Cache verwenden")
+        self.cache_check.setToolTip(
+            "Unveränderte Paare mit gleichen Einstellungen werden nicht erneut"
+            " kodiert, sondern aus dem Zwischenspeicher übernommen. Dafür wird"
+            " jede Eingabe einmal vollständig gelesen; der Cache belegt bis zu"
+            f" {DEFAULT_MAX_BYTES // 1024**3} GB in {ENCODE_CACHE_DIR},"
+            " älteste Einträge werden zuerst gelöscht"
+        )
+        self.cache_check.setStatusTip(self.cache_check.toolTip())
+        self.cache_check.setAccessibleName("Ergebnis-Cache verwenden")
+        self.cache_check.setChecked(self.settings.value("encode/cache", False, bool))
+        self.affinity_check = QtWidgets.QCheckBox("Jobs an feste CPU-Kerne binden")
+        self.affinity_check.setToolTip(
+            "Jeder parallele Job bekommt eigene Kerne; verhindert Verdrängung"
+            " zwischen den ffmpeg-Prozessen"
+        )
+        self.affinity_check.setStatusTip(self.affinity_check.toolTip())
+        self.affinity_check.setAccessibleName("Jobs an feste CPU-Kerne binden")
+        self.affinity_check.setChecked(
+            self.settings.value("encode/affinity", False, bool)
+        )
+        self.verify_check = QtWidgets.QCheckBox("Ausgaben prüfen")
+        self.verify_check.setToolTip(
+            "Jede fertige Datei mit ffprobe auf Video-/Audiospur und Länge prüfen;"
+            " läuft parallel zu den nächsten Jobs"
+        )
+        self.verify_check.setStatusTip(self.verify_check.toolTip())
+        self.verify_check.setAccessibleName("Ausgaben prüfen")
+        self.verify_check.setChecked(self.settings.value("encode/verify", True, bool))
         self.show_thumbs = QtWidgets.QCheckBox("Vorschau-Bilder anzeigen")
         self.show_thumbs.setToolTip(
             "Zeigt kleine Vorschaubilder, spart Speicher wenn ausgeschaltet"
@@ -680,6 +1317,30 @@ class MainWindow(QtWidgets.QMainWindow):
             self.abitrate_edit,
             "z. B. 192k",
         )
+        self._add_form(
+            form,
+            "Weitere Auflösungen",
+            self.renditions_edit,
+            "Zusätzliche Videos im selben Lauf, Bild wird nur einmal gelesen",
+        )
+        self._add_form(
+            form,
+            "Parallele Jobs",
+            self.jobs_spin,
+            "Anzahl gleichzeitiger ffmpeg-Prozesse",
+        )
+        self._add_form(
+            form,
+            "Reihenfolge",
+            self.order_combo,
+            "Längste zuerst verkürzt die Gesamtzeit bei parallelen Jobs",
+        )
+        form.addRow("", self.still_check)
+        form.addRow("", self.loop_check)
+        form.addRow("", self.audio_copy_check)
+        form.addRow("", self.cache_check)
+        form.addRow("", self.affinity_check)
+        form.addRow("", self.verify_check)
         form.addRow("", self.show_thumbs)
         form.addRow("", self.clear_after)
 
@@ -787,6 +1448,20 @@ class MainWindow(QtWidgets.QMainWindow):
         self.btn_stop.setAccessibleName("Stopp")
         self.btn_stop.setEnabled(False)
 
+        self.btn_resume = QtWidgets.QPushButton("Fortsetzen")
+        self.btn_resume.setToolTip(TIP_RESUME)
+        self.btn_resume.setStatusTip(
+            "Setzt den letzten Stapel nach Absturz oder Stopp bei den offenen Paaren fort"
+        )
+        self.btn_resume.setAccessibleName("Fortsetzen")
+
+        self.btn_slideshow = QtWidgets.QPushButton("Diashow")
+        self.btn_slideshow.setToolTip(TIP_SLIDESHOW)
+        self.btn_slideshow.setStatusTip(
+            "Kodiert die Bilder der markierten Zeilen nacheinander in ein Video"
+        )
+        self.btn_slideshow.setAccessibleName("Diashow")
+
         self.btn_encode.setStyleSheet(
             "font-size:16pt;font-weight:bold;background:#005BBB;color:white;padding:6px 14px;"
         )
@@ -798,11 +1473,13 @@ class MainWindow(QtWidgets.QMainWindow):
             self.btn_auto_pair,
             self.btn_clear,
             self.btn_undo,
+            self.btn_slideshow,
             self.btn_save,
             self.btn_load,
             self.btn_show_path,
             self.btn_encode,
             self.btn_stop,
+            self.btn_resume,
         ):
             top_buttons.addWidget(b)
         top_buttons.addStretch(1)
@@ -825,6 +1502,9 @@ class MainWindow(QtWidgets.QMainWindow):
         self._history: List[List[PairItem]] = []
         self.thread: Optional[QtCore.QThread] = None
         self.worker: Optional[EncodeWorker] = None
+        self.tune_thread: Optional[QtCore.QThread] = None
+        self.tune_worker: Optional[TuneWorker] = None
+        self._batch_stats: List[ProcessStats] = []
 
         # Signals
         self.btn_add_images.clicked.connect(self._pick_images)
@@ -832,10 +1512,12 @@ class MainWindow(QtWidgets.QMainWindow):
         self.btn_auto_pair.clicked.connect(self._auto_pair)
         self.btn_clear.clicked.connect(self._clear_all)
         self.btn_undo.clicked.connect(self._undo_last)
+        self.btn_slideshow.clicked.connect(self._merge_slideshow)
         self.btn_save.clicked.connect(self._save_project)
         self.btn_load.clicked.connect(self._load_project)
-        self.btn_encode.clicked.connect(self._start_encode)
+        self.btn_encode.clicked.connect(lambda: self._start_encode())
         self.btn_stop.clicked.connect(self._stop_encode)
+        self.btn_resume.clicked.connect(self._resume_encode)
         self.table.doubleClicked.connect(self._show_statusbar_path)
 
         self._set_tab_order()
@@ -903,6 +1585,9 @@ class MainWindow(QtWidgets.QMainWindow):
         )
         self.act_copy_only.triggered.connect(self._toggle_copy_mode)
         m_option.addAction(self.act_copy_only)
+        self.act_tune = QAction("An Zeitbudget anpassen …", self)
+        self.act_tune.triggered.connect(self._tune_to_budget)
+        m_option.addAction(self.act_tune)
 
         m_hilfe = menubar.addMenu("Hilfe")
         act_log = QAction("Logdatei öffnen", self)
@@ -921,10 +1606,12 @@ class MainWindow(QtWidgets.QMainWindow):
             self.btn_auto_pair,
             self.btn_clear,
             self.btn_undo,
+            self.btn_slideshow,
             self.btn_save,
             self.btn_load,
             self.btn_encode,
             self.btn_stop,
+            self.btn_resume,
             self.table,
         ]
         for a, b in zip(widgets, widgets[1:]):
@@ -981,6 +1668,8 @@ class MainWindow(QtWidgets.QMainWindow):
             q.progress = p.progress
             q.valid = p.valid
             q.validation_msg = p.validation_msg
+            q.slides = list(p.slides)
+            q.slide_times = list(p.slide_times)
             snap.append(q)
         self._history.append(snap)
         if len(self._history) > 30:
@@ -998,14 +1687,27 @@ class MainWindow(QtWidgets.QMainWindow):
         self.dashboard.set_counts(pair_count, fin_count, err_count)
         running = self.thread is not None and self.thread.isRunning()
         self.btn_encode.setEnabled(pair_count > 0 and not running)
+        self.btn_resume.setEnabled(not running)
 
     def _on_toggle_thumbs(self, checked: bool):
         self.model.show_thumbs = checked
         if not checked:
+            self.thumbs.cancel()
             for p in self.pairs:
                 p.thumb = None
         self.table.viewport().update()
 
+    def _on_table_scrolled(self, _value: int = 0):
+        """Vorschaubilder für weggescrollte Zeilen nicht mehr dekodieren."""
+        first = self.table.rowAt(0)
+        if first < 0:
+            return
+        last = self.table.rowAt(self.table.viewport().height() - 1)
+        if last < 0:
+            last = len(self.pairs) - 1
+        lo = max(0, first - THUMB_MARGIN)
+        self.thumbs.retain(self.pairs[lo : last + THUMB_MARGIN + 1])
+
     # ----- file actions -----
     def _pick_files(self, title: str, pattern: str, handler):
         files, _ = QtWidgets.QFileDialog.getOpenFileNames(
@@ -1042,14 +1744,16 @@ class MainWindow(QtWidgets.QMainWindow):
         self._push_history()
         self.audio_list.add_files(files)
         it = iter(files)
+        filled = []
         for p in self.pairs:
             if p.audio_path is None:
                 try:
                     p.audio_path = next(it)
-                    p.update_duration()
                     p.validate()
+                    filled.append(p)
                 except StopIteration:
                     break
+        self.probe.request(filled)
         self.model.layoutChanged.emit()
         self._post_add()
 
@@ -1069,10 +1773,10 @@ class MainWindow(QtWidgets.QMainWindow):
         new = []
         for img, aud in zip(imgs, auds):
             p = PairItem(img, aud)
-            p.update_duration()
             p.validate()
             new.append(p)
         self.model.add_pairs(new)
+        self.probe.request(new)
         self._update_counts()
         self._resize_columns()
 
@@ -1101,11 +1805,40 @@ class MainWindow(QtWidgets.QMainWindow):
         self._update_counts()
         self._resize_columns()
 
+    def _merge_slideshow(self):
+        """Markierte Zeilen zu einer Diashow in der ersten Zeile zusammenfassen."""
+        rows = sorted(i.row() for i in self.table.selectionModel().selectedRows())
+        if len(rows) < 2:
+            QtWidgets.QMessageBox.information(
+                self, "Diashow", "Bitte mindestens zwei Zeilen markieren."
+            )
+            return
+        self._push_history()
+        first = self.pairs[rows[0]]
+        for r in rows[1:]:
+            other = self.pairs[r]
+            first.slides += [other.image_path, *other.slides]
+            if first.audio_path is None and other.audio_path:
+                first.audio_path = other.audio_path
+                first.update_duration()
+        first.slide_times = []
+        first.validate()
+        self.model.remove_rows(rows[1:])
+        self.model.layoutChanged.emit()
+        self._log(f"Diashow mit {len(first.slides) + 1} Bildern angelegt.")
+        self._update_counts()
+
     # ----- save / load -----
     def _project_data(self) -> Dict[str, Any]:
         return {
             "pairs": [
-                {"image": p.image_path, "audio": p.audio_path, "output": p.output}
+                {
+                    "image": p.image_path,
+                    "audio": p.audio_path,
+                    "output": p.output,
+                    "slides": p.slides,
+                    "slide_times": p.slide_times,
+                }
                 for p in self.pairs
             ],
             "settings": self._gather_settings(),
@@ -1118,10 +1851,12 @@ class MainWindow(QtWidgets.QMainWindow):
         for d in data.get("pairs", []):
             p = PairItem(d.get("image", ""), d.get("audio"))
             p.output = d.get("output", "")
-            p.update_duration()
+            p.slides = list(d.get("slides", []))
+            p.slide_times = list(d.get("slide_times", []))
             p.validate()
             new.append(p)
         self.model.add_pairs(new)
+        self.probe.request(new)
         s = data.get("settings", {})
         out_dir = s.get("out_dir", "")
         self.out_dir_edit.setText("" if out_dir == str(DEFAULT_OUT_DIR) else out_dir)
@@ -1133,6 +1868,23 @@ class MainWindow(QtWidgets.QMainWindow):
         self.height_spin.setValue(s.get("height", self.height_spin.value()))
         abitrate = s.get("abitrate", "")
         self.abitrate_edit.setText("" if abitrate in ("", "192k") else abitrate)
+        self.jobs_spin.setValue(s.get("jobs", self.jobs_spin.value()))
+        idx = self.order_combo.findData(s.get("order", self.order_combo.currentData()))
+        self.order_combo.setCurrentIndex(max(0, idx))
+        self.still_check.setChecked(s.get("still", self.still_check.isChecked()))
+        self.loop_check.setChecked(s.get("loop", self.loop_check.isChecked()))
+        self.audio_copy_check.setChecked(
+            s.get("audio_copy", self.audio_copy_check.isChecked())
+        )
+        self.cache_check.setChecked(s.get("cache", self.cache_check.isChecked()))
+        self.affinity_check.setChecked(
+            s.get("affinity", self.affinity_check.isChecked())
+        )
+        self.verify_check.setChecked(s.get("verify", self.verify_check.isChecked()))
+        if "renditions" in s:
+            self.renditions_edit.setText(
+                ", ".join(f"{w}x{h}" for w, h in s["renditions"])
+            )
         self._update_counts()
         self._resize_columns()
 
@@ -1164,9 +1916,24 @@ class MainWindow(QtWidgets.QMainWindow):
             "width": self.width_spin.value(),
             "height": self.height_spin.value(),
             "abitrate": normalize_bitrate(self.abitrate_edit.text()),
+            "jobs": self.jobs_spin.value(),
+            "order": self.order_combo.currentData(),
+            "still": self.still_check.isChecked(),
+            "loop": self.loop_check.isChecked(),
+            "audio_copy": self.audio_copy_check.isChecked(),
+            "cache": self.cache_check.isChecked(),
+            "affinity": self.affinity_check.isChecked(),
+            "verify": self.verify_check.isChecked(),
+            "renditions": [
+                list(r)
+                for r in parse_renditions(
+                    self.renditions_edit.text(),
+                    (self.width_spin.value(), self.height_spin.value()),
+                )
+            ],
         }
 
-    def _start_encode(self):
+    def _start_encode(self, resume: bool = False):
         if not check_ffmpeg():
             QtWidgets.QMessageBox.critical(
                 self,
@@ -1184,46 +1951,98 @@ class MainWindow(QtWidgets.QMainWindow):
                 self, "Fehlende Audios", "Nicht alle Bilder haben ein Audio."
             )
             return
-        for p in self.pairs:
+        todo = [p for p in self.pairs if not (resume and p.status == "FERTIG")]
+        for p in todo:
             p.validate()
-        invalid = [p for p in self.pairs if not p.valid]
+        invalid = [p for p in todo if not p.valid]
         if invalid:
             QtWidgets.QMessageBox.critical(
                 self, "Validierungsfehler", invalid[0].validation_msg
             )
             return
         self.btn_encode.setEnabled(False)
+        self.btn_resume.setEnabled(False)
         self.btn_stop.setEnabled(True)
         self.progress_total.setValue(0)
+        if self.probe.busy:
+            # Reihenfolge und Fortschritt brauchen die Audiodauern
+            self._log("Warte auf Audiodauern …")
+            self.probe.wait()
         self.dashboard.set_progress(0)
-        self._log("Starte Encoding …")
-        self.worker = EncodeWorker(self.pairs, self._gather_settings(), self.copy_only)
+        self._batch_stats = []
+        self.dashboard.set_stats(None)
+        self._log("Setze Encoding fort …" if resume else "Starte Encoding …")
+        self.worker = EncodeWorker(
+            self.pairs,
+            self._gather_settings(),
+            self.copy_only,
+            db_path=PROJECT_DB,
+            resume=resume,
+        )
         self.thread = QtCore.QThread()
         self.worker.moveToThread(self.thread)
         self.thread.started.connect(self.worker.run)
-        self.worker.row_progress.connect(self._on_row_progress)
-        self.worker.overall_progress.connect(self._on_overall_progress)
+        self.worker.row_progress.connect(self.progress_agg.row_progress)
+        self.worker.overall_progress.connect(self.progress_agg.overall_progress)
         self.worker.row_error.connect(self._on_row_error)
+        self.worker.job_stats.connect(self._on_job_stats)
         self.worker.log.connect(self._log)
         self.worker.finished.connect(self._encode_finished)
+        self.progress_agg.start()
         self.thread.start()
 
+    def _resume_encode(self):
+        """Unfertige Jobs aus der gespeicherten Warteschlange erneut starten."""
+        try:
+            jobs = resume_jobs(PROJECT_DB)
+        except Exception as exc:
+            logger.error("Warteschlange konnte nicht gelesen werden: %s", exc)
+            jobs = []
+        open_jobs = sum(1 for j in jobs if j["status"] == JOB_PENDING)
+        if not open_jobs:
+            QtWidgets.QMessageBox.information(
+                self, "Fortsetzen", "Es gibt keine unfertigen Jobs."
+            )
+            return
+        same = len(jobs) == len(self.pairs) and all(
+            p.image_path == j["image"] and p.audio_path == j["audio"]
+            for p, j in zip(self.pairs, jobs)
+        )
+        if not same:
+            # Tabelle aus der Warteschlange wiederherstellen (z.B. nach Absturz)
+            self._push_history()
+            self.model.clear()
+            new = [PairItem(j["image"], j["audio"]) for j in jobs]
+            self.model.add_pairs(new)
+            self.probe.request(new)
+        for p, j in zip(self.pairs, jobs):
+            if j["status"] == JOB_DONE:
+                p.status, p.output, p.progress = "FERTIG", j["output"], 100.0
+            else:
+                p.status, p.progress = "WARTET", 0.0
+        self.model.dataChanged.emit(
+            self.model.index(0, 0),
+            self.model.index(len(self.pairs) - 1, len(COLUMNS) - 1),
+        )
+        self._update_counts()
+        self._resize_columns()
+        self._log(f"{open_jobs} unfertige Jobs werden fortgesetzt.")
+        self._start_encode(resume=True)
+
     def _stop_encode(self):
         if self.worker:
             self.worker.stop()
         self.btn_stop.setEnabled(False)
 
-    def _on_row_progress(self, row: int, perc: float):
-        if 0 <= row < len(self.pairs):
-            self.pairs[row].progress = perc
-            idx = self.model.index(row, 6)
-            self.model.dataChanged.emit(idx, idx)
-
     def _on_overall_progress(self, perc: float):
         v = int(perc)
         self.progress_total.setValue(v)
         self.dashboard.set_progress(v)
 
+    def _on_job_stats(self, row: int, stats: ProcessStats):
+        self._batch_stats.append(stats)
+        self.dashboard.set_stats(sum_stats(self._batch_stats), len(self._batch_stats))
+
     def _on_row_error(self, row: int, msg: str):
         self._log(f"Fehler in Zeile {row+1}: {msg}")
         if 0 <= row < len(self.pairs):
@@ -1233,11 +2052,14 @@ class MainWindow(QtWidgets.QMainWindow):
         self._update_counts()
 
     def _encode_finished(self):
+        self.progress_agg.stop()
         self.btn_encode.setEnabled(True)
         self.btn_stop.setEnabled(False)
         self.progress_total.setValue(100)
         self.dashboard.set_progress(100)
         self._log("Alle Jobs abgeschlossen.")
+        if self._batch_stats:
+            self._log(f"Verbrauch: {format_stats(sum_stats(self._batch_stats))}")
         if self.thread:
             self.thread.quit()
             self.thread.wait()
@@ -1247,6 +2069,48 @@ class MainWindow(QtWidgets.QMainWindow):
         if self.clear_after.isChecked():
             self._clear_all()
 
+    def _tune_to_budget(self):
+        """Preset per Probekodierung an eine Wunsch-Gesamtdauer anpassen."""
+        if self.tune_thread or not check_ffmpeg():
+            return
+        if not any(p.audio_path and p.duration > 0 for p in self.pairs):
+            QtWidgets.QMessageBox.information(
+                self, "Keine Aufgaben", "Es sind keine Paare mit Audio vorhanden."
+            )
+            return
+        minutes, ok = QtWidgets.QInputDialog.getInt(
+            self,
+            "An Zeitbudget anpassen",
+            "Der ganze Stapel soll fertig sein in (Minuten):",
+            30,
+            1,
+            24 * 60,
+        )
+        if not ok:
+            return
+        self._log(f"Messe Presets für ein Budget von {minutes} min …")
+        self.act_tune.setEnabled(False)
+        self.tune_worker = TuneWorker(self.pairs, self._gather_settings(), minutes * 60)
+        self.tune_thread = QtCore.QThread()
+        self.tune_worker.moveToThread(self.tune_thread)
+        self.tune_thread.started.connect(self.tune_worker.run)
+        self.tune_worker.log.connect(self._log)
+        self.tune_worker.finished.connect(self._tune_finished)
+        self.tune_thread.start()
+
+    def _tune_finished(self, preset: str, estimate: float):
+        if self.tune_thread:
+            self.tune_thread.quit()
+            self.tune_thread.wait()
+        self.tune_thread = None
+        self.tune_worker = None
+        self.act_tune.setEnabled(True)
+        if preset:
+            self.preset_combo.setCurrentText(preset)
+            self._log(
+                f"Preset {preset} gewählt (geschätzt {human_time(int(estimate))})."
+            )
+
     # ----- misc -----
     def _toggle_copy_mode(self, checked: bool):
         self.copy_only = checked
@@ -1262,8 +2126,11 @@ class MainWindow(QtWidgets.QMainWindow):
         self._log(msg)
 
     def _resize_columns(self):
-        header = self.table.horizontalHeader()
-        header.resizeSections(QHeaderView.ResizeToContents)
+        # Spalte "Thumb" hat feste Breite; ihre Inhaltsgröße abzufragen würde
+        # Vorschaubilder für alle Zeilen anfordern
+        for col in range(len(COLUMNS)):
+            if col != 1:
+                self.table.resizeColumnToContents(col)
 
     def _show_selected_path(self):
         index = self.table.currentIndex()
@@ -1298,6 +2165,13 @@ class MainWindow(QtWidgets.QMainWindow):
             self.thread.wait()
             self.thread = None
             self.worker = None
+        if self.tune_thread:
+            self.tune_thread.quit()
+            self.tune_thread.wait()
+        self.probe.shutdown()
+        self.thumbs.shutdown()
+        if self.probe.cache:
+            self.probe.cache.close()
         self._update_counts()
         self.settings.setValue("ui/geometry", self.saveGeometry())
         self.settings.setValue("ui/window_state", self.saveState())
@@ -1310,6 +2184,15 @@ class MainWindow(QtWidgets.QMainWindow):
         self.settings.setValue("encode/width", s["width"])
         self.settings.setValue("encode/height", s["height"])
         self.settings.setValue("encode/abitrate", s["abitrate"])
+        self.settings.setValue("encode/jobs", s["jobs"])
+        self.settings.setValue("encode/order", s["order"])
+        self.settings.setValue("encode/still", s["still"])
+        self.settings.setValue("encode/loop", s["loop"])
+        self.settings.setValue("encode/audio_copy", s["audio_copy"])
+        self.settings.setValue("encode/cache", s["cache"])
+        self.settings.setValue("encode/affinity", s["affinity"])
+        self.settings.setValue("encode/verify", s["verify"])
+        self.settings.setValue("encode/renditions", self.renditions_edit.text())
         try:
             NOTES_FILE.write_text(self.notes_edit.toPlainText(), encoding="utf-8")
         except Exception as exc: